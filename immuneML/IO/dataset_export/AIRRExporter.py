@@ -1,6 +1,8 @@
 # quality: gold
+import gzip
 import math
 from enum import Enum
+from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import List
 
@@ -30,31 +32,36 @@ class AIRRExporter(DataExporter):
         for the filenames, to create one file per Repertoire
         - 'counts' is written into the field 'duplicate_counts'
         - 'sequence_identifiers' is written both into the fields 'sequence_id' and 'rearrangement_id'
+        - repertoires are exported in parallel (number_of_processes repertoires at the time) and each repertoire is written in chunks of
+        chunk_size rows directly from its columns, so the whole repertoire is never converted to a data frame at once
+        - if compress is True, the files are written gzip-compressed with the extension .tsv.gz
 
     """
 
     @staticmethod
-    def export(dataset: Dataset, path: Path, region_type=RegionType.IMGT_CDR3):
+    def export(dataset: Dataset, path: Path, region_type=RegionType.IMGT_CDR3, number_of_processes: int = 1, chunk_size: int = 100000,
+               compress: bool = False):
         PathBuilder.build(path)
+        extension = ".tsv.gz" if compress else ".tsv"
 
         if isinstance(dataset, RepertoireDataset):
             repertoire_folder = "repertoires/"
             repertoire_path = PathBuilder.build(path / repertoire_folder)
 
-            for index, repertoire in enumerate(dataset.repertoires):
-                df = AIRRExporter._repertoire_to_dataframe(repertoire, region_type)
-                df = AIRRExporter._postprocess_dataframe(df)
-                output_file = repertoire_path / f"{repertoire.data_filename.stem}.tsv"
-                airr.dump_rearrangement(df, str(output_file))
+            arguments = [(repertoire, repertoire_path / f"{repertoire.data_filename.stem}{extension}", region_type, chunk_size, compress)
+                         for repertoire in dataset.repertoires]
+
+            with Pool(number_of_processes) as pool:
+                pool.starmap(AIRRExporter._export_repertoire, arguments)
 
-            AIRRExporter.export_updated_metadata(dataset, path, repertoire_folder)
+            AIRRExporter.export_updated_metadata(dataset, path, repertoire_folder, extension)
         else:
 
             index = 1
             file_count = math.ceil(dataset.get_example_count() / dataset.file_size)
 
             for batch in dataset.get_batch():
-                filename = path / f"batch{''.join(['0' for i in range(1, len(str(file_count)) - len(str(index)) + 1)])}{index}.tsv"
+                filename = path / f"batch{''.join(['0' for i in range(1, len(str(file_count)) - len(str(index)) + 1)])}{index}{extension}"
 
                 if isinstance(dataset, ReceptorDataset):
                     df = AIRRExporter._receptors_to_dataframe(batch, region_type)
@@ -62,10 +69,57 @@ class AIRRExporter(DataExporter):
                     df = AIRRExporter._sequences_to_dataframe(batch, region_type)
 
                 df = AIRRExporter._postprocess_dataframe(df)
-                airr.dump_rearrangement(df, filename)
+                AIRRExporter.dump_rearrangement_chunks([df], filename, compress)
 
                 index += 1
 
+    @staticmethod
+    def _export_repertoire(repertoire: Repertoire, filename: Path, region_type: RegionType, chunk_size: int, compress: bool):
+        columns = repertoire.get_attributes(repertoire.get_field_names())
+        element_count = repertoire.get_element_count()
+
+        chunks = (AIRRExporter._postprocess_dataframe(AIRRExporter._repertoire_to_dataframe({name: values[start:start + chunk_size]
+                                                                                              for name, values in columns.items()}, region_type))
+                  for start in range(0, max(element_count, 1), chunk_size))
+
+        AIRRExporter.dump_rearrangement_chunks(chunks, filename, compress)
+
+    @staticmethod
+    def dump_rearrangement_chunks(chunks, filename: Path, compress: bool = False):
+        """
+        Writes consecutive data frames to one AIRR rearrangement file in the same format as airr.dump_rearrangement(): required fields first,
+        then optional and custom fields, 1-based start coordinates and T/F for boolean fields. Unlike airr.dump_rearrangement(), which converts
+        and writes one row at the time, each data frame is converted column by column and written at once.
+        """
+        fields = None
+        with (gzip.open(filename, "wt", newline="") if compress else open(filename, "w", newline="")) as file:
+            for df in chunks:
+                write_header = fields is None
+                if write_header:
+                    fields = AIRRExporter._get_rearrangement_fields(df.columns)
+
+                df = AIRRExporter._format_rearrangement_columns(df.reindex(columns=fields))
+                df.to_csv(file, sep="\t", header=write_header, index=False)
+
+    @staticmethod
+    def _get_rearrangement_fields(columns) -> list:
+        schema = airr.schema.RearrangementSchema
+        fields = list(schema.required)
+        fields.extend(column for column in columns if column in schema.optional and column not in fields)
+        fields.extend(column for column in columns if column not in schema.properties)
+        return fields
+
+    @staticmethod
+    def _format_rearrangement_columns(df: pd.DataFrame) -> pd.DataFrame:
+        schema = airr.schema.RearrangementSchema
+        for column in df.columns:
+            if column.endswith("_start"):
+                df[column] = (pd.to_numeric(df[column], errors="coerce") + 1).astype("Int64")
+            elif schema.type(column) == "boolean":
+                values = df[column]
+                df[column] = values.map({value: schema.from_bool(value) for value in values[values.notnull()].unique()})
+        return df
+
     @staticmethod
     def get_sequence_field(region_type):
         if region_type == RegionType.IMGT_CDR3:
@@ -81,20 +135,20 @@ class AIRRExporter(DataExporter):
             return "sequence_aa"
 
     @staticmethod
-    def export_updated_metadata(dataset: RepertoireDataset, result_path: Path, repertoire_folder: str):
+    def export_updated_metadata(dataset: RepertoireDataset, result_path: Path, repertoire_folder: str, extension: str = ".tsv"):
         df = pd.read_csv(dataset.metadata_file, comment=Constants.COMMENT_SIGN)
         identifiers = df["repertoire_identifier"].values.tolist() if "repertoire_identifier" in df.columns else dataset.get_example_ids()
-        df["filename"] =[str(Path(repertoire_folder) / f"{repertoire.data_filename.stem}.tsv") for repertoire in dataset.get_data()]
+        df["filename"] =[str(Path(repertoire_folder) / f"{repertoire.data_filename.stem}{extension}") for repertoire in dataset.get_data()]
         df.to_csv(result_path / "metadata.csv", index=False)
 
     @staticmethod
-    def _repertoire_to_dataframe(repertoire: Repertoire, region_type):
-        # get all fields (including custom fields)
-        df = pd.DataFrame(repertoire.load_data())
+    def _repertoire_to_dataframe(columns: dict, region_type):
+        # all fields (including custom fields) of the repertoire or of a chunk of it
+        df = pd.DataFrame(columns)
 
         for column in ['v_alleles', 'j_alleles', 'v_genes', 'j_genes']:
             if column not in df.columns:
-                df.loc[:, column] = None
+                df[column] = None
 
         AIRRExporter.update_gene_columns(df, 'alleles', 'genes')
 
@@ -121,30 +175,30 @@ class AIRRExporter(DataExporter):
         sequence_field = AIRRExporter.get_sequence_field(region_type)
         sequence_aa_field = AIRRExporter.get_sequence_aa_field(region_type)
 
-        main_data_dict = {"sequence_id": [], sequence_field: [], sequence_aa_field: []}
-        attributes_dict = {"chain": [], "v_allele": [], 'v_gene': [], "j_allele": [], 'j_gene': [], "count": [], "cell_id": [], "frame_type": []}
+        metadata_fields = ["chain", "v_allele", 'v_gene', "j_allele", 'j_gene', "count", "cell_id", "frame_type"]
+        columns = {field: [] for field in metadata_fields}
+        custom_columns = {}
 
         for i, sequence in enumerate(sequences):
-            main_data_dict["sequence_id"].append(sequence.identifier)
-            main_data_dict[sequence_field].append(sequence.nucleotide_sequence)
-            main_data_dict[sequence_aa_field].append(sequence.amino_acid_sequence)
-
-            # add custom params of this receptor sequence to attributes dict
-            if sequence.metadata is not None and sequence.metadata.custom_params is not None:
-                for custom_param in sequence.metadata.custom_params:
-                    if custom_param not in attributes_dict:
-                        attributes_dict[custom_param] = [None for i in range(i)]
-
-            for attribute in attributes_dict.keys():
-                try:
-                    attr_value = sequence.get_attribute(attribute)
-                    if isinstance(attr_value, Enum):
-                        attr_value = attr_value.value
-                    attributes_dict[attribute].append(attr_value)
-                except KeyError:
-                    attributes_dict[attribute].append(None)
-
-        df = pd.DataFrame({**attributes_dict, **main_data_dict})
+            metadata = sequence.metadata
+            for field in metadata_fields:
+                columns[field].append(getattr(metadata, field, None))
+
+            # custom params are collected per column, with None for the sequences before the param first appeared
+            custom_params = metadata.custom_params if metadata is not None and metadata.custom_params is not None else {}
+            for custom_param in custom_params:
+                if custom_param not in custom_columns:
+                    custom_columns[custom_param] = [None for _ in range(i)]
+            for custom_param, values in custom_columns.items():
+                values.append(custom_params.get(custom_param, None))
+
+        main_data_dict = {"sequence_id": [sequence.identifier for sequence in sequences],
+                          sequence_field: [sequence.nucleotide_sequence for sequence in sequences],
+                          sequence_aa_field: [sequence.amino_acid_sequence for sequence in sequences]}
+
+        df = pd.DataFrame({**columns, **custom_columns, **main_data_dict})
+        for field in ["chain", "frame_type"]:
+            AIRRExporter._enums_to_strings(df, field)
 
         AIRRExporter.update_gene_columns(df, 'allele', 'gene')
         df.rename(columns={"v_allele": "v_call", "j_allele": "j_call", "chain": "locus", "count": "duplicate_count", "frame_type": "frame_types"}, inplace=True)
@@ -153,15 +207,15 @@ class AIRRExporter(DataExporter):
 
     @staticmethod
     def update_gene_columns(df, allele_name, gene_name):
-        for index, row in df.iterrows():
-            for gene in ['v', 'j']:
-                if row[f"{gene}_{allele_name}"] is None and row[f"{gene}_{gene_name}"] is not None:
-                    row[f"{gene}_{allele_name}"] = row[f"{gene}_{gene_name}"]
+        for gene in ['v', 'j']:
+            missing_allele = df[f"{gene}_{allele_name}"].isnull() & df[f"{gene}_{gene_name}"].notnull()
+            df.loc[missing_allele, f"{gene}_{allele_name}"] = df.loc[missing_allele, f"{gene}_{gene_name}"]
 
     @staticmethod
     def _postprocess_dataframe(df):
         if "locus" in df.columns:
-            df["locus"] = [Chain.get_chain(chain).value if chain else None for chain in df["locus"]]
+            loci = df["locus"]
+            df["locus"] = loci.map({chain: Chain.get_chain(chain).value for chain in loci[loci.notnull()].unique() if chain})
 
         if "frame_types" in df.columns:
             AIRRExporter._enums_to_strings(df, "frame_types")
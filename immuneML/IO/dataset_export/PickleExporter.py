@@ -15,15 +15,24 @@ from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.data_model.dataset.ReceptorDataset import ReceptorDataset
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.dataset.SequenceDataset import SequenceDataset
+from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
 from immuneML.data_model.repertoire.Repertoire import Repertoire
 from immuneML.environment.Constants import Constants
 from immuneML.util.PathBuilder import PathBuilder
 
 
 class PickleExporter(DataExporter):
+    """
+    Exports the dataset object as a pickle file together with its data files (repertoire files or receptor/sequence batch files).
+
+    Since the data files are not modified after they are written (they are only ever replaced), they are by default hard-linked into
+    the export directory instead of copied, so exporting a dataset takes neither additional disk space nor time proportional to the data.
+    Files are copied if link_files is False or if linking is not possible (e.g., if the export path is on another file system). The
+    metadata file is always copied since it is updated for the exported dataset.
+    """
 
     @staticmethod
-    def export(dataset: Dataset, path: Path):
+    def export(dataset: Dataset, path: Path, link_files: bool = True):
         PathBuilder.build(path)
         exported_dataset = copy.deepcopy(dataset)
         dataset_name = exported_dataset.name if exported_dataset.name is not None else exported_dataset.identifier
@@ -31,11 +40,16 @@ class PickleExporter(DataExporter):
 
         if isinstance(dataset, RepertoireDataset):
             repertoires_path = PathBuilder.build(path / "repertoires")
-            exported_repertoires = PickleExporter._export_repertoires(dataset.repertoires, repertoires_path)
+            exported_repertoires = PickleExporter._export_repertoires(dataset.repertoires, repertoires_path, link_files)
             exported_dataset.repertoires = exported_repertoires
-            exported_dataset.metadata_file = PickleExporter._export_metadata(dataset, path, dataset_filename, repertoires_path)
+            filename_mapping = {old.data_filename.name: new.data_filename.name for old, new in zip(dataset.repertoires, exported_repertoires)}
+            exported_dataset.metadata_file = PickleExporter._export_metadata(dataset, path, dataset_filename, repertoires_path, filename_mapping)
         elif isinstance(dataset, SequenceDataset) or isinstance(dataset, ReceptorDataset):
-            exported_dataset.set_filenames(PickleExporter._export_receptors(exported_dataset.get_filenames(), path))
+            if exported_dataset.element_indices is not None:
+                # subsets of other datasets only refer to their batch files, so the examples are stored to new batch files on export
+                exported_dataset.materialize(path)
+            else:
+                exported_dataset.set_filenames(PickleExporter._export_receptors(exported_dataset.get_filenames(), path, link_files))
 
         file_path = path / dataset_filename
         with file_path.open("wb") as file:
@@ -50,7 +64,7 @@ class PickleExporter(DataExporter):
         return exported_dataset
 
     @staticmethod
-    def _export_metadata(dataset, metadata_folder_path: Path, dataset_filename, repertoires_path):
+    def _export_metadata(dataset, metadata_folder_path: Path, dataset_filename, repertoires_path, filename_mapping: dict = None):
         if dataset.metadata_file is None or not dataset.metadata_file.is_file():
             return None
 
@@ -59,7 +73,7 @@ class PickleExporter(DataExporter):
         if not metadata_file.is_file():
             shutil.copyfile(dataset.metadata_file, metadata_file)
 
-        PickleExporter._update_repertoire_paths_in_metadata(metadata_file, repertoires_path)
+        PickleExporter._update_repertoire_paths_in_metadata(metadata_file, repertoires_path, filename_mapping)
         PickleExporter._add_dataset_to_metadata(metadata_file, dataset_filename)
 
         old_metadata_file = metadata_folder_path / "metadata.csv"
@@ -69,10 +83,12 @@ class PickleExporter(DataExporter):
         return metadata_file
 
     @staticmethod
-    def _update_repertoire_paths_in_metadata(metadata_file: Path, repertoires_path: Path):
+    def _update_repertoire_paths_in_metadata(metadata_file: Path, repertoires_path: Path, filename_mapping: dict = None):
         metadata = pd.read_csv(metadata_file, comment=Constants.COMMENT_SIGN)
         path = Path(os.path.relpath(repertoires_path, os.path.dirname(metadata_file)))
-        metadata["filename"] = [path / os.path.basename(name) for name in metadata["filename"].values.tolist()]
+        filename_mapping = filename_mapping if filename_mapping is not None else {}
+        metadata["filename"] = [path / filename_mapping.get(os.path.basename(name), os.path.basename(name))
+                                for name in metadata["filename"].values.tolist()]
         metadata.to_csv(metadata_file, index=False)
 
     @staticmethod
@@ -83,31 +99,41 @@ class PickleExporter(DataExporter):
         metadata.to_csv(metadata_file, mode="a", index=False)
 
     @staticmethod
-    def _export_receptors(filenames_old: List[str], path: Path) -> List[str]:
+    def _export_receptors(filenames_old: List[str], path: Path, link_files: bool) -> List[str]:
         filenames_new = []
         for filename_old in filenames_old:
-            filename_new = PickleExporter._copy_if_exists(filename_old, path)
+            filename_new = PickleExporter._copy_if_exists(filename_old, path, link_files)
             filenames_new.append(filename_new)
+            index_filename_old = ElementGenerator.get_index_filename(filename_old)
+            if index_filename_old.is_file():
+                PickleExporter._copy_if_exists(index_filename_old, path, link_files)
         return filenames_new
 
     @staticmethod
-    def _export_repertoires(repertoires: List[Repertoire], repertoires_path: Path) -> List[Repertoire]:
+    def _export_repertoires(repertoires: List[Repertoire], repertoires_path: Path, link_files: bool) -> List[Repertoire]:
         new_repertoires = []
 
         for repertoire_old in repertoires:
-            repertoire = copy.deepcopy(repertoire_old)
-            repertoire.data_filename = PickleExporter._copy_if_exists(repertoire_old.data_filename, repertoires_path)
-            repertoire.metadata_filename = PickleExporter._copy_if_exists(repertoire_old.metadata_filename, repertoires_path)
+            if repertoire_old.is_columnar():
+                repertoire = copy.deepcopy(repertoire_old)
+                repertoire.data_filename = PickleExporter._copy_if_exists(repertoire_old.data_filename, repertoires_path, link_files)
+                repertoire.metadata_filename = PickleExporter._copy_if_exists(repertoire_old.metadata_filename, repertoires_path, link_files)
+            else:
+                # repertoires stored in the legacy format are migrated to the columnar format on export
+                repertoire = Repertoire.convert_to_columnar(repertoire_old, repertoires_path)
             new_repertoires.append(repertoire)
 
         return new_repertoires
 
     @staticmethod
-    def _copy_if_exists(old_file: Path, path: Path):
+    def _copy_if_exists(old_file: Path, path: Path, link_files: bool):
         if old_file is not None and old_file.is_file():
             new_file = path / old_file.name
             if not new_file.is_file():
-                shutil.copyfile(old_file, new_file)
+                if link_files:
+                    PathBuilder.link_or_copy(old_file, new_file)
+                else:
+                    shutil.copyfile(old_file, new_file)
             return new_file
         else:
             raise RuntimeError(f"{PickleExporter.__name__}: tried exporting file {old_file}, but it does not exist.")
@@ -1,3 +1,5 @@
+from itertools import islice
+
 import airr
 import pandas as pd
 
@@ -98,6 +100,10 @@ class AIRRImport(DataImport):
 
         separator (str): Column separator, for AIRR this is by default "\\t".
 
+        chunk_size (int): If set, each repertoire file is imported in chunks of chunk_size rows, which are preprocessed and added to the
+        repertoire one after another, so that the memory needed for import does not depend on the size of the files. By default, chunk_size
+        is not set and each file is loaded at once.
+
 
     YAML specification:
 
@@ -167,7 +173,7 @@ class AIRRImport(DataImport):
                     df.rename(columns={"cdr3": "sequences"}, inplace=True)
                 if "cdr3_aa" in df.columns:
                     df.rename(columns={"cdr3_aa": "sequence_aas"}, inplace=True)
-                df.loc[:, "region_types"] = params.region_type.name
+                df["region_types"] = params.region_type.name
             elif "junction" in params.column_mapping or "junction_aa" in params.column_mapping:
                 ImportHelper.junction_to_cdr3(df, params.region_type)
         # todo else: support "full_sequence" import through regiontype?
@@ -179,13 +185,29 @@ class AIRRImport(DataImport):
 
         return df
 
+    # columns without any values in the file are not imported; when importing in chunks, they are dropped once all chunks are read
+    DROP_EMPTY_COLUMNS = True
+
     @staticmethod
     def alternative_load_func(filename, params):
-        df = airr.load_rearrangement(filename)
-        ImportHelper.standardize_none_values(df)
+        with open(filename, "r") as file:
+            df = AIRRImport._make_rearrangement_dataframe(list(airr.io.RearrangementReader(file)))
         df.dropna(axis="columns", how="all", inplace=True)
         return df
 
+    @staticmethod
+    def alternative_chunk_load_func(filename, params):
+        with open(filename, "r") as file:
+            reader = airr.io.RearrangementReader(file)
+            for rows in iter(lambda: list(islice(reader, params.chunk_size)), []):
+                yield AIRRImport._make_rearrangement_dataframe(rows)
+
+    @staticmethod
+    def _make_rearrangement_dataframe(rows: list) -> pd.DataFrame:
+        df = pd.DataFrame(rows).convert_dtypes()
+        ImportHelper.standardize_none_values(df)
+        return df
+
     @staticmethod
     def import_receptors(df, params):
         df["receptor_identifiers"] = df["cell_id"]
@@ -26,6 +26,7 @@ class DatasetImportParams:
     metadata_column_mapping: dict = None
     number_of_processes: int = 1
     sequence_file_size: int = 50000
+    chunk_size: int = None
     organism: str = None
     import_empty_nt_sequences: bool = None
     import_empty_aa_sequences: bool = None
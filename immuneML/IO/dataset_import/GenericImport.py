@@ -99,6 +99,10 @@ class GenericImport(DataImport):
 
         separator (str): Required parameter. Column separator, for example "\\t" or ",".
 
+        chunk_size (int): If set, each repertoire file is imported in chunks of chunk_size rows, which are preprocessed and added to the
+        repertoire one after another, so that the memory needed for import does not depend on the size of the files. By default, chunk_size
+        is not set and each file is loaded at once.
+
 
     YAML specification:
 
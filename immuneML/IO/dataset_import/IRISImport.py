@@ -184,19 +184,17 @@ class IRISImport(DataImport):
         iris_params = IRISImportParams.build_object(**params)
 
         filenames = ImportHelper.get_sequence_filenames(iris_params.path, dataset_name)
-        file_index = 0
         dataset_filenames = []
+        items = []
 
-        for index, filename in enumerate(filenames):
-            items = IRISSequenceImport.import_items(filename, paired=iris_params.paired,
-                                                    all_dual_chains=iris_params.import_dual_chains,
-                                                    all_genes=iris_params.import_all_gene_combinations)
+        for filename in filenames:
+            new_items = IRISSequenceImport.import_items(filename, paired=iris_params.paired,
+                                                        all_dual_chains=iris_params.import_dual_chains,
+                                                        all_genes=iris_params.import_all_gene_combinations)
+            items = ImportHelper.store_sequence_batches(items + list(new_items), dataset_filenames, iris_params.result_path,
+                                                        iris_params.sequence_file_size)
 
-            while len(items) > iris_params.sequence_file_size or (index == len(filenames) - 1 and len(items) > 0):
-                dataset_filenames.append(iris_params.result_path / "batch_{}.pickle".format(file_index))
-                ImportHelper.store_sequence_items(dataset_filenames, items, iris_params.sequence_file_size)
-                items = items[iris_params.sequence_file_size:]
-                file_index += 1
+        ImportHelper.store_sequence_batches(items, dataset_filenames, iris_params.result_path, iris_params.sequence_file_size, store_all=True)
 
         return ReceptorDataset(filenames=dataset_filenames, file_size=iris_params.sequence_file_size, name=dataset_name) if iris_params.paired \
             else SequenceDataset(filenames=dataset_filenames, file_size=iris_params.sequence_file_size, name=dataset_name)
@@ -20,6 +20,7 @@ class IRISImportParams:
     extra_columns_to_load: list = None
     import_empty_nt_sequences: bool = None
     import_empty_aa_sequences: bool = None
+    chunk_size: int = None
 
     @classmethod
     def build_object(cls, path: Path = None, metadata_file: Path = None, result_path: Path = None, receptor_chains: str = None, **kwargs):
@@ -161,9 +161,9 @@ class MiXCRImport(DataImport):
     @staticmethod
     def _load_alleles(df: pd.DataFrame, column_name):
         # note: MiXCR omits the '/' for 'TRA.../DV' genes
-        tmp_df = df.apply(lambda row: row[column_name].split(",")[0].split("(")[0].replace("DV", "/DV").replace("//", "/"), axis=1)
+        alleles = df[column_name].str.split(",", n=1).str[0].str.split("(", n=1).str[0]
 
-        return tmp_df
+        return alleles.str.replace("DV", "/DV", regex=False).str.replace("//", "/", regex=False)
 
     @staticmethod
     def get_documentation():
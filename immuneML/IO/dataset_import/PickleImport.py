@@ -114,24 +114,23 @@ class PickleImport(DataImport):
     def _update_receptor_paths(pickle_params, dataset: ElementDataset):
         dataset_dir = PickleImport._discover_dataset_dir(pickle_params)
 
-        if len(list(dataset_dir.glob("*.pickle"))) == len(dataset.get_filenames()):
-            path = dataset_dir
-            new_filenames = []
-            for file in dataset.get_filenames():
-                new_filenames.append(path / file.name)
-            dataset.set_filenames(new_filenames)
+        if PickleImport._all_files_exist(dataset_dir, dataset.get_filenames()):
+            dataset.set_filenames([dataset_dir / file.name for file in dataset.get_filenames()])
 
         return dataset
 
     @staticmethod
     def _discover_repertoire_path(pickle_params, dataset):
         dataset_dir = PickleImport._discover_dataset_dir(pickle_params)
+        filenames = [repertoire.data_filename for repertoire in dataset.repertoires]
 
-        if len(list(dataset_dir.glob("*.npy"))) == len(dataset.repertoires):
-            path = dataset_dir
-        elif len(list(dataset_dir.glob("repertoires/*.npy"))) == len(dataset.repertoires):
-            path = dataset_dir / "repertoires/"
-        else:
-            path = None
+        for path in [dataset_dir, dataset_dir / "repertoires/"]:
+            if PickleImport._all_files_exist(path, filenames):
+                return path
+
+        return None
 
-        return path
+    @staticmethod
+    def _all_files_exist(path: Path, filenames: list) -> bool:
+        # checks only the files the dataset refers to instead of listing the directory, which is slow for large datasets
+        return path.is_dir() and all((path / filename.name).is_file() for filename in filenames)
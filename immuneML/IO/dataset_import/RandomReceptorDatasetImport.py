@@ -40,6 +40,13 @@ class RandomReceptorDatasetImport(DataImport):
                     binding: 0.7
                     not_binding: 0.3
 
+        file_size (int): how many receptors to store in one batch file; the batch files are generated in parallel.
+
+        number_of_processes (int): how many processes to use to generate the batch files in parallel; the generated dataset does not depend on
+        the number of processes.
+
+        seed (int): the seed for the random number generator; if it is not set, a different dataset is generated each time.
+
 
     YAML specification:
 
@@ -63,6 +70,9 @@ class RandomReceptorDatasetImport(DataImport):
                     epitope2: # next label with classes that will be assigned to receptors independently of the previous label or other parameters
                         1: 0.3 # 30% of the generated receptors will have class 1
                         0: 0.7 # 70% of the generated receptors will have class 0
+                file_size: 50000 # number of receptors per batch file
+                number_of_processes: 4 # number of processes to generate the batch files in parallel
+                seed: 1 # the same seed always results in the same dataset
     """
 
     @staticmethod
@@ -89,11 +99,15 @@ class RandomReceptorDatasetImport(DataImport):
                     0: 0.7 # 70% of the generated receptors will have class 0
 
         """
-        valid_keys = ["receptor_count", "chain_1_length_probabilities", "chain_2_length_probabilities", "labels", "result_path"]
+        valid_keys = ["receptor_count", "chain_1_length_probabilities", "chain_2_length_probabilities", "labels", "result_path", "file_size",
+                      "number_of_processes", "seed"]
         ParameterValidator.assert_all_in_valid_list(list(params.keys()), valid_keys, "RandomReceptorDatasetImport", "params")
 
         return RandomDatasetGenerator.generate_receptor_dataset(receptor_count=params["receptor_count"],
                                                                 chain_1_length_probabilities=params["chain_1_length_probabilities"],
                                                                 chain_2_length_probabilities=params["chain_2_length_probabilities"],
                                                                 labels=params["labels"],
-                                                                path=params["result_path"])
+                                                                path=params["result_path"],
+                                                                file_size=params["file_size"],
+                                                                number_of_processes=params["number_of_processes"],
+                                                                seed=params["seed"])
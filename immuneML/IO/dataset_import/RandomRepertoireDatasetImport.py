@@ -48,6 +48,11 @@ class RandomRepertoireDatasetImport(DataImport):
                     cmv_positive: 0.7
                     cmv_negative: 0.3
 
+        number_of_processes (int): how many processes to use to generate the repertoires in parallel; the generated dataset does not depend on
+        the number of processes.
+
+        seed (int): the seed for the random number generator; if it is not set, a different dataset is generated each time.
+
 
     YAML specification:
 
@@ -68,16 +73,21 @@ class RandomRepertoireDatasetImport(DataImport):
                     cmv:
                         True: 0.5 # probability of value True for label cmv to be assigned to any repertoire
                         False: 0.5
+                number_of_processes: 4 # number of processes to generate the repertoires in parallel
+                seed: 1 # the same seed always results in the same dataset
 
     """
 
     @staticmethod
     def import_dataset(params: dict, dataset_name: str) -> RepertoireDataset:
-        valid_keys = ["result_path", "repertoire_count", "sequence_count_probabilities", "sequence_length_probabilities", "labels"]
+        valid_keys = ["result_path", "repertoire_count", "sequence_count_probabilities", "sequence_length_probabilities", "labels",
+                      "number_of_processes", "seed"]
         ParameterValidator.assert_all_in_valid_list(list(params.keys()), valid_keys, "RandomRepertoireDatasetImport", "params")
 
         return RandomDatasetGenerator.generate_repertoire_dataset(repertoire_count=params["repertoire_count"],
                                                                   sequence_count_probabilities=params["sequence_count_probabilities"],
                                                                   sequence_length_probabilities=params["sequence_length_probabilities"],
                                                                   labels=params["labels"],
-                                                                  path=params["result_path"])
+                                                                  path=params["result_path"],
+                                                                  number_of_processes=params["number_of_processes"],
+                                                                  seed=params["seed"])
@@ -38,6 +38,13 @@ class RandomSequenceDatasetImport(DataImport):
                     binding: 0.7
                     not_binding: 0.3
 
+        file_size (int): how many sequences to store in one batch file; the batch files are generated in parallel.
+
+        number_of_processes (int): how many processes to use to generate the batch files in parallel; the generated dataset does not depend on
+        the number of processes.
+
+        seed (int): the seed for the random number generator; if it is not set, a different dataset is generated each time.
+
 
     YAML specification:
 
@@ -58,6 +65,9 @@ class RandomSequenceDatasetImport(DataImport):
                     epitope2: # next label with classes that will be assigned to sequences independently of the previous label or other parameters
                         1: 0.3 # 30% of the generated sequences will have class 1
                         0: 0.7 # 70% of the generated sequences will have class 0
+                file_size: 50000 # number of sequences per batch file
+                number_of_processes: 4 # number of processes to generate the batch files in parallel
+                seed: 1 # the same seed always results in the same dataset
     """
 
     @staticmethod
@@ -81,10 +91,14 @@ class RandomSequenceDatasetImport(DataImport):
                     0: 0.7 # 70% of the generated sequences will have class 0
 
         """
-        valid_keys = ["sequence_count", "length_probabilities", "labels", "result_path"]
+        valid_keys = ["sequence_count", "length_probabilities", "labels", "result_path", "file_size",
+                      "number_of_processes", "seed"]
         ParameterValidator.assert_all_in_valid_list(list(params.keys()), valid_keys, "RandomSequenceDatasetImport", "params")
 
         return RandomDatasetGenerator.generate_sequence_dataset(sequence_count=params["sequence_count"],
                                                                 length_probabilities=params["length_probabilities"],
                                                                 labels=params["labels"],
-                                                                path=params["result_path"])
+                                                                path=params["result_path"],
+                                                                file_size=params["file_size"],
+                                                                number_of_processes=params["number_of_processes"],
+                                                                seed=params["seed"])
@@ -177,16 +177,14 @@ class VDJdbImport(DataImport):
         Returns:
             the data frame with additional columns where the metadata (if present) were extracted
         """
-        for key, new_key in VDJdbImport.KEY_MAPPING.items():
-            df.loc[:, new_key] = ""
         meta_name = params.metadata_column_mapping["Meta"] if params.metadata_column_mapping is not None and "Meta" in params.metadata_column_mapping else "Meta"
         if meta_name in df.columns:
-            for index, row in df.iterrows():
-                if isinstance(row[meta_name], str):
-                    meta = json.loads(row[meta_name])
-                    for key, new_key in VDJdbImport.KEY_MAPPING.items():
-                        if key in meta:
-                            row[new_key] = meta[key]
+            meta = [json.loads(value) if isinstance(value, str) else {} for value in df[meta_name]]
+            for key, new_key in VDJdbImport.KEY_MAPPING.items():
+                df[new_key] = [value.get(key, "") for value in meta]
+        else:
+            for key, new_key in VDJdbImport.KEY_MAPPING.items():
+                df[new_key] = ""
 
         return df
 
@@ -0,0 +1,88 @@
+import numpy as np
+from editdistance import eval as edit_distance
+
+from immuneML.data_model.repertoire.Repertoire import Repertoire
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+
+
+class ReferenceSequenceIndex:
+    """
+    Index over a list of reference sequences (ReceptorSequence objects) to find all reference sequences matching a sequence in the same way as
+    SequenceMatcher.matches_sequence(), but without comparing the sequence to each reference sequence:
+
+        - the reference sequences are first split into buckets by chain, V gene and J gene; a sequence is looked up only in the buckets
+          with the same chain and matching genes (the same gene, or one gene being the gene family of the other, e.g. TRBV6 and TRBV6-1),
+        - if max_distance is 0, the sequences in a bucket are looked up by exact hash,
+        - otherwise, each bucket maps the deletion neighbourhood of its reference sequences (all variants with up to max_distance deleted
+          characters) to the reference sequences, so that only the references sharing a deletion variant with the sequence are candidates;
+          the candidates are then verified by computing the edit distance.
+
+    The index is built once for the reference sequences, so matching a repertoire is linear in the number of sequences in the repertoire.
+    """
+
+    def __init__(self, reference_sequences: list, max_distance: int):
+        self.max_distance = max_distance
+        self.reference_count = len(reference_sequences)
+        self._reference_strings = [reference_sequence.get_sequence() for reference_sequence in reference_sequences]
+        self._buckets = {}
+        self._gene_families = {}
+
+        for index, reference_sequence in enumerate(reference_sequences):
+            metadata = reference_sequence.metadata
+            bucket = self._buckets.setdefault((metadata.chain, metadata.v_gene, metadata.j_gene), {})
+            for variant in self._get_variants(self._reference_strings[index]):
+                bucket.setdefault(variant, []).append(index)
+
+            for gene in (metadata.v_gene, metadata.j_gene):
+                if isinstance(gene, str):
+                    self._gene_families.setdefault(gene.split("-", 1)[0], set()).add(gene)
+
+    def find_matches(self, sequence: str, chain, v_gene, j_gene) -> list:
+        """
+        :return: sorted indices of the reference sequences with the same chain, matching V and J genes and within max_distance of the sequence
+        """
+        if sequence is None:
+            return []
+
+        buckets = [self._buckets[key] for key in ((chain, v, j) for v in self._get_matching_genes(v_gene) for j in self._get_matching_genes(j_gene))
+                   if key in self._buckets]
+        if len(buckets) == 0:
+            return []
+
+        if self.max_distance == 0:
+            return sorted(index for bucket in buckets for index in bucket.get(sequence, []))
+
+        variants = self._get_variants(sequence)
+        candidates = {index for bucket in buckets for variant in variants for index in bucket.get(variant, [])}
+        return sorted(index for index in candidates if edit_distance(sequence, self._reference_strings[index]) <= self.max_distance)
+
+    def match_repertoire(self, repertoire: Repertoire) -> np.ndarray:
+        """
+        :return: an array with the sum of counts of the repertoire sequences matching each of the reference sequences
+        """
+        matches = np.zeros(self.reference_count, dtype=int)
+        sequences = repertoire.get_attribute(EnvironmentSettings.get_sequence_type().value)
+        if sequences is None or self.reference_count == 0:
+            return matches
+
+        chains, v_genes, j_genes, counts = [column if column is not None else [None] * len(sequences) for column in
+                                            (repertoire.get_chains(), repertoire.get_v_genes(), repertoire.get_j_genes(), repertoire.get_counts())]
+
+        for sequence, chain, v_gene, j_gene, count in zip(sequences, chains, v_genes, j_genes, counts):
+            for index in self.find_matches(sequence, chain, v_gene, j_gene):
+                matches[index] += count
+
+        return matches
+
+    def _get_matching_genes(self, gene) -> set:
+        if not isinstance(gene, str):
+            return {gene}
+        return {gene, gene.split("-", 1)[0]} | self._gene_families.get(gene, set())
+
+    def _get_variants(self, sequence: str) -> set:
+        variants = {sequence}
+        current = {sequence}
+        for _ in range(self.max_distance):
+            current = {variant[:i] + variant[i + 1:] for variant in current for i in range(len(variant))}
+            variants.update(current)
+        return variants
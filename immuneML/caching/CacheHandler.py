@@ -1,4 +1,3 @@
-import hashlib
 import logging
 import os
 import pickle
@@ -7,11 +6,24 @@ from pathlib import Path
 import dill
 
 from immuneML.caching.CacheObjectType import CacheObjectType
+from immuneML.caching.Fingerprinter import Fingerprinter
+from immuneML.caching.MemoryCache import MemoryCache
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.util.PathBuilder import PathBuilder
 
 
 class CacheHandler:
+    """
+    Stores intermediate results as pickle files in the cache folder (see EnvironmentSettings.get_cache_path()).
+
+    Optionally, the deserialized objects are also kept in a process-local memory tier (MemoryCache) in front of the disk store, so that
+    objects which are repeatedly needed (e.g. encoded datasets in nested cross-validation) are not loaded from disk each time. The memory
+    tier has a byte budget with least-recently-used eviction; the budget is read from the environment variable `cache_memory_limit`
+    (number of bytes, 0 by default which turns the memory tier off) or set from the `cache` section of the YAML specification via
+    `set_memory_limit()`.
+    """
+
+    memory_cache = None
 
     @staticmethod
     def get_file_path(cache_type=None):
@@ -24,13 +36,35 @@ class CacheHandler:
         h = CacheHandler._hash(params)
         return CacheHandler.get_by_key(h, object_type, cache_type)
 
+    @staticmethod
+    def get_memory_cache() -> MemoryCache:
+        if CacheHandler.memory_cache is None:
+            CacheHandler.memory_cache = MemoryCache(EnvironmentSettings.get_cache_memory_limit())
+        return CacheHandler.memory_cache
+
+    @staticmethod
+    def set_memory_limit(memory_limit: int):
+        CacheHandler.get_memory_cache().set_capacity(memory_limit)
+
+    @staticmethod
+    def get_memory_cache_stats() -> dict:
+        return CacheHandler.get_memory_cache().get_stats()
+
     @staticmethod
     def get_by_key(cache_key: str, object_type, cache_type=None):
         filename = CacheHandler._build_filename(cache_key, object_type, cache_type)
+        memory_cache = CacheHandler.get_memory_cache()
         obj = None
         if filename.is_file():
-            with filename.open("rb") as file:
-                obj = dill.load(file)
+            if memory_cache.is_enabled():
+                obj = memory_cache.get(filename)
+            if obj is None:
+                with filename.open("rb") as file:
+                    obj = dill.load(file)
+                if memory_cache.is_enabled():
+                    memory_cache.add(filename, obj, filename.stat().st_size)
+        else:
+            memory_cache.remove(filename)
         return obj
 
     @staticmethod
@@ -44,25 +78,46 @@ class CacheHandler:
         PathBuilder.build(EnvironmentSettings.get_cache_path(cache_type))
         h = CacheHandler.generate_cache_key(params)
         filename = CacheHandler._build_filename(cache_key=h, object_type=object_type, cache_type=cache_type)
-        with filename.open("wb") as file:
-            dill.dump(caching_object, file, protocol=pickle.HIGHEST_PROTOCOL)
+        CacheHandler._write(filename, caching_object)
+        CacheHandler._add_to_memory(filename, caching_object)
 
     @staticmethod
     def add_by_key(cache_key: str, caching_object, object_type: CacheObjectType = CacheObjectType.OTHER, cache_type=None):
         PathBuilder.build(EnvironmentSettings.get_cache_path(cache_type))
         filename = CacheHandler._build_filename(cache_key=cache_key, object_type=object_type, cache_type=cache_type)
         try:
-            with filename.open("wb") as file:
-                dill.dump(caching_object, file, protocol=pickle.HIGHEST_PROTOCOL)
+            CacheHandler._write(filename, caching_object)
+            CacheHandler._add_to_memory(filename, caching_object)
         except AttributeError:
-            os.remove(filename)
+            CacheHandler.get_memory_cache().remove(filename)
             logging.warning(f"CacheHandler: could not cache object of class {type(caching_object).__name__} with key {cache_key}. "
                             f"Object: {caching_object}\n"
                             f"Next time this object is needed, it will be recomputed which will take more time but should not influence results.")
 
+    @staticmethod
+    def _write(filename: Path, caching_object):
+        """
+        writes the object to a temporary file first and then moves it to the final location, so that other processes running in parallel
+        never read a partially written cache file
+        """
+        tmp_filename = filename.with_name(f"{filename.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_filename.open("wb") as file:
+                dill.dump(caching_object, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_filename, filename)
+        finally:
+            if tmp_filename.is_file():
+                os.remove(tmp_filename)
+
+    @staticmethod
+    def _add_to_memory(filename: Path, caching_object):
+        memory_cache = CacheHandler.get_memory_cache()
+        if memory_cache.is_enabled():
+            memory_cache.add(filename, caching_object, filename.stat().st_size)
+
     @staticmethod
     def generate_cache_key(params: tuple):
-        return hashlib.sha256(str(params).encode('utf-8')).hexdigest()
+        return Fingerprinter.fingerprint(params)
 
     @staticmethod
     def memo(cache_key: str, fn, object_type: CacheObjectType = CacheObjectType.OTHER, cache_type=None):
@@ -79,4 +134,4 @@ class CacheHandler:
 
     @staticmethod
     def _hash(params: tuple) -> str:
-        return hashlib.sha256(str(params).encode('utf-8')).hexdigest()
+        return Fingerprinter.fingerprint(params)
@@ -0,0 +1,173 @@
+import functools
+import hashlib
+import types
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from immuneML.data_model.dataset.Dataset import Dataset
+from immuneML.data_model.repertoire.Repertoire import Repertoire
+
+
+class Fingerprinter:
+    """
+    Computes content-based fingerprints (hex digests) of the parameters used as cache keys without converting them to strings first:
+
+        - numpy arrays are hashed from their memory buffer together with their dtype and shape (object arrays element by element),
+        - scipy sparse matrices are hashed from their index and data arrays,
+        - pandas data frames and series are hashed from their column names, dtypes, index and values,
+        - paths to existing files are hashed together with the file size and modification time, so a changed file gives a new key,
+        - datasets and repertoires are represented by their class and identifier,
+        - tuples, lists, sets and dictionaries are hashed recursively,
+        - classes and builtin functions are represented by their module and qualified name, while functions (including lambdas and closures)
+          are hashed from their code, constants, referenced names, default values and the contents of their closure cells,
+        - other objects are hashed from their class and their attributes (from `__dict__` and `__slots__`, recursively), so the fingerprint
+          never depends on the memory address or on the string representation of an object; objects without attributes raise a TypeError.
+
+    Objects which are reached again while hashing their own attributes (reference cycles) are represented by a back-reference marker.
+
+    The hashing is incremental, with BLAKE2b from the standard library, so large matrices are never copied into a string. Each value is
+    prefixed with its type and length, so that different structures with the same string representation do not share a fingerprint.
+    """
+
+    DIGEST_SIZE = 32
+
+    @staticmethod
+    def fingerprint(obj, visited: set = None) -> str:
+        hasher = hashlib.blake2b(digest_size=Fingerprinter.DIGEST_SIZE)
+        Fingerprinter.update(hasher, obj, visited)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def update(hasher, obj, visited: set = None):
+        visited = set() if visited is None else visited
+
+        if obj is None or isinstance(obj, (str, bool, int, float, complex, Enum)):
+            Fingerprinter._update_bytes(hasher, type(obj).__name__, repr(obj).encode("utf-8"))
+        elif isinstance(obj, bytes):
+            Fingerprinter._update_bytes(hasher, "bytes", obj)
+        elif isinstance(obj, np.generic):
+            Fingerprinter._update_bytes(hasher, f"np{obj.dtype.str}", obj.tobytes())
+        elif sparse.issparse(obj):
+            Fingerprinter._update_sparse(hasher, obj)
+        elif isinstance(obj, (pd.DataFrame, pd.Series)):
+            Fingerprinter._update_pandas(hasher, obj)
+        elif isinstance(obj, Path):
+            Fingerprinter._update_path(hasher, obj)
+        elif isinstance(obj, (Dataset, Repertoire)):
+            Fingerprinter._update_bytes(hasher, type(obj).__name__, str(obj.identifier).encode("utf-8"))
+        elif isinstance(obj, (type, types.BuiltinFunctionType)):
+            Fingerprinter._update_bytes(hasher, type(obj).__name__, f"{obj.__module__}.{obj.__qualname__}".encode("utf-8"))
+        elif id(obj) in visited:
+            Fingerprinter._update_header(hasher, "cycle", 0)
+        else:
+            visited.add(id(obj))
+            Fingerprinter._update_composite(hasher, obj, visited)
+            visited.remove(id(obj))
+
+    @staticmethod
+    def _update_composite(hasher, obj, visited: set):
+        """hashes objects which can contain other objects, so that reference cycles can be detected"""
+        if isinstance(obj, np.ndarray):
+            Fingerprinter._update_array(hasher, obj, visited)
+        elif isinstance(obj, (tuple, list)):
+            Fingerprinter._update_header(hasher, type(obj).__name__, len(obj))
+            for item in obj:
+                Fingerprinter.update(hasher, item, visited)
+        elif isinstance(obj, (set, frozenset)):
+            Fingerprinter._update_header(hasher, type(obj).__name__, len(obj))
+            for item_fingerprint in sorted(Fingerprinter.fingerprint(item, visited) for item in obj):
+                hasher.update(item_fingerprint.encode("utf-8"))
+        elif isinstance(obj, dict):
+            Fingerprinter._update_header(hasher, "dict", len(obj))
+            for key, value in obj.items():
+                Fingerprinter.update(hasher, key, visited)
+                Fingerprinter.update(hasher, value, visited)
+        elif isinstance(obj, types.FunctionType):
+            Fingerprinter._update_bytes(hasher, "function", f"{obj.__module__}.{obj.__qualname__}".encode("utf-8"))
+            Fingerprinter.update(hasher, obj.__code__, visited)
+            Fingerprinter.update(hasher, (obj.__defaults__, obj.__kwdefaults__), visited)
+            Fingerprinter.update(hasher, [cell.cell_contents for cell in obj.__closure__ or ()], visited)
+        elif isinstance(obj, types.CodeType):
+            Fingerprinter._update_bytes(hasher, "code", obj.co_code)
+            Fingerprinter.update(hasher, (obj.co_consts, obj.co_names), visited)
+        elif isinstance(obj, types.MethodType):
+            Fingerprinter._update_header(hasher, "method", 2)
+            Fingerprinter.update(hasher, (obj.__func__, obj.__self__), visited)
+        elif isinstance(obj, functools.partial):
+            Fingerprinter._update_header(hasher, "partial", 3)
+            Fingerprinter.update(hasher, (obj.func, obj.args, obj.keywords), visited)
+        else:
+            Fingerprinter._update_object(hasher, obj, visited)
+
+    @staticmethod
+    def _update_object(hasher, obj, visited: set):
+        attributes = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+        for cls in type(obj).__mro__:
+            slots = getattr(cls, "__slots__", ())
+            for slot in [slots] if isinstance(slots, str) else slots:
+                if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                    attributes[slot] = getattr(obj, slot)
+
+        if not hasattr(obj, "__dict__") and len(attributes) == 0:
+            raise TypeError(f"{Fingerprinter.__name__}: objects of type {type(obj).__name__} cannot be fingerprinted.")
+
+        Fingerprinter._update_header(hasher, f"{type(obj).__module__}.{type(obj).__qualname__}", len(attributes))
+        Fingerprinter.update(hasher, attributes, visited)
+
+    @staticmethod
+    def _update_header(hasher, type_name: str, length: int):
+        hasher.update(f"{type_name}:{length}:".encode("utf-8"))
+
+    @staticmethod
+    def _update_bytes(hasher, type_name: str, value):
+        Fingerprinter._update_header(hasher, type_name, len(value))
+        hasher.update(value)
+
+    @staticmethod
+    def _update_array(hasher, array: np.ndarray, visited: set = None):
+        Fingerprinter._update_header(hasher, f"ndarray{array.shape}{array.dtype.str}", array.size)
+        if array.dtype.hasobject:
+            for item in array.ravel():
+                Fingerprinter.update(hasher, item, visited)
+        else:
+            hasher.update(np.ascontiguousarray(array).view(np.uint8).ravel() if array.size > 0 else b"")
+
+    @staticmethod
+    def _update_sparse(hasher, matrix):
+        if matrix.format == "coo":
+            arrays = (matrix.row, matrix.col, matrix.data)
+        elif matrix.format in ("csr", "csc", "bsr"):
+            arrays = (matrix.indptr, matrix.indices, matrix.data)
+        else:
+            matrix = matrix.tocsr()
+            arrays = (matrix.indptr, matrix.indices, matrix.data)
+
+        Fingerprinter._update_header(hasher, f"sparse{matrix.shape}{matrix.format}", matrix.nnz)
+        for array in arrays:
+            Fingerprinter._update_array(hasher, array)
+
+    @staticmethod
+    def _update_pandas(hasher, obj):
+        Fingerprinter._update_header(hasher, type(obj).__name__, len(obj))
+        if isinstance(obj, pd.DataFrame):
+            Fingerprinter.update(hasher, [str(column) for column in obj.columns])
+            Fingerprinter.update(hasher, [str(dtype) for dtype in obj.dtypes])
+        else:
+            Fingerprinter.update(hasher, [str(obj.name), str(obj.dtype)])
+        try:
+            Fingerprinter._update_array(hasher, pd.util.hash_pandas_object(obj, index=True).values)
+        except TypeError:
+            Fingerprinter.update(hasher, [str(index) for index in obj.index])
+            Fingerprinter._update_array(hasher, obj.values)
+
+    @staticmethod
+    def _update_path(hasher, path: Path):
+        Fingerprinter._update_bytes(hasher, "Path", path.as_posix().encode("utf-8"))
+        if path.is_file():
+            stat = path.stat()
+            Fingerprinter._update_header(hasher, "stat", stat.st_size)
+            hasher.update(str(stat.st_mtime_ns).encode("utf-8"))
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from threading import RLock
+
+
+class MemoryCache:
+    """
+    Process-local least-recently-used store of already deserialized objects, used by CacheHandler in front of the pickle files on disk.
+
+    The size of each object is approximated by the size of its pickled representation (as written to the cache folder), which is
+    accounted against the byte budget (capacity). When the budget is exceeded, the least recently used objects are evicted. Objects
+    larger than the whole budget are not kept in memory. A capacity of 0 disables the memory tier.
+
+    Objects are returned as stored, so the objects obtained from the cache should not be modified in place.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._lock = RLock()
+        self._items = OrderedDict()
+        self.capacity = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.set_capacity(capacity)
+
+    def set_capacity(self, capacity: int):
+        assert isinstance(capacity, int) and capacity >= 0, \
+            f"MemoryCache: capacity has to be a non-negative number of bytes, got {capacity} instead."
+        with self._lock:
+            self.capacity = capacity
+            self._evict()
+
+    def is_enabled(self) -> bool:
+        return self.capacity > 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            else:
+                self.misses += 1
+                return None
+
+    def add(self, key, obj, size: int):
+        with self._lock:
+            self.remove(key)
+            if obj is not None and 0 <= size <= self.capacity:
+                self._items[key] = (obj, size)
+                self.size += size
+                self._evict()
+
+    def remove(self, key):
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"capacity": self.capacity, "size": self.size, "items": len(self._items), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    def _evict(self):
+        while self.size > self.capacity and len(self._items) > 0:
+            _, (_, size) = self._items.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
@@ -1,5 +1,8 @@
+from pathlib import Path
 from uuid import uuid4
 
+import numpy as np
+
 from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
@@ -9,10 +12,13 @@ class ElementDataset(Dataset):
     """
     This is the base class for ReceptorDataset and SequenceDataset which implements all the functionality for both classes. The only difference between
     these two classes is whether paired or single chain data is stored.
+
+    If element_indices are set, the dataset is a view on the batch files which includes only the examples with these indices (e.g., a
+    training or test subset of another dataset); the examples are stored to new batch files only when the dataset is exported.
     """
 
     def __init__(self, labels: dict = None, encoded_data: EncodedData = None, filenames: list = None, identifier: str = None,
-                 file_size: int = 50000, name: str = None):
+                 file_size: int = 50000, name: str = None, element_indices: np.ndarray = None):
         super().__init__()
         self.labels = labels
         self.encoded_data = encoded_data
@@ -20,18 +26,24 @@ class ElementDataset(Dataset):
         self._filenames = sorted(filenames) if filenames is not None else []
         self.element_generator = ElementGenerator(self._filenames, file_size)
         self.file_size = file_size
-        self.element_ids = None
         self.name = name
+        self.element_indices = element_indices
 
-    def get_data(self, batch_size: int = 10000):
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("element_indices", None)
+
+    def _get_element_generator(self) -> ElementGenerator:
         self._filenames.sort()
         self.element_generator.file_list = self._filenames
-        return self.element_generator.build_element_generator()
+        self.element_generator.element_indices = self.element_indices
+        return self.element_generator
+
+    def get_data(self, batch_size: int = 10000):
+        return self._get_element_generator().build_element_generator()
 
     def get_batch(self, batch_size: int = 10000):
-        self._filenames.sort()
-        self.element_generator.file_list = self._filenames
-        return self.element_generator.build_batch_generator()
+        return self._get_element_generator().build_batch_generator()
 
     def get_filenames(self):
         return self._filenames
@@ -40,22 +52,32 @@ class ElementDataset(Dataset):
         self._filenames = filenames
 
     def get_example_count(self):
-        return len(self.get_example_ids())
+        return self._get_element_generator().get_element_count()
 
     def get_example_ids(self):
-        if self.element_ids is None or (isinstance(self.element_ids, list) and len(self.element_ids) == 0):
-            self.element_ids = []
-            for element in self.get_data():
-                self.element_ids.append(element.identifier)
-        return self.element_ids
+        return self._get_element_generator().get_element_ids()
+
+    def get_examples(self, example_indices: list) -> list:
+        """Returns the examples (receptors or receptor sequences) with the given indices, loading only the batch files which include them"""
+        return self._get_element_generator().get_elements(example_indices)
+
+    def get_attribute(self, attribute: str):
+        """Returns a numpy array with the values of the attribute (e.g., sequence_aas or alpha.sequence_aas) for all examples or None if the
+        attribute is not present; only the corresponding column is read from the batch files, without creating the example objects"""
+        return self.get_attributes([attribute]).get(attribute, None)
+
+    def get_attributes(self, attributes: list) -> dict:
+        """Returns a dict of attribute name -> numpy array with attribute values for all examples, reading only the requested columns"""
+        return self._get_element_generator().get_attributes(attributes)
 
     def make_subset(self, example_indices, path, dataset_type: str):
         """
         Creates a new dataset object with only those examples (receptors or receptor sequences) available which were given by index in example_indices argument.
+        The new dataset is a view on the batch files of this dataset, so no examples are stored when creating the subset.
 
         Args:
             example_indices (list): a list of indices of examples (receptors or receptor sequences) to use in the new dataset
-            path (Path): a path where to store the newly created dataset
+            path (Path): a path where to store the newly created dataset; not used since the subset refers to the batch files of this dataset
             dataset_type (str): a type of the dataset used as a part of the name of the resulting dataset; the values are defined as constants in :py:obj:`~immuneML.data_model.dataset.Dataset.Dataset`
 
         Returns:
@@ -63,11 +85,25 @@ class ElementDataset(Dataset):
             a new dataset object (ReceptorDataset or SequenceDataset, as the original dataset) which includes only the examples specified under example_indices
 
         """
-        new_dataset = self.__class__(labels=self.labels, file_size=self.file_size)
-        batch_filenames = self.element_generator.make_subset(example_indices, path, dataset_type, new_dataset.identifier)
-        new_dataset.set_filenames(batch_filenames)
+        if example_indices is None or len(example_indices) == 0:
+            raise RuntimeError(f"{ElementDataset.__name__}: no examples were specified to create the dataset subset. "
+                               f"Dataset type was {dataset_type}, dataset identifier: {self.identifier}.")
+
+        element_generator = self._get_element_generator()
+        new_dataset = self.__class__(labels=self.labels, file_size=self.file_size, filenames=list(self._filenames),
+                                     element_indices=element_generator.get_subset_indices(example_indices))
+        new_dataset.element_generator.file_indices = element_generator.file_indices
         return new_dataset
 
+    def materialize(self, path: Path):
+        """If the dataset is a view on the batch files of another dataset, stores its examples to new batch files under path and uses them
+        from then on"""
+        if self.element_indices is not None:
+            element_generator = self._get_element_generator()
+            filenames = element_generator.make_subset(list(range(element_generator.get_element_count())), path, "subset", self.identifier)
+            self.element_indices = None
+            self.set_filenames(filenames)
+
     def get_label_names(self):
         """Returns the list of metadata fields which can be used as labels"""
         return [label for label in list(self.labels.keys()) if label not in ['region_type', 'receptor_chains', 'organism']]
@@ -12,6 +12,14 @@ from immuneML.environment.Constants import Constants
 
 
 class RepertoireDataset(Dataset):
+    """
+    Dataset of repertoires with the repertoire-level information (e.g., labels, subject ids, filenames) stored in the metadata file.
+
+    The metadata file is parsed once and kept in memory with the label columns stored as categorical values; it is parsed again only if
+    the dataset points to another metadata file or if the file was modified in the meantime.
+    """
+
+    NON_LABEL_FIELDS = ["subject_id", "filename", "repertoire_identifier", "identifier"]
 
     def __init__(self, labels: dict = None, encoded_data: EncodedData = None, repertoires: list = None, identifier: str = None,
                  metadata_file: Path = None, name: str = None):
@@ -20,6 +28,30 @@ class RepertoireDataset(Dataset):
         self.metadata_fields = None
         self.repertoire_ids = None
         self.repertoires = repertoires
+        self._metadata_cache = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_metadata_cache"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_metadata_cache", None)
+
+    def _get_metadata_df(self) -> pd.DataFrame:
+        """Returns the parsed metadata file, reusing the previously parsed one if the metadata file is the same and was not modified since"""
+        file_stat = Path(self.metadata_file).stat()
+        key = (Path(self.metadata_file), file_stat.st_mtime_ns, file_stat.st_size)
+
+        if self._metadata_cache is None or self._metadata_cache[0] != key:
+            df = pd.read_csv(self.metadata_file, sep=",", comment=Constants.COMMENT_SIGN)
+            for column in df.columns:
+                if column not in RepertoireDataset.NON_LABEL_FIELDS:
+                    df[column] = df[column].astype("category")
+            self._metadata_cache = (key, df)
+
+        return self._metadata_cache[1]
 
     def clone(self):
         return RepertoireDataset(self.labels, copy.deepcopy(self.encoded_data), copy.deepcopy(self.repertoires),
@@ -45,14 +77,13 @@ class RepertoireDataset(Dataset):
     def get_metadata_fields(self, refresh=False):
         """Returns the list of metadata fields, includes also the fields that will typically not be used as labels, like filename or identifier"""
         if self.metadata_fields is None or refresh:
-            df = pd.read_csv(self.metadata_file, sep=",", nrows=0, comment=Constants.COMMENT_SIGN)
-            self.metadata_fields = df.columns.values.tolist()
+            self.metadata_fields = self._get_metadata_df().columns.values.tolist()
         return self.metadata_fields
 
     def get_label_names(self, refresh=False):
         """Returns the list of metadata fields which can be used as labels; if refresh=True, it reloads the fields from disk"""
         all_metadata_fields = set(self.get_metadata_fields(refresh))
-        for non_label in ["subject_id", "filename", "repertoire_identifier", "identifier"]:
+        for non_label in RepertoireDataset.NON_LABEL_FIELDS:
             if non_label in all_metadata_fields:
                 all_metadata_fields.remove(non_label)
 
@@ -76,7 +107,18 @@ class RepertoireDataset(Dataset):
             f"RepertoireDataset: for dataset {self.name} (id: {self.identifier}) metadata file is not set properly. The metadata file points to " \
             f"{self.metadata_file}."
 
-        df = pd.read_csv(self.metadata_file, sep=",", usecols=field_names, comment=Constants.COMMENT_SIGN)
+        metadata_df = self._get_metadata_df()
+        field_names = metadata_df.columns.tolist() if field_names is None else field_names
+
+        missing_fields = [field for field in field_names if field not in metadata_df.columns]
+        if len(missing_fields) > 0:
+            raise ValueError(f"RepertoireDataset: fields {missing_fields} are not present in the metadata file {self.metadata_file} of dataset "
+                             f"{self.name} (id: {self.identifier}). Available fields are: {metadata_df.columns.tolist()}.")
+
+        # categorical columns are converted back to the type of their values, so that the result is the same as if the file was parsed
+        df = pd.DataFrame({field: metadata_df[field].astype(metadata_df[field].cat.categories.dtype)
+                           if isinstance(metadata_df[field].dtype, pd.CategoricalDtype) else metadata_df[field].copy()
+                           for field in metadata_df.columns if field in field_names})
         if return_df:
             return df
         else:
@@ -88,7 +130,7 @@ class RepertoireDataset(Dataset):
 
     def _build_new_metadata(self, indices, path: Path) -> Path:
         if self.metadata_file:
-            df = pd.read_csv(self.metadata_file, comment=Constants.COMMENT_SIGN)
+            df = self.get_metadata(None, return_df=True)
             df = df.iloc[indices, :]
             df.to_csv(path, index=False)
             return path
@@ -1,14 +1,15 @@
 import copy
 import logging
 import math
-import pickle
 from pathlib import Path
 from typing import List
 
 import pandas as pd
 
 from immuneML.data_model.dataset.ElementDataset import ElementDataset
+from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.util.ColumnStoreHelper import ColumnStoreHelper
 
 
 class SequenceDataset(ElementDataset):
@@ -19,12 +20,12 @@ class SequenceDataset(ElementDataset):
     def build(cls, sequences: List[ReceptorSequence], file_size: int, path: Path, name: str = None):
 
         file_count = math.ceil(len(sequences) / file_size)
-        file_names = [path / f"batch{''.join(['0' for i in range(1, len(str(file_count)) - len(str(index)) + 1)])}{index}.pickle"
+        file_names = [path / f"batch{''.join(['0' for i in range(1, len(str(file_count)) - len(str(index)) + 1)])}{index}"
+                             f"{ColumnStoreHelper.FILE_EXTENSION}"
                       for index in range(1, file_count+1)]
 
         for index in range(file_count):
-            with file_names[index].open("wb") as file:
-                pickle.dump(sequences[index*file_size:(index+1)*file_size], file)
+            ElementGenerator.store_elements(file_names[index], sequences[index*file_size:(index+1)*file_size])
 
         return SequenceDataset(filenames=file_names, file_size=file_size, name=name)
 
@@ -45,4 +46,5 @@ class SequenceDataset(ElementDataset):
         return pd.DataFrame(result) if return_df else result
 
     def clone(self):
-        return SequenceDataset(self.labels, copy.deepcopy(self.encoded_data), copy.deepcopy(self._filenames), file_size=self.file_size)
+        return SequenceDataset(self.labels, copy.deepcopy(self.encoded_data), copy.deepcopy(self._filenames), file_size=self.file_size,
+                               element_indices=copy.deepcopy(self.element_indices))
@@ -0,0 +1,143 @@
+import numpy as np
+
+from immuneML.data_model.receptor.BCKReceptor import BCKReceptor
+from immuneML.data_model.receptor.BCReceptor import BCReceptor
+from immuneML.data_model.receptor.Receptor import Receptor
+from immuneML.data_model.receptor.TCABReceptor import TCABReceptor
+from immuneML.data_model.receptor.TCGDReceptor import TCGDReceptor
+from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
+from immuneML.data_model.repertoire.Repertoire import Repertoire
+
+
+class ElementColumnHelper:
+    """
+    Converts lists of receptor sequences or receptors to columns which can be stored with ColumnStoreHelper and back.
+
+    Sequences are stored with the same column names as repertoires (e.g., sequence_aas, v_genes, chains, sequence_identifiers), custom params
+    are stored as additional columns under their own names and sequence annotations (e.g., implanted signals) under 'annotations'.
+
+    Receptors are stored with one row per receptor: the identifier and the receptor type are stored under 'receptor_identifiers' and
+    'receptor_types', the columns of each chain are prefixed by the chain name (e.g., 'alpha.sequence_aas', 'beta.v_genes') and the receptor
+    metadata is stored under the metadata keys.
+    """
+
+    SEQUENCE_ATTRIBUTES = {"sequence_aas": "amino_acid_sequence", "sequences": "nucleotide_sequence", "sequence_identifiers": "identifier"}
+    METADATA_ATTRIBUTES = {"v_genes": "v_gene", "j_genes": "j_gene", "v_subgroups": "v_subgroup", "j_subgroups": "j_subgroup",
+                           "v_alleles": "v_allele", "j_alleles": "j_allele", "chains": "chain", "counts": "count", "region_types": "region_type",
+                           "frame_types": "frame_type", "cell_ids": "cell_id"}
+    ANNOTATIONS = "annotations"
+    RECEPTOR_IDENTIFIERS = "receptor_identifiers"
+    RECEPTOR_TYPES = "receptor_types"
+    RECEPTOR_CLASSES = {receptor_class.__name__: receptor_class for receptor_class in [TCABReceptor, TCGDReceptor, BCReceptor, BCKReceptor]}
+    CHAIN_SEPARATOR = "."
+
+    @staticmethod
+    def to_columns(elements: list) -> dict:
+        """Returns a dict of column name -> list of values for the given receptors or receptor sequences; columns without values are skipped"""
+        if len(elements) > 0 and all(isinstance(element, Receptor) for element in elements):
+            columns = ElementColumnHelper._receptors_to_columns(elements)
+        else:
+            columns = ElementColumnHelper._sequences_to_columns(elements)
+
+        return {name: values for name, values in columns.items() if any(value is not None for value in values)}
+
+    @staticmethod
+    def get_categorical_columns(columns: dict) -> tuple:
+        return tuple(name for name in columns if name == ElementColumnHelper.RECEPTOR_TYPES
+                     or name.split(ElementColumnHelper.CHAIN_SEPARATOR)[-1] in Repertoire.CATEGORICAL_FIELDS)
+
+    @staticmethod
+    def from_columns(columns: dict) -> list:
+        """Creates the receptors or receptor sequences from the columns as returned by to_columns() or read from the column store"""
+        columns = {name: values.tolist() if isinstance(values, np.ndarray) else list(values) for name, values in columns.items()}
+
+        if ElementColumnHelper.RECEPTOR_TYPES in columns:
+            return ElementColumnHelper._receptors_from_columns(columns)
+        else:
+            return ElementColumnHelper._sequences_from_columns(columns)
+
+    @staticmethod
+    def _sequences_to_columns(sequences: list) -> dict:
+        columns = {name: [getattr(sequence, attribute) for sequence in sequences]
+                   for name, attribute in ElementColumnHelper.SEQUENCE_ATTRIBUTES.items()}
+        columns.update({name: [getattr(sequence.metadata, attribute) if sequence.metadata is not None else None for sequence in sequences]
+                        for name, attribute in ElementColumnHelper.METADATA_ATTRIBUTES.items()})
+
+        custom_params = list(dict.fromkeys(key for sequence in sequences if sequence.metadata is not None
+                                           for key in sequence.metadata.custom_params))
+        columns.update({key: [sequence.metadata.custom_params.get(key, None) if sequence.metadata is not None else None for sequence in sequences]
+                        for key in custom_params})
+
+        columns[ElementColumnHelper.ANNOTATIONS] = [sequence.annotation for sequence in sequences]
+
+        return columns
+
+    @staticmethod
+    def _sequences_from_columns(columns: dict) -> list:
+        count = len(next(iter(columns.values()))) if len(columns) > 0 else 0
+        missing = [None for _ in range(count)]
+
+        standard_names = list(ElementColumnHelper.SEQUENCE_ATTRIBUTES) + list(ElementColumnHelper.METADATA_ATTRIBUTES) \
+                         + [ElementColumnHelper.ANNOTATIONS]
+        custom_params = [name for name in columns if name not in standard_names]
+
+        values = {name: columns.get(name, missing) for name in standard_names}
+        custom_values = [columns[name] for name in custom_params]
+
+        return [ReceptorSequence(amino_acid_sequence=values["sequence_aas"][index], nucleotide_sequence=values["sequences"][index],
+                                 identifier=values["sequence_identifiers"][index], annotation=values[ElementColumnHelper.ANNOTATIONS][index],
+                                 metadata=SequenceMetadata(**{attribute: values[name][index]
+                                                              for name, attribute in ElementColumnHelper.METADATA_ATTRIBUTES.items()},
+                                                           custom_params={key: custom_value[index] for key, custom_value
+                                                                          in zip(custom_params, custom_values)}))
+                for index in range(count)]
+
+    @staticmethod
+    def _receptors_to_columns(receptors: list) -> dict:
+        columns = {ElementColumnHelper.RECEPTOR_IDENTIFIERS: [receptor.identifier for receptor in receptors],
+                   ElementColumnHelper.RECEPTOR_TYPES: [type(receptor).__name__ for receptor in receptors]}
+
+        chains = list(dict.fromkeys(chain for receptor in receptors for chain in receptor.get_chains()))
+        for chain in chains:
+            sequences = [getattr(receptor, chain, None) if chain in receptor.get_chains() else None for receptor in receptors]
+            present = [sequence for sequence in sequences if sequence is not None]
+            chain_columns = ElementColumnHelper._sequences_to_columns(present)
+            for name, values in chain_columns.items():
+                values = iter(values)
+                columns[f"{chain}{ElementColumnHelper.CHAIN_SEPARATOR}{name}"] = [next(values) if sequence is not None else None
+                                                                                   for sequence in sequences]
+
+        metadata_keys = list(dict.fromkeys(key for receptor in receptors if receptor.metadata is not None for key in receptor.metadata))
+        columns.update({key: [receptor.metadata.get(key, None) if receptor.metadata is not None else None for receptor in receptors]
+                        for key in metadata_keys})
+
+        return columns
+
+    @staticmethod
+    def _receptors_from_columns(columns: dict) -> list:
+        receptor_types = columns[ElementColumnHelper.RECEPTOR_TYPES]
+        identifiers = columns.get(ElementColumnHelper.RECEPTOR_IDENTIFIERS, [None for _ in receptor_types])
+
+        receptor_chains = {receptor_type: ElementColumnHelper.RECEPTOR_CLASSES[receptor_type](identifier="").get_chains()
+                           for receptor_type in set(receptor_types)}
+        chain_names = {chain for chains in receptor_chains.values() for chain in chains}
+
+        chain_columns, metadata_columns = {}, {}
+        for name, values in columns.items():
+            chain, _, column_name = name.partition(ElementColumnHelper.CHAIN_SEPARATOR)
+            if chain in chain_names and column_name != "":
+                chain_columns.setdefault(chain, {})[column_name] = values
+            elif name not in [ElementColumnHelper.RECEPTOR_IDENTIFIERS, ElementColumnHelper.RECEPTOR_TYPES]:
+                metadata_columns[name] = values
+
+        sequences = {chain: ElementColumnHelper._sequences_from_columns(values) for chain, values in chain_columns.items()}
+
+        receptors = []
+        for index, receptor_type in enumerate(receptor_types):
+            chains = {chain: sequences[chain][index] if chain in sequences else None for chain in receptor_chains[receptor_type]}
+            receptors.append(ElementColumnHelper.RECEPTOR_CLASSES[receptor_type](**chains, identifier=identifiers[index],
+                                                                                 metadata={key: values[index] for key, values
+                                                                                           in metadata_columns.items()}))
+
+        return receptors
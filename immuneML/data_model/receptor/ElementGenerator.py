@@ -1,37 +1,212 @@
+import logging
 import math
+import os
 import pickle
 from pathlib import Path
 
+import numpy as np
+
+from immuneML.data_model.receptor.ElementColumnHelper import ElementColumnHelper
+from immuneML.util.ColumnStoreHelper import ColumnStoreHelper
+
+
 class ElementGenerator:
+    """
+    Loads elements (receptors or receptor sequences) from batch files. Next to each batch file, a small index file is stored with the number of
+    elements in the batch and their identifiers, so that counting elements, looking up their identifiers and accessing them by index does not
+    require loading all batch files. For batch files without an index file, the index is computed from the batch when first needed.
+
+    Batch files are stored in the columnar format (see ColumnStoreHelper and ElementColumnHelper), so that single attributes of all elements
+    can be read without creating the element objects. Batch files with pickled lists of elements (the older format) can still be loaded.
+
+    If element_indices are set, the generator is a view on the batch files which includes only the elements with these indices (sorted, in
+    the order of elements in the batch files); subsets are created this way without storing the elements again.
+    """
+
+    INDEX_FILE_EXTENSION = ".iml_index"
 
-    def __init__(self, file_list: list, file_size: int = 1000):
+    def __init__(self, file_list: list, file_size: int = 1000, element_indices: np.ndarray = None):
         self.file_list = file_list
-        self.file_lengths = [-1 for i in range(len(file_list))]
         self.file_size = file_size
+        self.file_indices = {}
+        self.element_indices = element_indices
+
+    def __setstate__(self, state):
+        # generators pickled before the index files were introduced only kept the number of elements per file
+        state.pop("file_lengths", None)
+        self.__dict__.update(state)
+        self.__dict__.setdefault("file_indices", {})
+        self.__dict__.setdefault("element_indices", None)
+
+    @staticmethod
+    def get_index_filename(filename: Path) -> Path:
+        return filename.with_suffix(ElementGenerator.INDEX_FILE_EXTENSION)
+
+    @staticmethod
+    def is_columnar(filename: Path) -> bool:
+        return filename.suffix == ColumnStoreHelper.FILE_EXTENSION
+
+    @staticmethod
+    def store_elements(filename: Path, elements: list):
+        """Stores the elements to the batch file and the element count and identifiers to the index file next to it"""
+        if ElementGenerator.is_columnar(filename):
+            columns = ElementColumnHelper.to_columns(elements)
+            ColumnStoreHelper.write(filename, columns, ElementColumnHelper.get_categorical_columns(columns))
+        else:
+            ElementGenerator._store_pickle(filename, elements)
+        ElementGenerator._store_pickle(ElementGenerator.get_index_filename(filename), ElementGenerator._make_file_index(elements))
+
+    @staticmethod
+    def _store_pickle(filename: Path, obj):
+        # as the column store, the file is replaced instead of overwritten in place to keep the content of hard links to it
+        tmp_filename = filename.with_name(f".{filename.name}.tmp")
+        with tmp_filename.open("wb") as file:
+            pickle.dump(obj, file)
+        os.replace(tmp_filename, filename)
+
+    @staticmethod
+    def _make_file_index(elements: list) -> dict:
+        return {"element_count": len(elements), "element_ids": [element.identifier for element in elements]}
 
     def _load_batch(self, current_file: int):
+        filename = self.file_list[current_file]
 
-        with self.file_list[current_file].open("rb") as file:
-            elements = pickle.load(file)
+        if ElementGenerator.is_columnar(filename):
+            elements = ElementColumnHelper.from_columns(ColumnStoreHelper.read_columns(filename, ColumnStoreHelper.get_column_names(filename)))
+        else:
+            with filename.open("rb") as file:
+                elements = pickle.load(file)
 
         return elements
 
-    def _get_element_count(self, file_index: int):
+    def _load_columns(self, file_index: int, attributes: list) -> dict:
+        filename = self.file_list[file_index]
+
+        if ElementGenerator.is_columnar(filename):
+            return ColumnStoreHelper.read_columns(filename, attributes)
+        else:
+            element_columns = ElementColumnHelper.to_columns(self._load_batch(file_index))
+            return {attribute: ElementGenerator._to_object_array(element_columns[attribute]) if attribute in element_columns else None
+                    for attribute in attributes}
+
+    @staticmethod
+    def _to_object_array(values: list) -> np.ndarray:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+    def get_attributes(self, attributes: list) -> dict:
+        """
+        Returns a dict of attribute name -> numpy array with the attribute values of all elements, reading only the requested columns from
+        the batch files; attributes which are not present in any batch file are not included in the result
+        """
+        parts = {attribute: [] for attribute in attributes}
 
-        # TODO: make this abstract and move implementation to specific generator: count elements in file for new format
+        for file_index, batch_indices in self._get_file_selections():
+            columns = self._load_columns(file_index, attributes)
+            count = self._get_element_count(file_index) if batch_indices is None else len(batch_indices)
+            for attribute in attributes:
+                column = columns[attribute]
+                if column is None:
+                    parts[attribute].append(count)
+                else:
+                    parts[attribute].append(column if batch_indices is None else column[batch_indices])
 
-        if self.file_lengths[file_index] == -1:
-            with self.file_list[file_index].open("rb") as file:
-                count = len(pickle.load(file))
-            self.file_lengths[file_index] = count
+        result = {}
+        for attribute in attributes:
+            if any(isinstance(part, np.ndarray) for part in parts[attribute]):
+                result[attribute] = np.concatenate([part if isinstance(part, np.ndarray) else np.full(part, None, dtype=object)
+                                                    for part in parts[attribute]])
+            else:
+                logging.warning(f"{ElementGenerator.__name__}: attribute {attribute} is not present in the dataset, skipping...")
 
-        return self.file_lengths[file_index]
+        return result
+
+    def _get_file_index(self, file_index: int) -> dict:
+        filename = self.file_list[file_index]
+
+        if filename not in self.file_indices:
+            index_filename = ElementGenerator.get_index_filename(filename)
+            if index_filename.is_file():
+                with index_filename.open("rb") as file:
+                    self.file_indices[filename] = pickle.load(file)
+            else:
+                self.file_indices[filename] = ElementGenerator._make_file_index(self._load_batch(file_index))
+
+        return self.file_indices[filename]
+
+    def _get_element_count(self, file_index: int):
+        return self._get_file_index(file_index)["element_count"]
 
     def get_element_count(self):
-        for index in range(len(self.file_list)):
-            if self.file_lengths[index] == -1:
-                self._get_element_count(index)
-        return sum(self.file_lengths)
+        if self.element_indices is not None:
+            return len(self.element_indices)
+        return sum(self._get_element_count(index) for index in range(len(self.file_list)))
+
+    def get_element_ids(self) -> list:
+        element_ids = []
+        for file_index, batch_indices in self._get_file_selections():
+            file_element_ids = self._get_file_index(file_index)["element_ids"]
+            element_ids.extend(file_element_ids if batch_indices is None else [file_element_ids[index] for index in batch_indices])
+        return element_ids
+
+    def get_subset_indices(self, example_indices: list) -> np.ndarray:
+        """Returns the sorted indices of the elements in the batch files which correspond to the given indices of elements of this generator"""
+        return np.sort(self._to_file_element_indices(example_indices))
+
+    def _to_file_element_indices(self, example_indices: list) -> np.ndarray:
+        example_indices = np.array(example_indices, dtype=int)
+
+        if self.element_indices is None:
+            return example_indices
+
+        assert np.all((example_indices >= 0) & (example_indices < len(self.element_indices))), \
+            f"{ElementGenerator.__name__}: element indices have to be between 0 and {len(self.element_indices) - 1}, got " \
+            f"{example_indices.tolist()} instead."
+
+        return self.element_indices[example_indices]
+
+    def _get_file_selections(self):
+        """Yields the index of each batch file with the indices of the included elements in the batch or None if all elements are included"""
+        if self.element_indices is None:
+            for file_index in range(len(self.file_list)):
+                yield file_index, None
+        else:
+            for file_index, _, batch_indices in self._group_by_file(self.element_indices):
+                yield file_index, batch_indices
+
+    def get_file_offsets(self) -> np.ndarray:
+        """Returns the index of the first element of each batch file in the dataset, followed by the total number of elements"""
+        return np.concatenate([[0], np.cumsum([self._get_element_count(index) for index in range(len(self.file_list))])]).astype(int)
+
+    def get_elements(self, example_indices: list) -> list:
+        """Returns the elements with the given indices in the given order, loading only the batch files which include them"""
+        example_indices = self._to_file_element_indices(example_indices)
+        elements = [None for _ in range(len(example_indices))]
+
+        for batch, positions, batch_indices in self._load_batches_with_indices(example_indices):
+            for position, batch_index in zip(positions, batch_indices):
+                elements[position] = batch[batch_index]
+
+        return elements
+
+    def _load_batches_with_indices(self, example_indices: np.ndarray):
+        for file_index, positions, batch_indices in self._group_by_file(example_indices):
+            yield self._load_batch(file_index), positions, batch_indices
+
+    def _group_by_file(self, example_indices: np.ndarray):
+        """For indices of elements in the batch files, yields the index of each batch file which includes some of them, their positions in
+        example_indices and their indices within the batch"""
+        offsets = self.get_file_offsets()
+
+        assert np.all((example_indices >= 0) & (example_indices < offsets[-1])), \
+            f"{ElementGenerator.__name__}: element indices have to be between 0 and {offsets[-1] - 1}, got {example_indices.tolist()} instead."
+
+        file_indices = np.searchsorted(offsets, example_indices, side="right") - 1
+
+        for file_index in np.unique(file_indices):
+            positions = np.flatnonzero(file_indices == file_index)
+            yield file_index, positions, example_indices[positions] - offsets[file_index]
 
     def build_batch_generator(self):
         """
@@ -41,59 +216,44 @@ class ElementGenerator:
         :return: element generator
         """
 
-        for current_file_index in range(len(self.file_list)):
+        for current_file_index, batch_indices in self._get_file_selections():
             batch = self._load_batch(current_file_index)
-            yield batch
+            yield batch if batch_indices is None else [batch[index] for index in batch_indices]
 
     def build_element_generator(self):
         """
         creates a generator which will return one element at the time
         :return: element generator
         """
-        for current_file_index in range(len(self.file_list)):
-            batch = self._load_batch(current_file_index)
+        for batch in self.build_batch_generator():
             for element in batch:
                 yield element
 
     def make_subset(self, example_indices: list, path: Path, dataset_type: str, dataset_identifier: str):
+        """Stores the elements with the given indices to new batch files under path and returns the list of new batch files"""
         if example_indices is None or len(example_indices) == 0:
             raise RuntimeError(f"{ElementGenerator.__name__}: no examples were specified to create the dataset subset. "
                                f"Dataset type was {dataset_type}, dataset identifier: {dataset_identifier}.")
-        batch_size = self.file_size
-        elements = []
-        file_count = 1
-
-        example_indices.sort()
 
+        example_indices = self.get_subset_indices(example_indices)
         batch_filenames = self._prepare_batch_filenames(len(example_indices), path, dataset_type, dataset_identifier)
+        elements, file_count = [], 0
 
-        for index, batch in enumerate(self.build_batch_generator()):
-            extracted_elements = self._extract_elements_from_batch(index, batch_size, batch, example_indices)
-            elements.extend(extracted_elements)
-
-            if len(elements) >= self.file_size or len(elements) == len(example_indices):
-                self._store_elements_to_file(batch_filenames[file_count-1], elements[:self.file_size])
-                file_count += 1
-                elements = elements[self.file_size:]
+        for batch, _, batch_indices in self._load_batches_with_indices(example_indices):
+            elements.extend(batch[index] for index in batch_indices)
+            while len(elements) >= self.file_size:
+                ElementGenerator.store_elements(batch_filenames[file_count], elements[:self.file_size])
+                elements, file_count = elements[self.file_size:], file_count + 1
 
         if len(elements) > 0:
-            self._store_elements_to_file(batch_filenames[file_count - 1], elements)
+            ElementGenerator.store_elements(batch_filenames[file_count], elements)
 
         return batch_filenames
 
     def _prepare_batch_filenames(self, example_count: int, path: Path, dataset_type: str, dataset_identifier: str):
         batch_count = math.ceil(example_count / self.file_size)
         digits_count = len(str(batch_count)) + 1
-        filenames = [path / f"{dataset_identifier}_{dataset_type}_batch{''.join(['0' for i in range(digits_count-len(str(index)))])}{index}.pkl"
+        filenames = [path / f"{dataset_identifier}_{dataset_type}_batch{''.join(['0' for i in range(digits_count-len(str(index)))])}{index}"
+                            f"{ColumnStoreHelper.FILE_EXTENSION}"
                      for index in range(batch_count)]
         return filenames
-
-    def _store_elements_to_file(self, path, elements):
-        with path.open("wb") as file:
-            pickle.dump(elements, file)
-
-    def _extract_elements_from_batch(self, index, batch_size, batch, example_indices):
-        upper_limit, lower_limit = (index + 1) * batch_size, index * batch_size
-        batch_indices = [ind for ind in example_indices if lower_limit <= ind < upper_limit]
-        elements = [batch[i - lower_limit] for i in batch_indices]
-        return elements
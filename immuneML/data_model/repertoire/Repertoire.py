@@ -1,6 +1,7 @@
 # quality: gold
 import ast
 import logging
+import os
 import pickle
 import shutil
 import weakref
@@ -22,6 +23,7 @@ from immuneML.data_model.receptor.receptor_sequence.SequenceAnnotation import Se
 from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.simulation.implants.ImplantAnnotation import ImplantAnnotation
+from immuneML.util.ColumnStoreHelper import ColumnStoreHelper
 from immuneML.util.NumpyHelper import NumpyHelper
 from immuneML.util.PathBuilder import PathBuilder
 
@@ -30,21 +32,27 @@ class Repertoire(DatasetItem):
     """
     Repertoire object consisting of sequence objects, each sequence attribute is stored as a list across all sequences and can be
     loaded separately. Internally, this class relies on numpy to store/import_dataset the data.
+
+    Repertoires are stored in a columnar format (see ColumnStoreHelper): one uncompressed .npz file per repertoire with one typed array per
+    field, so that get_attribute and get_attributes only read (memory-map) the fields they need. Repertoires stored in the older format
+    (a single .npy file with a structured object array) can still be loaded and can be converted by calling `convert_to_columnar`.
     """
 
     FIELDS = tuple(
         "sequence_aas,sequences,v_genes,j_genes,v_subgroups,j_subgroups,v_alleles,j_alleles,chains,counts,region_types,frame_types,"
         "sequence_identifiers,cell_ids".split(","))
 
+    CATEGORICAL_FIELDS = ("v_genes", "j_genes", "v_subgroups", "j_subgroups", "v_alleles", "j_alleles", "chains", "region_types", "frame_types")
+    LEGACY_FILE_EXTENSION = ".npy"
+
     @staticmethod
     def process_custom_lists(custom_lists):
         if custom_lists:
             field_list = list(custom_lists.keys())
             values = [custom_lists[field] for field in custom_lists.keys()]
-            dtype = [(field, np.object) for field in custom_lists.keys()]
         else:
-            field_list, values, dtype = [], [], []
-        return field_list, values, dtype
+            field_list, values = [], []
+        return field_list, values
 
     @staticmethod
     def check_count(sequence_aas: list = None, sequences: list = None, custom_lists: dict = None) -> int:
@@ -77,50 +85,125 @@ class Repertoire(DatasetItem):
 
         filename_base = filename_base if filename_base is not None else identifier
 
-        data_filename = path / f"{filename_base}.npy"
+        data_filename = path / f"{filename_base}{ColumnStoreHelper.FILE_EXTENSION}"
 
-        field_list, values, dtype = Repertoire.process_custom_lists(custom_lists)
+        field_list, values = Repertoire.process_custom_lists(custom_lists)
 
         if signals:
             signals_filtered = {signal: signals[signal] for signal in signals if signal not in metadata["field_list"]}
-            field_list_signals, values_signals, dtype_signals = Repertoire.process_custom_lists(signals_filtered)
+            field_list_signals, values_signals = Repertoire.process_custom_lists(signals_filtered)
 
             field_list.extend(field_list_signals)
             values.extend(values_signals)
-            dtype.extend(dtype_signals)
 
         for field in Repertoire.FIELDS:
             if eval(field) is not None and not all(el is None for el in eval(field)):
                 field_list.append(field)
                 values.append(eval(field))
-                dtype.append((field, np.object))
-
-        dtype = np.dtype(dtype)
 
-        repertoire_matrix = np.array(list(map(tuple, zip(*values))), order='F', dtype=dtype)
-        np.save(str(data_filename), repertoire_matrix)
+        Repertoire._store_columns(data_filename, dict(zip(field_list, values)))
 
         metadata_filename = path / f"{filename_base}_metadata.pickle"
         metadata = {} if metadata is None else metadata
         metadata["field_list"] = field_list
-        with metadata_filename.open("wb") as file:
-            pickle.dump(metadata, file)
+        Repertoire._store_metadata(metadata_filename, metadata)
 
         repertoire = Repertoire(data_filename, metadata_filename, identifier)
         return repertoire
 
+    @classmethod
+    def build_from_chunks(cls, chunks, path: Path, metadata: dict = None, filename_base: str = None, drop_empty_fields: bool = False):
+        """
+        Creates a repertoire in the same way as `build`, but from an iterable of chunks, where each chunk is a dict mapping field names
+        (Repertoire.FIELDS or custom fields) to equally long lists of values. Each chunk is stored to a temporary column store as soon as it
+        is created, and the stores are then merged one column at a time, so the whole repertoire never has to be kept in memory.
+
+        Args:
+            chunks: iterable (e.g., a generator) of dicts with the values for consecutive sequences
+            path: where to store the repertoire
+            metadata: metadata of the repertoire
+            filename_base: base of the repertoire filenames, the identifier is used if not set
+            drop_empty_fields: whether to skip custom fields without any values in all chunks (fields from Repertoire.FIELDS without
+                values are always skipped)
+
+        Returns:
+            the new repertoire object
+        """
+        identifier = uuid4().hex
+        filename_base = filename_base if filename_base is not None else identifier
+        data_filename = path / f"{filename_base}{ColumnStoreHelper.FILE_EXTENSION}"
+        parts_path = PathBuilder.build(path / f"{filename_base}_parts")
+
+        part_filenames, fields = [], []
+        for index, chunk in enumerate(chunks):
+            part_filename = parts_path / f"{index}{ColumnStoreHelper.FILE_EXTENSION}"
+            Repertoire._store_columns(part_filename, dict(chunk))
+            part_filenames.append(part_filename)
+            fields.extend(field for field in chunk.keys() if field not in fields)
+
+        row_counts = [ColumnStoreHelper.get_row_count(part_filename) for part_filename in part_filenames]
+        sequence_count = sum(row_counts)
+
+        # as in build(), fields without any values are not stored and missing sequence identifiers are replaced by sequence indices
+        field_list = [field for field in fields if field not in Repertoire.FIELDS
+                      and not (drop_empty_fields and Repertoire._is_empty_column(part_filenames, field))]
+        field_list.extend(field for field in Repertoire.FIELDS
+                          if field == "sequence_identifiers" or (field in fields and not Repertoire._is_empty_column(part_filenames, field)))
+
+        def make_columns():
+            for field in field_list:
+                if field == "sequence_identifiers" and Repertoire._has_missing_values(part_filenames, field):
+                    yield field, np.arange(sequence_count)
+                else:
+                    yield field, Repertoire._concatenate_column(part_filenames, row_counts, field)
+
+        ColumnStoreHelper.write_incrementally(data_filename, make_columns(), Repertoire.CATEGORICAL_FIELDS)
+        shutil.rmtree(parts_path)
+
+        metadata_filename = path / f"{filename_base}_metadata.pickle"
+        metadata = {} if metadata is None else metadata
+        metadata["field_list"] = field_list
+        Repertoire._store_metadata(metadata_filename, metadata)
+
+        return Repertoire(data_filename, metadata_filename, identifier)
+
+    @staticmethod
+    def _concatenate_column(part_filenames: list, row_counts: list, field: str) -> np.ndarray:
+        values = []
+        for part_filename, row_count in zip(part_filenames, row_counts):
+            if row_count == 0:
+                continue  # parts where all sequences were filtered out would change the dtype of the concatenated column
+            part_values = ColumnStoreHelper.read_column(part_filename, field)
+            values.append(np.array(part_values) if part_values is not None else np.full(row_count, None, dtype=object))
+        return np.concatenate(values) if len(values) > 0 else np.array([], dtype=object)
+
+    @staticmethod
+    def _is_empty_column(part_filenames: list, field: str) -> bool:
+        for part_filename in part_filenames:
+            values = ColumnStoreHelper.read_column(part_filename, field)
+            if values is not None and not all(value is None for value in values):
+                return False
+        return True
+
+    @staticmethod
+    def _has_missing_values(part_filenames: list, field: str) -> bool:
+        for part_filename in part_filenames:
+            values = ColumnStoreHelper.read_column(part_filename, field)
+            if values is None or (values.dtype.hasobject and any(value is None for value in values)):
+                return True
+        return False
+
     @classmethod
     def build_like(cls, repertoire, indices_to_keep: list, result_path: Path, filename_base: str = None):
         if indices_to_keep is not None and len(indices_to_keep) > 0:
             PathBuilder.build(result_path)
 
-            data = repertoire.load_data()
-            data = data[indices_to_keep]
+            columns = repertoire.get_attributes(repertoire.get_field_names())
             identifier = uuid4().hex
             filename_base = filename_base if filename_base is not None else identifier
 
-            data_filename = result_path / f"{filename_base}.npy"
-            np.save(str(data_filename), data)
+            data_filename = result_path / f"{filename_base}{ColumnStoreHelper.FILE_EXTENSION}"
+            Repertoire._store_columns(data_filename, {field: values[indices_to_keep] for field, values in columns.items()})
 
             metadata_filename = result_path / f"{filename_base}_metadata.pickle"
             shutil.copyfile(repertoire.metadata_filename, metadata_filename)
@@ -130,6 +213,104 @@ class Repertoire(DatasetItem):
         else:
             return None
 
+    @classmethod
+    def build_from_columns(cls, columns: dict, path: Path, metadata: dict = None, filename_base: str = None):
+        """
+        Creates a repertoire from columns, e.g., as returned by get_attributes() and modified, without creating sequence objects
+
+        Args:
+            columns: a dict mapping field names (Repertoire.FIELDS or custom fields) to equally long arrays of values
+            path: where to store the repertoire
+            metadata: metadata of the repertoire
+            filename_base: base of the repertoire filenames, the identifier is used if not set
+            drop_empty_fields: whether to skip custom fields without any values in all chunks (fields from Repertoire.FIELDS without
+                values are always skipped)
+
+        Returns:
+            the new repertoire object
+        """
+        identifier = uuid4().hex
+        filename_base = filename_base if filename_base is not None else identifier
+
+        data_filename = path / f"{filename_base}{ColumnStoreHelper.FILE_EXTENSION}"
+        Repertoire._store_columns(data_filename, columns)
+
+        metadata_filename = path / f"{filename_base}_metadata.pickle"
+        metadata = {} if metadata is None else metadata
+        metadata["field_list"] = list(columns.keys())
+        Repertoire._store_metadata(metadata_filename, metadata)
+
+        return Repertoire(data_filename, metadata_filename, identifier)
+
+    @classmethod
+    def build_with_metadata(cls, repertoire, path: Path, metadata: dict, filename_base: str = None):
+        """
+        Creates a repertoire with the same data as the given repertoire, but with new metadata. The data file is hard-linked to the new location
+        instead of copied (it is only copied if linking is not possible), so the new repertoire takes neither the disk space nor the time to
+        rewrite the data. The data file is never modified in place, so the two repertoires cannot affect each other.
+
+        Args:
+            repertoire: the repertoire whose data to use
+            path: where to store the new repertoire
+            metadata: metadata of the new repertoire; the field list is taken from the given repertoire
+            filename_base: base of the repertoire filenames, the identifier is used if not set
+            drop_empty_fields: whether to skip custom fields without any values in all chunks (fields from Repertoire.FIELDS without
+                values are always skipped)
+
+        Returns:
+            the new repertoire object
+        """
+        identifier = uuid4().hex
+        filename_base = filename_base if filename_base is not None else identifier
+
+        data_filename = PathBuilder.link_or_copy(repertoire.data_filename, path / f"{filename_base}{repertoire.data_filename.suffix}")
+
+        metadata_filename = path / f"{filename_base}_metadata.pickle"
+        metadata = {**metadata, "field_list": repertoire.get_field_names()}
+        Repertoire._store_metadata(metadata_filename, metadata)
+
+        return Repertoire(data_filename, metadata_filename, identifier)
+
+    @classmethod
+    def convert_to_columnar(cls, repertoire, result_path: Path):
+        """
+        Stores the repertoire in the columnar format under result_path, keeping the filename base, identifier and metadata. Repertoires that
+        are already in the columnar format are returned as they are.
+
+        Args:
+            repertoire: repertoire stored in either the legacy (.npy) or the columnar format
+            result_path: where to store the converted repertoire file and its metadata file
+
+        Returns:
+            a repertoire object pointing to the columnar file
+        """
+        if repertoire.is_columnar():
+            return repertoire
+
+        PathBuilder.build(result_path)
+        data_filename = result_path / f"{repertoire.data_filename.stem}{ColumnStoreHelper.FILE_EXTENSION}"
+        Repertoire._store_columns(data_filename, repertoire.get_attributes(repertoire.get_field_names()))
+
+        metadata_filename = result_path / repertoire.metadata_filename.name
+        if not metadata_filename.is_file():
+            shutil.copyfile(repertoire.metadata_filename, metadata_filename)
+
+        return Repertoire(data_filename, metadata_filename, repertoire.identifier)
+
+    @staticmethod
+    def _store_metadata(metadata_filename: Path, metadata: dict):
+        # as the column store, the metadata file is replaced instead of overwritten in place to keep the content of hard links to it
+        tmp_filename = metadata_filename.with_name(f".{metadata_filename.name}.tmp")
+        with tmp_filename.open("wb") as file:
+            pickle.dump(metadata, file)
+        os.replace(tmp_filename, metadata_filename)
+
+    @staticmethod
+    def _store_columns(data_filename: Path, columns: dict):
+        if "counts" in columns:
+            columns["counts"] = [int(float(count)) if isinstance(count, str) else count for count in columns["counts"]]
+        ColumnStoreHelper.write(data_filename, columns, Repertoire.CATEGORICAL_FIELDS)
+
     @classmethod
     def build_from_sequence_objects(cls, sequence_objects: list, path: Path, metadata: dict, filename_base: str = None):
 
@@ -174,21 +355,33 @@ class Repertoire(DatasetItem):
         data_filename = Path(data_filename)
         metadata_filename = Path(metadata_filename) if metadata_filename is not None else None
 
-        assert data_filename.suffix == ".npy", \
-            f"Repertoire: the file representing the repertoire has to be in numpy binary format. Got {data_filename.suffix} instead."
+        assert data_filename.suffix in [ColumnStoreHelper.FILE_EXTENSION, Repertoire.LEGACY_FILE_EXTENSION], \
+            f"Repertoire: the file representing the repertoire has to be in numpy binary format ({ColumnStoreHelper.FILE_EXTENSION} or " \
+            f"{Repertoire.LEGACY_FILE_EXTENSION}). Got {data_filename.suffix} instead."
 
         self.data_filename = data_filename
-
-        if metadata_filename:
-            with metadata_filename.open("rb") as file:
-                self.metadata = pickle.load(file)
-            self.fields = self.metadata["field_list"]
-
         self.metadata_filename = metadata_filename
+        self._metadata = None
         self.identifier = identifier
         self.data = None
         self.element_count = None
 
+    @property
+    def metadata(self) -> dict:
+        # the metadata file is only read on first access, so that building or importing large datasets does not read all metadata files
+        if self._metadata is None and self.metadata_filename is not None:
+            with self.metadata_filename.open("rb") as file:
+                self._metadata = pickle.load(file)
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: dict):
+        self._metadata = metadata
+
+    @property
+    def fields(self) -> list:
+        return self.metadata["field_list"]
+
     def get_sequence_aas(self):
         return self.get_attribute("sequence_aas")
 
@@ -203,7 +396,7 @@ class Repertoire(DatasetItem):
 
     def get_counts(self):
         counts = self.get_attribute("counts")
-        if counts is not None:
+        if counts is not None and counts.dtype.kind not in "iu":
             counts = np.array([int(count) if count is not None else None for count in counts])
         return counts
 
@@ -213,29 +406,55 @@ class Repertoire(DatasetItem):
             chains = np.array([Chain.get_chain(chain_str) if chain_str is not None else None for chain_str in chains])
         return chains
 
+    def is_columnar(self) -> bool:
+        return self.data_filename.suffix == ColumnStoreHelper.FILE_EXTENSION
+
+    def get_field_names(self) -> list:
+        if self.is_columnar():
+            return ColumnStoreHelper.get_column_names(self.data_filename)
+        else:
+            return list(self.load_data().dtype.names)
+
     def load_data(self):
         if self.data is None or (isinstance(self.data, weakref.ref) and self.data() is None):
-            data = np.load(self.data_filename, allow_pickle=True)
+            data = self._load_columnar_data() if self.is_columnar() else np.load(self.data_filename, allow_pickle=True)
             self.data = weakref.ref(data) if EnvironmentSettings.low_memory else data
         data = self.data() if EnvironmentSettings.low_memory else self.data
         self.element_count = data.shape[0]
         return data
 
+    def _load_columnar_data(self):
+        columns = self._read_columns(self.get_field_names())
+        data = np.empty(self.get_element_count(), dtype=[(field, values.dtype) for field, values in columns.items()])
+        for field, values in columns.items():
+            data[field] = values
+        return data
+
+    def _get_loaded_data(self):
+        if self.data is None:
+            return None
+        return self.data() if isinstance(self.data, weakref.ref) else self.data
+
+    def _read_columns(self, attributes: list) -> dict:
+        return {attribute: values for attribute, values in ColumnStoreHelper.read_columns(self.data_filename, attributes).items()
+                if values is not None}
+
     def get_attribute(self, attribute):
-        data = self.load_data()
-        if attribute in data.dtype.names:
+        data = self._get_loaded_data() if self.is_columnar() else self.load_data()
+        if data is None:
+            return self._read_columns([attribute]).get(attribute, None)
+        elif attribute in data.dtype.names:
             tmp = data[attribute]
             return tmp
         else:
             return None
 
     def get_attributes(self, attributes: list):
-        data = self.load_data()
-        result = {}
+        data = self._get_loaded_data() if self.is_columnar() else self.load_data()
+        result = self._read_columns(attributes) if data is None else {attribute: data[attribute] for attribute in attributes
+                                                                      if attribute in data.dtype.names}
         for attribute in attributes:
-            if attribute in data.dtype.names:
-                result[attribute] = data[attribute]
-            else:
+            if attribute not in result:
                 logging.warning(f"{Repertoire.__name__}: attribute {attribute} is not present in the repertoire {self.identifier}, skipping...")
         return result
 
@@ -243,17 +462,28 @@ class Repertoire(DatasetItem):
         self.data = None
 
     def __getstate__(self):
+        # the metadata is stored with the repertoire, so that the pickled dataset is a consolidated index of the repertoire metadata and
+        # importing it does not read any metadata files
         state = self.__dict__.copy()
+        state['_metadata'] = self.metadata
         del state['data']
         return state
 
     def __setstate__(self, state):
+        # repertoires pickled before metadata was loaded lazily store it under "metadata" together with the list of fields
+        if "metadata" in state:
+            state["_metadata"] = state.pop("metadata")
+        state.pop("fields", None)
         self.__dict__.update(state)
+        self.__dict__.setdefault("_metadata", None)
         self.data = None
 
     def get_element_count(self):
         if self.element_count is None:
-            self.load_data()
+            if self.is_columnar():
+                self.element_count = ColumnStoreHelper.get_row_count(self.data_filename)
+            else:
+                self.load_data()
         return self.element_count
 
     def _make_sequence_object(self, row, load_implants: bool = False):
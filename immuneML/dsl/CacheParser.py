@@ -0,0 +1,29 @@
+from immuneML.caching.CacheHandler import CacheHandler
+from immuneML.util.ParameterValidator import ParameterValidator
+
+
+class CacheParser:
+    """
+    Parses the optional `cache` section of the specification which configures the in-memory tier of the cache used during the run.
+
+    Specification example:
+
+    .. indent with spaces
+    .. code-block:: yaml
+
+        cache:
+            memory_limit: 4000000000 # keep up to 4GB of deserialized cached objects (e.g. encoded datasets) in memory
+
+    If the section is not present, the memory limit is taken from the environment variable `cache_memory_limit` (0 by default, meaning
+    that the cached objects are always loaded from disk).
+    """
+
+    @staticmethod
+    def parse(specs: dict) -> dict:
+        if "cache" in specs:
+            ParameterValidator.assert_keys(specs["cache"].keys(), ["memory_limit"], "CacheParser", "cache")
+            ParameterValidator.assert_type_and_value(specs["cache"]["memory_limit"], int, "CacheParser", "memory_limit", min_inclusive=0)
+            CacheHandler.set_memory_limit(specs["cache"]["memory_limit"])
+            return specs["cache"]
+        else:
+            return None
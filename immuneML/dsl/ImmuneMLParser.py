@@ -6,6 +6,7 @@ from pathlib import Path
 import yaml
 from yaml import MarkedYAMLError
 
+from immuneML.dsl.CacheParser import CacheParser
 from immuneML.dsl.InstructionParser import InstructionParser
 from immuneML.dsl.OutputParser import OutputParser
 from immuneML.dsl.definition_parsers.DefinitionParser import DefinitionParser
@@ -98,6 +99,8 @@ class ImmuneMLParser:
                 reports: []
         output: # this section can also be omitted, in that case output will be automatically HTML
             format: HTML # or None
+        cache: # optional, keeps up to memory_limit bytes of cached objects in memory in addition to the cache on disk
+            memory_limit: 4000000000
 
     """
 
@@ -137,12 +140,13 @@ class ImmuneMLParser:
 
         symbol_table = SymbolTable()
 
+        cache = CacheParser.parse(workflow_specification)
         def_parser_output, specs_defs = DefinitionParser.parse(workflow_specification, symbol_table, result_path)
         symbol_table, specs_instructions = InstructionParser.parse(def_parser_output, result_path)
         app_output = OutputParser.parse(workflow_specification, symbol_table)
 
         path = ImmuneMLParser._output_specs(file_path=file_path, result_path=result_path, definitions=specs_defs,
-                                            instructions=specs_instructions, output=app_output)
+                                            instructions=specs_instructions, output=app_output, cache=cache)
 
         return symbol_table, path
 
@@ -156,10 +160,13 @@ class ImmuneMLParser:
             return result_path / file_name
 
     @staticmethod
-    def _output_specs(file_path=None, result_path=None, definitions: dict = None, instructions: dict = None, output: dict = None) -> Path:
+    def _output_specs(file_path=None, result_path=None, definitions: dict = None, instructions: dict = None, output: dict = None,
+                      cache: dict = None) -> Path:
         filepath = ImmuneMLParser._get_full_specs_filepath(file_path, result_path)
 
         result = {"definitions": definitions, "instructions": instructions, "output": output}
+        if cache is not None:
+            result["cache"] = cache
         result = ImmuneMLParser._paths_to_strings_recursive(result)
 
         PathBuilder.build(filepath.parent)
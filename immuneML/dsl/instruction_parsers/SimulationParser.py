@@ -65,11 +65,19 @@ class SimulationParser:
                 dataset: my_dataset
                 simulation: sim1
                 export_formats: [AIRR, Pickle]
+                number_of_processes: 4 # number of repertoires or receptors to implant the signals in in parallel
+                seed: 1 # the seed for the random number generators to make the simulation reproducible
 
     """
 
     def parse(self, key: str, instruction: dict, symbol_table: SymbolTable, path: Path = None) -> SimulationInstruction:
-        ParameterValidator.assert_keys(instruction.keys(), ["dataset", "simulation", "type", "export_formats"], "SimulationParser", key)
+        ParameterValidator.assert_keys(instruction.keys(), ["dataset", "simulation", "type", "export_formats", "number_of_processes",
+                                                            "seed"],
+                                       "SimulationParser", key)
+        ParameterValidator.assert_type_and_value(instruction["number_of_processes"], int, "SimulationParser", f"{key}: number_of_processes",
+                                                 min_inclusive=1)
+        if instruction["seed"] is not None:
+            ParameterValidator.assert_type_and_value(instruction["seed"], int, "SimulationParser", f"{key}: seed", min_inclusive=0)
 
         signals = [signal.item for signal in symbol_table.get_by_type(SymbolType.SIGNAL)]
         simulation = symbol_table.get(instruction["simulation"])
@@ -77,7 +85,8 @@ class SimulationParser:
 
         exporters = self.parse_exporters(instruction)
 
-        process = SimulationInstruction(signals=signals, simulation=simulation, dataset=dataset, name=key, exporters=exporters)
+        process = SimulationInstruction(signals=signals, simulation=simulation, dataset=dataset, name=key, exporters=exporters,
+                                        number_of_processes=instruction["number_of_processes"], seed=instruction["seed"])
         return process
 
     def parse_exporters(self, instruction):
@@ -88,11 +88,12 @@ class DistanceEncoder(DatasetEncoder):
 
     def build_distance_matrix(self, dataset: RepertoireDataset, params: EncoderParams, train_repertoire_ids: list):
         self.comparison = PairwiseRepertoireComparison(self.attributes_to_match, self.attributes_to_match, params.result_path,
-                                                  sequence_batch_size=self.sequence_batch_size)
+                                                  sequence_batch_size=self.sequence_batch_size, number_of_processes=params.pool_size)
 
         current_dataset = dataset if self.context is None or "dataset" not in self.context else self.context["dataset"]
 
-        distance_matrix = self.comparison.compare(current_dataset, self.distance_fn, self.distance_metric.value)
+        distance_matrix_fn = ReflectionHandler.import_function(f"{self.distance_metric.value}_matrix", DistanceMetrics)
+        distance_matrix = self.comparison.compare(current_dataset, self.distance_fn, self.distance_metric.value, distance_matrix_fn)
 
         repertoire_ids = dataset.get_repertoire_ids()
 
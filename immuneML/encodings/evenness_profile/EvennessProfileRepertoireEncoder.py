@@ -1,4 +1,3 @@
-import hashlib
 import math
 from multiprocessing.pool import Pool
 
@@ -7,6 +6,7 @@ import numpy as np
 from immuneML.analysis.entropy_calculations.EntropyCalculator import EntropyCalculator
 from immuneML.caching.CacheHandler import CacheHandler
 from immuneML.caching.CacheObjectType import CacheObjectType
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.receptor.receptor_sequence.SequenceFrameType import SequenceFrameType
 from immuneML.encodings.EncoderParams import EncoderParams
@@ -50,7 +50,7 @@ class EvennessProfileRepertoireEncoder(EvennessProfileEncoder):
         return CacheHandler.memo_by_params((("encoding_model", params.model),
                                             ("labels", params.label_config.get_labels_by_name()),
                                             ("repertoire_id", repertoire.identifier),
-                                            ("repertoire_data",  hashlib.sha256(np.ascontiguousarray(repertoire.get_sequence_aas())).hexdigest())),
+                                            ("repertoire_data",  Fingerprinter.fingerprint(repertoire.get_sequence_aas()))),
                                            lambda: self.encode_repertoire(repertoire, params), CacheObjectType.ENCODING_STEP)
 
     def encode_repertoire(self, repertoire, params: EncoderParams):
@@ -1,4 +1,5 @@
 import pickle
+from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import List
 
@@ -31,32 +32,54 @@ class SequenceFilterHelper:
         return comparison_data
 
     @staticmethod
-    def filter_sequences(dataset: RepertoireDataset, comparison_data: ComparisonData, label: Label, p_value_threshold: float):
+    def filter_sequences(dataset: RepertoireDataset, comparison_data: ComparisonData, label: Label, p_value_threshold: float,
+                         number_of_processes: int = 1):
 
-        sequence_p_values = SequenceFilterHelper.find_label_associated_sequence_p_values(comparison_data, dataset.repertoires, label)
+        sequence_p_values = SequenceFilterHelper.find_label_associated_sequence_p_values(comparison_data, dataset.repertoires, label,
+                                                                                         number_of_processes)
 
         return np.array(sequence_p_values) < p_value_threshold
 
     @staticmethod
-    def find_label_associated_sequence_p_values(comparison_data: ComparisonData, repertoires: List[Repertoire], label: Label):
-
-        sequence_p_values = []
+    def find_label_associated_sequence_p_values(comparison_data: ComparisonData, repertoires: List[Repertoire], label: Label,
+                                                number_of_processes: int = 1):
+        """
+        Computes the p-values of the right-tailed Fisher's exact test for the association of each item (sequence) in the comparison data
+        with the positive class of the label; the batches of the comparison data are processed independently, optionally in parallel.
+        """
         is_first_class = np.array([repertoire.metadata[label.name] for repertoire in repertoires]) == label.positive_class
+        repertoire_ids = [repertoire.identifier for repertoire in repertoires]
+        arguments = [(comparison_data, index, repertoire_ids, is_first_class) for index in range(len(comparison_data.batches))]
+
+        if number_of_processes > 1 and len(arguments) > 1:
+            with Pool(min(number_of_processes, len(arguments))) as pool:
+                sequence_p_values = pool.starmap(SequenceFilterHelper._find_batch_p_values, arguments)
+        else:
+            sequence_p_values = [SequenceFilterHelper._find_batch_p_values(*argument) for argument in arguments]
 
-        for sequence_vector in comparison_data.get_item_vectors([repertoire.identifier for repertoire in repertoires]):
+        return np.concatenate(sequence_p_values) if len(sequence_p_values) > 0 else np.array([])
+
+    @staticmethod
+    def _find_batch_p_values(comparison_data: ComparisonData, batch_index: int, repertoire_ids: list, is_first_class: np.ndarray) -> np.ndarray:
+        # contingency tables of all items in the batch are computed at once and the test is run once per unique table
+        matrix = comparison_data.get_batch_matrix(batch_index, repertoire_ids).tocsr()
+        presence = (matrix != 0).astype(np.int64)
 
-            if sequence_vector.sum() > 1:
+        first_class_present = matrix @ is_first_class.astype(np.float64)
+        second_class_present = matrix @ np.logical_not(is_first_class).astype(np.float64)
+        first_class_absent = np.sum(is_first_class) - presence @ is_first_class.astype(np.int64)
+        second_class_absent = np.sum(np.logical_not(is_first_class)) - presence @ np.logical_not(is_first_class).astype(np.int64)
 
-                first_class_present = np.sum(sequence_vector[np.logical_and(sequence_vector, is_first_class)])
-                second_class_present = np.sum(sequence_vector[np.logical_and(sequence_vector, np.logical_not(is_first_class))])
-                first_class_absent = np.sum(np.logical_and(is_first_class, sequence_vector == 0))
-                second_class_absent = np.sum(np.logical_and(np.logical_not(is_first_class), sequence_vector == 0))
+        p_values = np.full(matrix.shape[0], SequenceFilterHelper.INVALID_P_VALUE, dtype=np.float64)
+        is_valid = np.asarray(matrix.sum(axis=1)).ravel() > 1
 
-                sequence_p_values.append(fisher.pvalue(first_class_present, second_class_present, first_class_absent, second_class_absent).right_tail)
-            else:
-                sequence_p_values.append(SequenceFilterHelper.INVALID_P_VALUE)
+        if np.any(is_valid):
+            tables = np.column_stack([first_class_present, second_class_present, first_class_absent, second_class_absent])[is_valid]
+            unique_tables, table_indices = np.unique(np.rint(tables).astype(np.uint32), axis=0, return_inverse=True)
+            _, right_tail, _ = fisher.pvalue_npy(*[np.ascontiguousarray(unique_tables[:, column]) for column in range(4)])
+            p_values[is_valid] = right_tail[table_indices.ravel()]
 
-        return sequence_p_values
+        return p_values
 
     @staticmethod
     def _check_label_object(params: EncoderParams, label: str):
@@ -77,7 +100,7 @@ class SequenceFilterHelper:
         if params.learn_model:
             SequenceFilterHelper._check_label_object(params, label)
             relevant_sequence_indices = SequenceFilterHelper.filter_sequences(dataset, comparison_data, params.label_config.get_label_object(label),
-                                                                              p_value_threshold)
+                                                                              p_value_threshold, params.pool_size)
             with sequence_path.open("wb") as file:
                 pickle.dump(relevant_sequence_indices, file)
 
@@ -11,7 +11,8 @@ class KmerFreqReceptorEncoder(KmerFrequencyEncoder):
 
         encoded_dataset = ReceptorDataset(filenames=dataset.get_filenames(),
                                           encoded_data=encoded_data,
-                                          labels=dataset.labels)
+                                          labels=dataset.labels,
+                                          element_indices=dataset.element_indices)
 
         return encoded_dataset
 
@@ -6,6 +6,8 @@ from immuneML.caching.CacheObjectType import CacheObjectType
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.encodings.EncoderParams import EncoderParams
 from immuneML.encodings.kmer_frequency.KmerFrequencyEncoder import KmerFrequencyEncoder
+from immuneML.encodings.kmer_frequency.ReadsType import ReadsType
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.util.Logger import log
 
 
@@ -48,11 +50,14 @@ class KmerFreqRepertoireEncoder(KmerFrequencyEncoder):
                                            lambda: self.encode_repertoire(repertoire, params), CacheObjectType.ENCODING_STEP)
 
     def encode_repertoire(self, repertoire, params: EncoderParams):
-        counts = Counter()
         sequence_encoder = self._prepare_sequence_encoder()
         feature_names = sequence_encoder.get_feature_names(params)
-        for sequence in repertoire.sequences:
-            counts = self._encode_sequence(sequence, params, sequence_encoder, counts)
+        counts = self._encode_repertoire_in_batch(repertoire, params, sequence_encoder)
+
+        if counts is None:
+            counts = Counter()
+            for sequence in repertoire.sequences:
+                counts = self._encode_sequence(sequence, params, sequence_encoder, counts)
 
         label_config = params.label_config
         labels = dict() if params.encode_labels else None
@@ -64,3 +69,24 @@ class KmerFreqRepertoireEncoder(KmerFrequencyEncoder):
 
         # TODO: refactor this not to return 4 values but e.g. a dict or split into different functions?
         return counts, repertoire.identifier, labels, feature_names
+
+    def _encode_repertoire_in_batch(self, repertoire, params: EncoderParams, sequence_encoder):
+        """
+        Encodes the repertoire directly from its sequence columns if the sequence encoding supports it; returns a tuple of features and their
+        counts or None, in which case the repertoire has to be encoded sequence by sequence
+        """
+        params.model = vars(self)
+        sequence_type = self.sequence_type if self.sequence_type is not None else EnvironmentSettings.get_sequence_type()
+        attributes = repertoire.get_attributes([sequence_type.value] + [f"{field}s" for field in self.metadata_fields_to_include])
+
+        if sequence_type.value not in attributes:
+            return None
+
+        if self.reads == ReadsType.ALL:
+            weights = repertoire.get_counts()
+            if weights is None or weights.dtype.hasobject:
+                return None
+        else:
+            weights = None
+
+        return sequence_encoder.encode_sequences(attributes, weights, params)
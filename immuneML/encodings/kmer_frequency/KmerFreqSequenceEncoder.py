@@ -13,7 +13,8 @@ class KmerFreqSequenceEncoder(KmerFrequencyEncoder):
 
         encoded_dataset = SequenceDataset(filenames=dataset.get_filenames(),
                                           encoded_data=encoded_data,
-                                          labels=dataset.labels)
+                                          labels=dataset.labels,
+                                          element_indices=dataset.element_indices)
 
         return encoded_dataset
 
@@ -3,7 +3,9 @@ import pickle
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pandas as pd
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction import DictVectorizer
 
 from immuneML.analysis.data_manipulation.NormalizationType import NormalizationType
@@ -223,22 +225,50 @@ class KmerFrequencyEncoder(DatasetEncoder):
         pass
 
     def _vectorize_encoded(self, examples: list, params: EncoderParams):
+        """
+        Builds a sparse matrix from the encoded examples: each example is either a tuple of numpy arrays (features, counts) as produced by
+        the batch sequence encoding or a dictionary of feature counts. Feature names are stored sorted (as in sklearn's DictVectorizer, which
+        is also what is stored at vectorizer_path so that the encoder can be applied to new data later).
+        """
 
         if self.vectorizer_path is None:
             self.vectorizer_path = params.result_path / FilenameHandler.get_filename(DictVectorizer.__name__, "pickle")
 
+        features, counts = zip(*[self._get_feature_arrays(example) for example in examples])
+
         if params.learn_model:
+            feature_names = np.unique(np.concatenate(features).astype(str))
             vectorizer = DictVectorizer(sparse=True, dtype=float)
-            vectorized_examples = vectorizer.fit_transform(examples)
+            vectorizer.feature_names_ = feature_names.tolist()
+            vectorizer.vocabulary_ = {feature: index for index, feature in enumerate(vectorizer.feature_names_)}
             PathBuilder.build(params.result_path)
             with self.vectorizer_path.open('wb') as file:
                 pickle.dump(vectorizer, file)
         else:
             with self.vectorizer_path.open('rb') as file:
                 vectorizer = pickle.load(file)
-            vectorized_examples = vectorizer.transform(examples)
+            feature_names = np.array(vectorizer.feature_names_, dtype=str)
+
+        vectorized_examples = self._make_sparse_matrix(features, counts, feature_names)
+
+        return vectorized_examples, feature_names.tolist()
+
+    def _get_feature_arrays(self, example):
+        if isinstance(example, tuple):
+            return example
+        else:
+            return np.array(list(example.keys()), dtype=str), np.array(list(example.values()), dtype=float)
+
+    def _make_sparse_matrix(self, features: tuple, counts: tuple, feature_names: np.ndarray):
+        row_indices = np.repeat(np.arange(len(features)), [example_features.shape[0] for example_features in features])
+        all_features, all_counts = np.concatenate(features).astype(str), np.concatenate(counts).astype(float)
+
+        column_indices = np.searchsorted(feature_names, all_features) if feature_names.shape[0] > 0 else np.zeros_like(row_indices)
+        is_known = column_indices < feature_names.shape[0]
+        is_known[is_known] = feature_names[column_indices[is_known]] == all_features[is_known]
 
-        return vectorized_examples, vectorizer.get_feature_names()
+        return csr_matrix((all_counts[is_known], (row_indices[is_known], column_indices[is_known])),
+                          shape=(len(features), feature_names.shape[0]), dtype=float)
 
     def _get_feature_annotations(self, feature_names, feature_annotation_names):
         feature_annotations = pd.DataFrame({"feature": feature_names})
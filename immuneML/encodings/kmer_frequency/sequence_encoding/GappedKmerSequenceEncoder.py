@@ -1,8 +1,11 @@
 import warnings
 
+import numpy as np
+
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.encodings.EncoderParams import EncoderParams
 from immuneML.encodings.kmer_frequency.sequence_encoding.SequenceEncodingStrategy import SequenceEncodingStrategy
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.util.KmerHelper import KmerHelper
 
 
@@ -34,6 +37,23 @@ class GappedKmerSequenceEncoder(SequenceEncodingStrategy):
 
         return gapped_kmers
 
+    @staticmethod
+    def encode_sequences(sequences: dict, weights: np.ndarray, params: EncoderParams):
+        k_left = params.model.get('k_left')
+        k_right = params.model.get('k_right', k_left)
+        max_gap = params.model.get('max_gap')
+        min_gap = params.model.get('min_gap', 0)
+        sequence_type = params.model.get('sequence_type', None)
+        sequence_type = EnvironmentSettings.get_sequence_type() if sequence_type is None else sequence_type
+        sequence_array = sequences[sequence_type.value]
+
+        short_sequence_count = np.sum(np.char.str_len(sequence_array.astype(str)) < k_left + k_right + max_gap)
+        if short_sequence_count > 0:
+            warnings.warn(f'{short_sequence_count} sequences have length less than k_left + k_right + max_gap. Ignoring these sequences')
+
+        return KmerHelper.count_gapped_kmers_in_sequences(sequence_array, k_left=k_left, max_gap=max_gap, k_right=k_right, min_gap=min_gap,
+                                                          weights=weights)
+
     @staticmethod
     def get_feature_names(params: EncoderParams):
         return ["sequence"]
@@ -1,7 +1,10 @@
+import numpy as np
+
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.encodings.EncoderParams import EncoderParams
 from immuneML.encodings.kmer_frequency.sequence_encoding.SequenceEncodingStrategy import SequenceEncodingStrategy
 from immuneML.environment.Constants import Constants
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 
 
 class IdentitySequenceEncoder(SequenceEncodingStrategy):
@@ -30,6 +33,31 @@ class IdentitySequenceEncoder(SequenceEncodingStrategy):
 
         return [Constants.FEATURE_DELIMITER.join(res)]
 
+    @staticmethod
+    def encode_sequences(sequences: dict, weights: np.ndarray, params: EncoderParams):
+        columns = []
+        if params.model.get("sequence", True):
+            sequence_type = params.model.get('sequence_type', None)
+            sequence_type = EnvironmentSettings.get_sequence_type() if sequence_type is None else sequence_type
+            columns.append(sequences.get(sequence_type.value, None))
+
+        columns.extend(sequences.get(f"{field}s", None) for field in params.model.get("metadata_fields_to_include", []))
+
+        if len(columns) == 0 or any(column is None or column.dtype.kind != "U" for column in columns):
+            return None
+
+        features = columns[0]
+        for column in columns[1:]:
+            features = np.char.add(np.char.add(features, Constants.FEATURE_DELIMITER), column)
+
+        unique_features, inverse = np.unique(features, return_inverse=True)
+        if weights is None:
+            counts = np.bincount(inverse, minlength=unique_features.shape[0])
+        else:
+            counts = np.rint(np.bincount(inverse, weights=weights, minlength=unique_features.shape[0])).astype(np.int64)
+
+        return unique_features, counts
+
     @staticmethod
     def get_feature_names(params: EncoderParams):
         res = []
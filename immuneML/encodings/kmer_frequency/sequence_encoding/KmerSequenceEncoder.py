@@ -1,8 +1,11 @@
 import logging
 
+import numpy as np
+
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.encodings.EncoderParams import EncoderParams
 from immuneML.encodings.kmer_frequency.sequence_encoding.SequenceEncodingStrategy import SequenceEncodingStrategy
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.util.KmerHelper import KmerHelper
 
 
@@ -31,6 +34,19 @@ class KmerSequenceEncoder(SequenceEncodingStrategy):
 
         return kmers
 
+    @staticmethod
+    def encode_sequences(sequences: dict, weights: np.ndarray, params: EncoderParams):
+        k = params.model["k"]
+        sequence_type = params.model.get('sequence_type', None)
+        sequence_type = EnvironmentSettings.get_sequence_type() if sequence_type is None else sequence_type
+        sequence_array = sequences[sequence_type.value]
+
+        short_sequence_count = np.sum(np.char.str_len(sequence_array.astype(str)) < k)
+        if short_sequence_count > 0:
+            logging.warning(f'KmerSequenceEncoder: {short_sequence_count} sequences have length less than {k}. Ignoring these sequences...')
+
+        return KmerHelper.count_kmers_in_sequences(sequence_array, k, weights)
+
     @staticmethod
     def get_feature_names(params: EncoderParams):
         return ["sequence"]
@@ -1,5 +1,7 @@
 import abc
 
+import numpy as np
+
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.encodings.EncoderParams import EncoderParams
 
@@ -15,3 +17,19 @@ class SequenceEncodingStrategy(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def get_feature_names(params: EncoderParams):
         pass
+
+    @staticmethod
+    def encode_sequences(sequences: dict, weights: np.ndarray, params: EncoderParams):
+        """
+        Encodes a batch of sequences given as columns (e.g. 'sequence_aas', 'v_genes', as stored in a repertoire) without creating sequence
+        objects. Strategies which cannot encode sequences in batch return None, and the sequences are then encoded one by one.
+
+        Args:
+            sequences: dictionary of column name -> numpy array with one value per sequence
+            weights: how much each sequence contributes to the feature counts or None if each sequence counts once
+            params: EncoderParams object
+
+        Returns:
+            a tuple of numpy arrays with unique features and their counts, or None
+        """
+        return None
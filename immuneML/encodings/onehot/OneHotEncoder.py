@@ -2,7 +2,7 @@ import abc
 import math
 
 import numpy as np
-from sklearn.preprocessing import OneHotEncoder as SklearnOneHotEncoder
+from scipy import sparse as sp
 
 from immuneML.IO.dataset_export.PickleExporter import PickleExporter
 from immuneML.caching.CacheHandler import CacheHandler
@@ -64,6 +64,11 @@ class OneHotEncoder(DatasetEncoder):
         This must be set to True when using onehot encoding in combination with scikit-learn ML methods (inheriting :py:obj:`~source.ml_methods.SklearnMethod.SklearnMethod`),
         such as :ref:`LogisticRegression`, :ref:`SVM`, :ref:`RandomForestClassifier` and :ref:`KNN`.
 
+        sparse (bool): whether to store the flattened onehot matrix as a sparse (scipy CSR) matrix instead of a dense numpy array. Only the
+        non-zero values are stored, so padding the examples to the longest sequence (and, for repertoires, to the largest repertoire) does
+        not take up memory. This can only be used when flatten is True; the sparse matrix can be used directly with scikit-learn ML
+        methods. By default, sparse is False.
+
 
     YAML specification:
 
@@ -81,6 +86,12 @@ class OneHotEncoder(DatasetEncoder):
                 distance_to_seq_middle: 3
                 flatten: False
 
+        one_hot_sparse:
+            OneHot:
+                use_positional_info: False
+                flatten: True
+                sparse: True
+
     """
 
     dataset_mapping = {
@@ -91,10 +102,11 @@ class OneHotEncoder(DatasetEncoder):
 
     ALPHABET = EnvironmentSettings.get_sequence_alphabet()
 
-    def __init__(self, use_positional_info: bool, distance_to_seq_middle: int, flatten: bool, name: str = None):
+    def __init__(self, use_positional_info: bool, distance_to_seq_middle: int, flatten: bool, name: str = None, sparse: bool = False):
         self.use_positional_info = use_positional_info
         self.distance_to_seq_middle = distance_to_seq_middle
         self.flatten = flatten
+        self.sparse = sparse
 
         if distance_to_seq_middle:
             self.pos_increasing = [1 / self.distance_to_seq_middle * i for i in range(self.distance_to_seq_middle)]
@@ -110,7 +122,7 @@ class OneHotEncoder(DatasetEncoder):
         self.onehot_dimensions = self.ALPHABET + ["start", "mid", "end"] if self.use_positional_info else self.ALPHABET # todo test this
 
     @staticmethod
-    def _prepare_parameters(use_positional_info, distance_to_seq_middle, flatten, name: str = None):
+    def _prepare_parameters(use_positional_info, distance_to_seq_middle, flatten, sparse: bool = False, name: str = None):
 
         location = OneHotEncoder.__name__
 
@@ -121,10 +133,13 @@ class OneHotEncoder(DatasetEncoder):
             distance_to_seq_middle = None
 
         ParameterValidator.assert_type_and_value(flatten, bool, location, "flatten")
+        ParameterValidator.assert_type_and_value(sparse, bool, location, "sparse")
+        assert flatten or not sparse, f"{location}: sparse can only be used when flatten is set to True."
 
         return {"use_positional_info": use_positional_info,
                 "distance_to_seq_middle": distance_to_seq_middle,
                 "flatten": flatten,
+                "sparse": sparse,
                 "name": name}
 
     @staticmethod
@@ -162,27 +177,52 @@ class OneHotEncoder(DatasetEncoder):
         PickleExporter.export(encoded_dataset, params.result_path)
 
     def _encode_sequence_list(self, sequences, pad_n_sequences, pad_sequence_len):
-        char_array = np.array(sequences, dtype=str)
-        char_array = char_array.view('U1').reshape((char_array.size, -1))
+        sequence_indices, columns, values = self._get_onehot_entries(sequences)
+
+        encoded_data = np.zeros((pad_n_sequences, pad_sequence_len * len(self.onehot_dimensions)))
+        encoded_data[sequence_indices, columns] = values
 
-        n_sequences, sequence_len = char_array.shape
+        return encoded_data.reshape((pad_n_sequences, pad_sequence_len, len(self.onehot_dimensions)))
 
-        sklearn_enc = SklearnOneHotEncoder(categories=[OneHotEncoder.ALPHABET for i in range(sequence_len)], handle_unknown='ignore')
-        encoded_data = sklearn_enc.fit_transform(char_array).toarray()
+    def _encode_sequence_list_sparse(self, sequences, pad_n_sequences, pad_sequence_len):
+        """returns a sparse matrix [pad_n_sequences, pad_sequence_len * onehot_dimensions] with one flattened onehot encoded sequence per row"""
+        sequence_indices, columns, values = self._get_onehot_entries(sequences)
 
-        encoded_data = np.pad(encoded_data, pad_width=((0, pad_n_sequences - n_sequences), (0, 0)))
-        encoded_data = encoded_data.reshape((pad_n_sequences, sequence_len, len(OneHotEncoder.ALPHABET)))
-        positional_dims = int(self.use_positional_info) * 3
-        encoded_data = np.pad(encoded_data, pad_width=((0, 0), (0, pad_sequence_len - sequence_len), (0, positional_dims)))
+        return sp.csr_matrix((values, (sequence_indices, columns)), shape=(pad_n_sequences, pad_sequence_len * len(self.onehot_dimensions)))
+
+    def _get_onehot_entries(self, sequences):
+        """
+        returns the sequence indices, the column indices in the flattened [sequence_length, onehot_dimensions] encoding and the values
+        of all non-zero entries of the onehot encoding of the sequences
+        """
+        residue_codes = self._get_residue_codes(sequences)
+        sequence_indices, positions = np.nonzero(residue_codes >= 0)
+        dimension_count = len(self.onehot_dimensions)
+
+        indices = [sequence_indices]
+        columns = [positions * dimension_count + residue_codes[sequence_indices, positions]]
+        values = [np.ones(len(sequence_indices))]
 
         if self.use_positional_info:
-            pos_info = [self._get_imgt_position_weights(len(sequence), pad_length=pad_sequence_len).T for sequence in sequences]
-            pos_info = np.stack(pos_info)
-            pos_info = np.pad(pos_info, pad_width=((0, pad_n_sequences - n_sequences), (0, 0), (0, 0)))
+            for index, sequence in enumerate(sequences):
+                weights = self._get_imgt_position_weights(len(sequence))
+                dimensions, positions = np.nonzero(weights)
+                indices.append(np.full(len(positions), index))
+                columns.append(positions * dimension_count + len(OneHotEncoder.ALPHABET) + dimensions)
+                values.append(weights[dimensions, positions])
+
+        return np.concatenate(indices), np.concatenate(columns), np.concatenate(values)
+
+    def _get_residue_codes(self, sequences):
+        """returns a matrix [sequences, max sequence length] of alphabet indices, with -1 for padding and characters not in the alphabet"""
+        char_array = np.array(sequences, dtype=str)
+        code_points = char_array.view(np.uint32).reshape((char_array.size, -1))
 
-            encoded_data[:, :, len(OneHotEncoder.ALPHABET):] = pos_info
+        alphabet_code_points = np.array([ord(character) for character in OneHotEncoder.ALPHABET])
+        lookup = np.full(alphabet_code_points.max() + 2, -1)
+        lookup[alphabet_code_points] = np.arange(len(alphabet_code_points))
 
-        return encoded_data
+        return lookup[np.minimum(code_points, len(lookup) - 1)]
 
     def _get_imgt_position_weights(self, seq_length, pad_length=None):
         start_weights = self._get_imgt_start_weights(seq_length)
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse as sp
 
 from immuneML.data_model.dataset.ReceptorDataset import ReceptorDataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
@@ -11,6 +12,8 @@ class OneHotReceptorEncoder(OneHotEncoder):
     One-hot encoded repertoire data is represented in a matrix with dimensions:
         [receptors, chains, sequence_lengths, one_hot_characters]
 
+    when sparse is true, the examples are stored in a sparse matrix [receptors, chains * sequence_lengths * one_hot_characters]
+
     when use_positional_info is true, the last 3 indices in one_hot_characters represents the positional information:
         - start position (high when close to start)
         - middle position (high in the middle of the sequence)
@@ -22,7 +25,8 @@ class OneHotReceptorEncoder(OneHotEncoder):
 
         encoded_dataset = ReceptorDataset(filenames=dataset.get_filenames(),
                                           encoded_data=encoded_data,
-                                          labels=dataset.labels)
+                                          labels=dataset.labels,
+                                          element_indices=dataset.element_indices)
 
         return encoded_dataset
 
@@ -36,17 +40,20 @@ class OneHotReceptorEncoder(OneHotEncoder):
         example_ids = dataset.get_example_ids()
         labels = self._get_labels(receptor_objs, params) if params.encode_labels else None
 
-        examples_first_chain = self._encode_sequence_list(first_chain_seqs, pad_n_sequences=len(receptor_objs),
-                                                          pad_sequence_len=max_seq_len)
-        examples_second_chain = self._encode_sequence_list(second_chain_seqs, pad_n_sequences=len(receptor_objs),
-                                                           pad_sequence_len=max_seq_len)
+        encode_sequence_list = self._encode_sequence_list_sparse if self.sparse else self._encode_sequence_list
+        examples_first_chain = encode_sequence_list(first_chain_seqs, pad_n_sequences=len(receptor_objs), pad_sequence_len=max_seq_len)
+        examples_second_chain = encode_sequence_list(second_chain_seqs, pad_n_sequences=len(receptor_objs), pad_sequence_len=max_seq_len)
 
-        examples = np.stack((examples_first_chain, examples_second_chain), axis=1)
+        if self.sparse:
+            examples = sp.hstack((examples_first_chain, examples_second_chain), format="csr")
+        else:
+            examples = np.stack((examples_first_chain, examples_second_chain), axis=1)
 
         feature_names = self._get_feature_names(max_seq_len, receptor_objs[0].get_chains())
 
         if self.flatten:
-            examples = examples.reshape((len(receptor_objs), 2*max_seq_len*len(self.onehot_dimensions)))
+            if not self.sparse:
+                examples = examples.reshape((len(receptor_objs), 2*max_seq_len*len(self.onehot_dimensions)))
             feature_names = [item for sublist in feature_names for subsublist in sublist for item in subsublist]
 
         encoded_data = EncodedData(examples=examples,
@@ -1,11 +1,12 @@
-import hashlib
 import math
 from multiprocessing.pool import Pool
 
 import numpy as np
+from scipy import sparse as sp
 
 from immuneML.caching.CacheHandler import CacheHandler
 from immuneML.caching.CacheObjectType import CacheObjectType
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.encodings.EncoderParams import EncoderParams
@@ -18,6 +19,8 @@ class OneHotRepertoireEncoder(OneHotEncoder):
     One-hot encoded repertoire data is represented in a matrix with dimensions:
         [repertoires, sequences, sequence_lengths, one_hot_characters]
 
+    when sparse is true, the examples are stored in a sparse matrix [repertoires, sequences * sequence_lengths * one_hot_characters]
+
     when use_positional_info is true, the last 3 indices in one_hot_characters represents the positional information:
         - start position (high when close to start)
         - middle position (high in the middle of the sequence)
@@ -57,14 +60,18 @@ class OneHotRepertoireEncoder(OneHotEncoder):
 
         encoded_repertoires, repertoire_names, labels = zip(*repertoires)
 
-        examples = np.stack(encoded_repertoires, axis=0)
+        if self.sparse:
+            examples = sp.vstack(encoded_repertoires, format="csr")
+        else:
+            examples = np.stack(encoded_repertoires, axis=0)
 
         labels = {k: [dic[k] for dic in labels] for k in labels[0]}
 
         feature_names = self._get_feature_names(self.max_seq_len, self.max_rep_len)
 
         if self.flatten:
-            examples = examples.reshape(dataset.get_example_count(), self.max_rep_len*self.max_seq_len*len(self.onehot_dimensions))
+            if not self.sparse:
+                examples = examples.reshape(dataset.get_example_count(), self.max_rep_len*self.max_seq_len*len(self.onehot_dimensions))
             feature_names = [item for sublist in feature_names for subsublist in sublist for item in subsublist]
 
         encoded_data = EncodedData(examples=examples,
@@ -85,13 +92,17 @@ class OneHotRepertoireEncoder(OneHotEncoder):
         return CacheHandler.memo_by_params((("encoding_model", params.model),
                                             ("labels", params.label_config.get_labels_by_name()),
                                             ("repertoire_id", repertoire.identifier),
-                                            ("repertoire_data", hashlib.sha256(np.ascontiguousarray(repertoire.get_sequence_aas())).hexdigest())),
+                                            ("repertoire_data", Fingerprinter.fingerprint(repertoire.get_sequence_aas()))),
                                            lambda: self._encode_repertoire(repertoire, params), CacheObjectType.ENCODING)
 
     def _encode_repertoire(self, repertoire, params: EncoderParams):
         sequences = repertoire.get_attribute(EnvironmentSettings.get_sequence_type().value)
 
-        onehot_encoded = self._encode_sequence_list(sequences, pad_n_sequences=self.max_rep_len, pad_sequence_len=self.max_seq_len)
+        if self.sparse:
+            onehot_encoded = self._encode_sequence_list_sparse(sequences, pad_n_sequences=self.max_rep_len, pad_sequence_len=self.max_seq_len)
+            onehot_encoded = onehot_encoded.reshape((1, self.max_rep_len * self.max_seq_len * len(self.onehot_dimensions))).tocsr()
+        else:
+            onehot_encoded = self._encode_sequence_list(sequences, pad_n_sequences=self.max_rep_len, pad_sequence_len=self.max_seq_len)
         example_id = repertoire.identifier
         labels = self._get_repertoire_labels(repertoire, params) if params.encode_labels else None
 
@@ -10,6 +10,8 @@ class OneHotSequenceEncoder(OneHotEncoder):
     One-hot encoded repertoire data is represented in a matrix with dimensions:
         [sequences, sequence_lengths, one_hot_characters]
 
+    when sparse is true, the examples are stored in a sparse matrix [sequences, sequence_lengths * one_hot_characters]
+
     when use_positional_info is true, the last 3 indices in one_hot_characters represents the positional information:
         - start position (high when close to start)
         - middle position (high in the middle of the sequence)
@@ -21,7 +23,8 @@ class OneHotSequenceEncoder(OneHotEncoder):
         encoded_dataset = SequenceDataset(filenames=dataset.get_filenames(),
                                           encoded_data=encoded_data,
                                           labels=dataset.labels,
-                                          file_size=dataset.file_size)
+                                          file_size=dataset.file_size,
+                                          element_indices=dataset.element_indices)
 
         return encoded_dataset
 
@@ -33,12 +36,16 @@ class OneHotSequenceEncoder(OneHotEncoder):
         max_seq_len = max([len(seq) for seq in sequences])
         labels = self._get_labels(sequence_objs, params) if params.encode_labels else None
 
-        examples = self._encode_sequence_list(sequences, pad_n_sequences=len(sequence_objs), pad_sequence_len=max_seq_len)
-
         feature_names = self._get_feature_names(max_seq_len)
 
+        if self.sparse:
+            examples = self._encode_sequence_list_sparse(sequences, pad_n_sequences=len(sequence_objs), pad_sequence_len=max_seq_len)
+        else:
+            examples = self._encode_sequence_list(sequences, pad_n_sequences=len(sequence_objs), pad_sequence_len=max_seq_len)
+
         if self.flatten:
-            examples = examples.reshape((len(sequence_objs), max_seq_len*len(self.onehot_dimensions)))
+            if not self.sparse:
+                examples = examples.reshape((len(sequence_objs), max_seq_len*len(self.onehot_dimensions)))
             feature_names = [item for sublist in feature_names for item in sublist]
 
         encoded_data = EncodedData(examples=examples,
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from immuneML.analysis.SequenceMatcher import SequenceMatcher
+from immuneML.analysis.ReferenceSequenceIndex import ReferenceSequenceIndex
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.data_model.repertoire.Repertoire import Repertoire
@@ -83,9 +83,10 @@ class MatchedReceptorsRepertoireEncoder(MatchedReceptorsEncoder):
                                         len(self.reference_receptors) * 2),
                                        dtype=int)
         labels = {label: [] for label in params.label_config.get_labels_by_name()} if params.encode_labels else None
+        reference_indices = self._build_reference_indices()
 
         for i, repertoire in enumerate(dataset.get_data()):
-            encoded_repertories[i] = self._match_repertoire_to_receptors(repertoire)
+            encoded_repertories[i] = self._match_repertoire_to_receptors(repertoire, reference_indices)
 
             if labels is not None:
                 for label in params.label_config.get_labels_by_name():
@@ -93,23 +94,25 @@ class MatchedReceptorsRepertoireEncoder(MatchedReceptorsEncoder):
 
         return encoded_repertories, labels, dataset.get_repertoire_ids()
 
-    def _match_repertoire_to_receptors(self, repertoire: Repertoire):
-        matcher = SequenceMatcher()
-        matches = np.zeros(len(self.reference_receptors) * 2, dtype=int)
-        rep_seqs = repertoire.sequences
-
+    def _build_reference_indices(self) -> list:
+        # one index per chain name, since the max edit distance is defined per chain; first chains of the receptors are mapped
+        # to even columns in the matches and second chains to odd columns
+        chains_per_name = {}
         for i, ref_receptor in enumerate(self.reference_receptors):
             chain_names = ref_receptor.get_chains()
-            first_chain = ref_receptor.get_chain(chain_names[0])
-            second_chain = ref_receptor.get_chain(chain_names[1])
+            for chain_index, chain_name in enumerate(chain_names[:2]):
+                chains_per_name.setdefault(chain_name, []).append((i * 2 + chain_index, ref_receptor.get_chain(chain_name)))
 
-            for rep_seq in rep_seqs:
-                # Match with first chain: add to even columns in matches.
-                # Match with second chain: add to odd columns
-                if matcher.matches_sequence(first_chain, rep_seq, max_distance=self.max_edit_distances[chain_names[0]]):
-                    matches[i * 2] += rep_seq.metadata.count
-                if matcher.matches_sequence(second_chain, rep_seq, max_distance=self.max_edit_distances[chain_names[1]]):
-                    matches[i * 2 + 1] += rep_seq.metadata.count
+        return [(ReferenceSequenceIndex([chain for _, chain in chains], self.max_edit_distances[chain_name]),
+                 np.array([column for column, _ in chains], dtype=int))
+                for chain_name, chains in chains_per_name.items()]
 
-        return matches
+    def _match_repertoire_to_receptors(self, repertoire: Repertoire, reference_indices: list = None):
+        if reference_indices is None:
+            reference_indices = self._build_reference_indices()
 
+        matches = np.zeros(len(self.reference_receptors) * 2, dtype=int)
+        for reference_index, columns in reference_indices:
+            matches[columns] += reference_index.match_repertoire(repertoire)
+
+        return matches
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from immuneML.analysis.SequenceMatcher import SequenceMatcher
+from immuneML.analysis.ReferenceSequenceIndex import ReferenceSequenceIndex
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.data_model.repertoire.Repertoire import Repertoire
@@ -60,24 +60,18 @@ class MatchedSequencesRepertoireEncoder(MatchedSequencesEncoder):
                                        dtype=int)
 
         labels = {label: [] for label in params.label_config.get_labels_by_name()} if params.encode_labels else None
+        reference_index = ReferenceSequenceIndex(self.reference_sequences, self.max_edit_distance)
 
         for i, repertoire in enumerate(dataset.get_data()):
-            encoded_repertories[i] = self._match_repertoire_to_reference(repertoire)
+            encoded_repertories[i] = self._match_repertoire_to_reference(repertoire, reference_index)
 
             for label in params.label_config.get_labels_by_name():
                 labels[label].append(repertoire.metadata[label])
 
         return encoded_repertories, labels
 
-    def _match_repertoire_to_reference(self, repertoire: Repertoire):
-        matcher = SequenceMatcher()
-        matches = np.zeros(len(self.reference_sequences), dtype=int)
-        rep_seqs = repertoire.sequences
+    def _match_repertoire_to_reference(self, repertoire: Repertoire, reference_index: ReferenceSequenceIndex = None):
+        if reference_index is None:
+            reference_index = ReferenceSequenceIndex(self.reference_sequences, self.max_edit_distance)
 
-        for i, reference_seq in enumerate(self.reference_sequences):
-
-            for repertoire_seq in rep_seqs:
-                if matcher.matches_sequence(reference_seq, repertoire_seq, max_distance=self.max_edit_distance):
-                    matches[i] += repertoire_seq.metadata.count
-
-        return matches
+        return reference_index.match_repertoire(repertoire)
@@ -1,6 +1,5 @@
 # quality: gold
 import abc
-import hashlib
 from pathlib import Path
 from typing import List
 
@@ -8,6 +7,7 @@ import pandas as pd
 from gensim.models import Word2Vec
 
 from immuneML.caching.CacheHandler import CacheHandler
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.encodings.DatasetEncoder import DatasetEncoder
@@ -107,12 +107,19 @@ class Word2VecEncoder(DatasetEncoder):
                 ("dataset_metadata", dataset.metadata_file),
                 ("dataset_type", dataset.__class__.__name__),
                 ("labels", tuple(params.label_config.get_labels_by_name())),
-                ("vectors", hashlib.sha256(str(vectors).encode("utf-8")).hexdigest()),
+                ("vectors", self._fingerprint_vectors(vectors)),
                 ("description", description),
                 ("encoding", Word2VecEncoder.__name__),
                 ("learn_model", params.learn_model),
                 ("encoding_params", tuple([(key, getattr(self, key)) for key in vars(self)])), )
 
+    def _fingerprint_vectors(self, vectors) -> str:
+        if vectors is None:
+            return Fingerprinter.fingerprint(None)
+        else:
+            words = vectors.index_to_key if hasattr(vectors, "index_to_key") else vectors.index2word
+            return Fingerprinter.fingerprint((words, vectors.vectors))
+
     def _encode_new_dataset(self, dataset, params: EncoderParams):
         if params.learn_model is True and not self._exists_model(params):
             model = self._create_model(dataset=dataset, params=params)
@@ -11,6 +11,7 @@ class Constants:
     GENE_DELIMITER = "-"
     STOP_CODON = "*"
     CACHE_TYPE = "cache_type"
+    CACHE_MEMORY_LIMIT = "cache_memory_limit"
     COMMENT_SIGN = "#"
     NOT_COMPUTED = "not computed"
 
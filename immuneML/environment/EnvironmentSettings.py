@@ -44,6 +44,19 @@ class EnvironmentSettings:
             os.environ[Constants.CACHE_TYPE] = CacheType.PRODUCTION.name
         return CacheType[os.environ[Constants.CACHE_TYPE].upper()]
 
+    @staticmethod
+    def get_cache_memory_limit() -> int:
+        """
+        :return: the number of bytes the deserialized cached objects can occupy in memory, as set by the environment variable
+                 cache_memory_limit; 0 (the default) means that cached objects are always loaded from disk
+        """
+        memory_limit = os.environ.get(Constants.CACHE_MEMORY_LIMIT, "0")
+        try:
+            return max(int(float(memory_limit)), 0)
+        except ValueError:
+            raise ValueError(f"EnvironmentSettings: environment variable {Constants.CACHE_MEMORY_LIMIT} has to be a number of bytes, "
+                             f"got {memory_limit} instead.")
+
     @staticmethod
     def get_cache_path(cache_type: CacheType = None):
         cache_type = EnvironmentSettings.get_cache_type() if cache_type is None else cache_type
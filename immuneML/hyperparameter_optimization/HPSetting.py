@@ -1,3 +1,4 @@
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.encodings.DatasetEncoder import DatasetEncoder
 from immuneML.ml_methods.MLMethod import MLMethod
 
@@ -24,5 +25,13 @@ class HPSetting:
             key += f"_{self.preproc_sequence_name}"
         return key
 
+    def get_encoding_key(self) -> str:
+        """
+        Returns:
+            fingerprint of the preprocessing and encoding of the setting; settings with the same encoding key differ only in the ML method
+        """
+        preprocessing = [(type(step).__name__, vars(step)) for step in self.preproc_sequence] if self.preproc_sequence is not None else None
+        return Fingerprinter.fingerprint((type(self.encoder).__name__, vars(self.encoder), self.encoder_params, preprocessing))
+
     def __str__(self):
         return self.get_key()
@@ -3,6 +3,7 @@ from pathlib import Path
 
 from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.hyperparameter_optimization.HPSetting import HPSetting
+from immuneML.hyperparameter_optimization.core.HPScheduler import HPScheduler
 from immuneML.hyperparameter_optimization.core.HPSelection import HPSelection
 from immuneML.hyperparameter_optimization.core.HPUtil import HPUtil
 from immuneML.hyperparameter_optimization.states.HPAssessmentState import HPAssessmentState
@@ -17,13 +18,31 @@ class HPAssessment:
 
     @staticmethod
     def run_assessment(state: TrainMLModelState) -> TrainMLModelState:
+        """
+        runs nested CV: the outer (assessment) splits are made first, then the inner loop (selection) is run for all of them and finally all
+        models are retrained on each assessment split; the ML processes within each of the two stages are independent and are run in
+        parallel by HPScheduler
+        """
 
         state = HPAssessment._create_root_path(state)
         train_val_datasets, test_datasets = HPUtil.split_data(state.dataset, state.assessment, state.path, state.label_configuration)
         n_splits = len(train_val_datasets)
 
         for index in range(n_splits):
-            state = HPAssessment.run_assessment_split(state, train_val_datasets[index], test_datasets[index], index, n_splits)
+            current_path = HPAssessment.create_assessment_path(state, index)
+            state.assessment_states.append(HPAssessmentState(index, train_val_datasets[index], test_datasets[index], current_path,
+                                                             state.label_configuration))
+
+        print(f'{datetime.datetime.now()}: Training ML model: running the inner loop of nested CV for {n_splits} outer split(s).\n', flush=True)
+
+        state = HPSelection.run_selection(state)
+
+        print(f'{datetime.datetime.now()}: Training ML model: running outer CV loop: retraining models for {n_splits} outer split(s).\n', flush=True)
+
+        state = HPAssessment.run_assessment_per_label(state)
+
+        for assessment_state in state.assessment_states:
+            HPAssessment.run_assessment_data_reports(state, assessment_state)
 
         return state
 
@@ -34,53 +53,38 @@ class HPAssessment:
         return state
 
     @staticmethod
-    def run_assessment_split(state, train_val_dataset, test_dataset, split_index: int, n_splits):
-        """run inner CV loop (selection) and retrain on the full train_val_dataset after optimal model is chosen"""
-
-        print(f'{datetime.datetime.now()}: Training ML model: running outer CV loop: started split {split_index + 1}/{n_splits}.\n', flush=True)
-
-        current_path = HPAssessment.create_assessment_path(state, split_index)
-
-        assessment_state = HPAssessmentState(split_index, train_val_dataset, test_dataset, current_path, state.label_configuration)
-        state.assessment_states.append(assessment_state)
-
-        state = HPSelection.run_selection(state, train_val_dataset, current_path, split_index)
-        state = HPAssessment.run_assessment_split_per_label(state, split_index)
-
-        assessment_state.train_val_data_reports = ReportUtil.run_data_reports(train_val_dataset, state.assessment.reports.data_split_reports.values(),
-                                                                              current_path / "data_report_train", state.context)
-        assessment_state.test_data_reports = ReportUtil.run_data_reports(test_dataset, state.assessment.reports.data_split_reports.values(),
-                                                                         current_path / "data_report_test", state.context)
-
-        print(f'{datetime.datetime.now()}: Training ML model: running outer CV loop: finished split {split_index + 1}/{n_splits}.\n', flush=True)
-
-        return state
+    def run_assessment_data_reports(state: TrainMLModelState, assessment_state: HPAssessmentState):
+        assessment_state.train_val_data_reports = ReportUtil.run_data_reports(assessment_state.train_val_dataset,
+                                                                              state.assessment.reports.data_split_reports.values(),
+                                                                              assessment_state.path / "data_report_train", state.context)
+        assessment_state.test_data_reports = ReportUtil.run_data_reports(assessment_state.test_dataset,
+                                                                         state.assessment.reports.data_split_reports.values(),
+                                                                         assessment_state.path / "data_report_test", state.context)
 
     @staticmethod
-    def run_assessment_split_per_label(state: TrainMLModelState, split_index: int):
-        """iterate through labels and hp_settings and retrain all models"""
-        n_labels = state.label_configuration.get_label_count()
-
-        for idx, label in enumerate(state.label_configuration.get_labels_by_name()):
+    def run_assessment_per_label(state: TrainMLModelState):
+        """retrain models for all assessment splits, labels and hp_settings"""
 
-            print(f"{datetime.datetime.now()}: Training ML model: running the inner loop of nested CV: "
-                  f"retrain models for label {label} (label {idx + 1} / {n_labels}).\n", flush=True)
+        tasks, task_keys = [], []
 
-            path = state.assessment_states[split_index].path
+        for assessment_state in state.assessment_states:
+            for label in state.label_configuration.get_labels_by_name():
+                optimal_hp_setting = assessment_state.label_states[label].optimal_hp_setting
+                for hp_setting in state.hp_settings:
 
-            for index, hp_setting in enumerate(state.hp_settings):
+                    if hp_setting != optimal_hp_setting:
+                        setting_path = assessment_state.path / f"{label}_{hp_setting}/"
+                    else:
+                        setting_path = assessment_state.path / f"{label}_{hp_setting}_optimal/"
 
-                if hp_setting != state.assessment_states[split_index].label_states[label].optimal_hp_setting:
-                    setting_path = path / f"{label}_{hp_setting}/"
-                else:
-                    setting_path = path / f"{label}_{hp_setting}_optimal/"
+                    tasks.append((HPAssessment._create_process(state, assessment_state.train_val_dataset, assessment_state.test_dataset, hp_setting,
+                                                               setting_path, label), assessment_state.split_index))
+                    task_keys.append((assessment_state.split_index, label, str(hp_setting)))
 
-                train_val_dataset = state.assessment_states[split_index].train_val_dataset
-                test_dataset = state.assessment_states[split_index].test_dataset
-                state = HPAssessment.reeval_on_assessment_split(state, train_val_dataset, test_dataset, hp_setting, setting_path, label, split_index)
+        assessment_items = HPScheduler.run(tasks, state.number_of_processes)
 
-            print(f"{datetime.datetime.now()}: Training ML model: running the inner loop of nested CV: completed retraining models "
-                  f"for label {label} (label {idx + 1} / {n_labels}).\n", flush=True)
+        for (split_index, label, hp_setting_key), assessment_item in zip(task_keys, assessment_items):
+            state.assessment_states[split_index].label_states[label].assessment_items[hp_setting_key] = assessment_item
 
         return state
 
@@ -89,17 +93,20 @@ class HPAssessment:
                                    split_index: int) -> MLMethod:
         """retrain model for specific label, assessment split and hp_setting"""
 
-        assessment_item = MLProcess(train_dataset=train_val_dataset, test_dataset=test_dataset, label=label, metrics=state.metrics,
-                                    optimization_metric=state.optimization_metric, path=path, hp_setting=hp_setting, report_context=state.context,
-                                    ml_reports=state.assessment.reports.model_reports.values(), number_of_processes=state.number_of_processes,
-                                    encoding_reports=state.assessment.reports.encoding_reports.values(), label_config=state.label_configuration,
-                                    store_encoded_data=state.store_encoded_data) \
-            .run(split_index)
+        assessment_item = HPAssessment._create_process(state, train_val_dataset, test_dataset, hp_setting, path, label).run(split_index)
 
         state.assessment_states[split_index].label_states[label].assessment_items[str(hp_setting)] = assessment_item
 
         return state
 
+    @staticmethod
+    def _create_process(state, train_val_dataset: Dataset, test_dataset: Dataset, hp_setting: HPSetting, path: Path, label: str) -> MLProcess:
+        return MLProcess(train_dataset=train_val_dataset, test_dataset=test_dataset, label=label, metrics=state.metrics,
+                         optimization_metric=state.optimization_metric, path=path, hp_setting=hp_setting, report_context=state.context,
+                         ml_reports=list(state.assessment.reports.model_reports.values()), number_of_processes=state.number_of_processes,
+                         encoding_reports=list(state.assessment.reports.encoding_reports.values()), label_config=state.label_configuration,
+                         store_encoded_data=state.store_encoded_data)
+
     @staticmethod
     def create_assessment_path(state, split_index):
         current_path = state.path / f"split_{split_index + 1}"
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from joblib import parallel_backend
+
+from immuneML.hyperparameter_optimization.states.HPItem import HPItem
+from immuneML.workflows.instructions.MLProcess import MLProcess
+
+
+class HPScheduler:
+    """
+    Runs independent ML processes (e.g., all combinations of outer split, label, hyperparameter setting and inner split in nested
+    cross-validation) on a pool of processes.
+
+    The ML processes which use the same data split and differ only in the ML method (same datasets, labels, preprocessing and encoding,
+    see MLProcess.get_encoding_key()) are grouped, so that the data are preprocessed and encoded once per group and the encoded datasets
+    are kept in memory for all ML methods in the group (MLProcess.run_group()).
+
+    number_of_processes is the total CPU budget: the groups are run on min(number_of_processes, number of groups) workers, and each
+    ML process gets an equal share of the budget for its own parallelization (e.g., in encoders or ML methods). Within the workers, scikit-learn
+    uses threads instead of starting its own processes. If only one worker would be used, the processes are run one after another in the
+    current process.
+
+    The results are returned in the order of the tasks regardless of the order in which they finish, so that the state built from them
+    is the same as if the tasks were run sequentially.
+    """
+
+    @staticmethod
+    def run(tasks: List[Tuple[MLProcess, int]], number_of_processes: int) -> List[HPItem]:
+        groups = HPScheduler.group_tasks(tasks)
+        worker_count = HPScheduler.get_worker_count(len(groups), number_of_processes)
+
+        if worker_count <= 1:
+            group_results = [MLProcess.run_group([tasks[index][0] for index in task_indices], split_index)
+                             for split_index, task_indices in groups]
+        else:
+            processes_per_task = max(1, number_of_processes // worker_count)
+            for process, _ in tasks:
+                process.number_of_processes = processes_per_task
+
+            with ProcessPoolExecutor(max_workers=worker_count) as executor:
+                futures = [executor.submit(HPScheduler._run_group, [tasks[index][0] for index in task_indices], split_index)
+                           for split_index, task_indices in groups]
+                group_results = [future.result() for future in futures]
+
+        results = [None for _ in tasks]
+        for (_, task_indices), hp_items in zip(groups, group_results):
+            for index, hp_item in zip(task_indices, hp_items):
+                results[index] = hp_item
+
+        return results
+
+    @staticmethod
+    def group_tasks(tasks: List[Tuple[MLProcess, int]]) -> List[Tuple[int, List[int]]]:
+        """groups the indices of tasks with the same split index and encoding key, in order of the first task in each group"""
+        groups = {}
+        for index, (process, split_index) in enumerate(tasks):
+            groups.setdefault((split_index, process.get_encoding_key()), []).append(index)
+
+        return [(split_index, task_indices) for (split_index, _), task_indices in groups.items()]
+
+    @staticmethod
+    def get_worker_count(task_count: int, number_of_processes: int) -> int:
+        return max(1, min(task_count, number_of_processes if number_of_processes is not None else 1))
+
+    @staticmethod
+    def _run_group(processes: List[MLProcess], split_index: int) -> List[HPItem]:
+        # within a worker, scikit-learn parallelizes with threads: otherwise the worker would on exit wait for idle joblib worker processes
+        with parallel_backend("threading"):
+            return MLProcess.run_group(processes, split_index)
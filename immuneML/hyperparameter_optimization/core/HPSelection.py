@@ -4,6 +4,7 @@ from pathlib import Path
 from immuneML.environment.LabelConfiguration import LabelConfiguration
 from immuneML.hyperparameter_optimization.HPSetting import HPSetting
 from immuneML.hyperparameter_optimization.config.SplitType import SplitType
+from immuneML.hyperparameter_optimization.core.HPScheduler import HPScheduler
 from immuneML.hyperparameter_optimization.core.HPUtil import HPUtil
 from immuneML.hyperparameter_optimization.states.HPSelectionState import HPSelectionState
 from immuneML.hyperparameter_optimization.states.TrainMLModelState import TrainMLModelState
@@ -21,41 +22,78 @@ class HPSelection:
         return state
 
     @staticmethod
-    def run_selection(state: TrainMLModelState, train_val_dataset, current_path: Path, split_index: int) -> TrainMLModelState:
+    def run_selection(state: TrainMLModelState) -> TrainMLModelState:
+        """
+        runs the inner loop of nested CV for all assessment splits: the settings which the optimization strategy evaluates independently of
+        each other are scheduled together for all assessment splits, labels and selection splits, and the strategy is then updated with their
+        performances in the same order as if they were run one by one
+        """
 
-        path = HPSelection.create_selection_path(state, current_path)
-        state = HPSelection.update_split_count(state, train_val_dataset)
-        train_datasets, val_datasets = HPUtil.split_data(train_val_dataset, state.selection, path, state.label_configuration)
+        tasks, task_keys = HPSelection._create_selection_tasks(state)
+        hp_items = HPScheduler.run(tasks, state.number_of_processes)
+
+        precomputed_items = {}
+        for task_key, hp_item in zip(task_keys, hp_items):
+            precomputed_items.setdefault(task_key, []).append(hp_item)
 
         n_labels = state.label_configuration.get_label_count()
 
-        for idx, label in enumerate(state.label_configuration.get_labels_by_name()):
+        for assessment_state in state.assessment_states:
+            for idx, label in enumerate(state.label_configuration.get_labels_by_name()):
 
-            print(f"{datetime.datetime.now()}: Hyperparameter optimization: running the inner loop of nested CV: selection for label {label} "
-                  f"(label {idx + 1} / {n_labels}).\n", flush=True)
+                print(f"{datetime.datetime.now()}: Hyperparameter optimization: running the inner loop of nested CV: selection for label {label} "
+                      f"(label {idx + 1} / {n_labels}) on assessment split {assessment_state.split_index + 1}.\n", flush=True)
 
-            selection_state = HPSelectionState(train_datasets, val_datasets, path, state.hp_strategy)
-            state.assessment_states[split_index].label_states[label].selection_state = selection_state
+                selection_state = assessment_state.label_states[label].selection_state
 
-            hp_setting = selection_state.hp_strategy.generate_next_setting()
-            while hp_setting is not None:
-                performance = HPSelection.evaluate_hp_setting(state, hp_setting, train_datasets, val_datasets,
-                                                              path, label, split_index)
-                hp_setting = selection_state.hp_strategy.generate_next_setting(hp_setting, performance)
+                hp_setting = selection_state.hp_strategy.generate_next_setting()
+                while hp_setting is not None:
+                    task_key = (assessment_state.split_index, label, hp_setting.get_key())
+                    if task_key in precomputed_items:
+                        selection_state.hp_items[hp_setting.get_key()].extend(precomputed_items[task_key])
+                        performance = HPUtil.get_average_performance([HPSelection.get_performance(state, hp_item)
+                                                                      for hp_item in precomputed_items[task_key]])
+                    else:
+                        performance = HPSelection.evaluate_hp_setting(state, hp_setting, selection_state.train_datasets, selection_state.val_datasets,
+                                                                      selection_state.path, label, assessment_state.split_index)
+                    hp_setting = selection_state.hp_strategy.generate_next_setting(hp_setting, performance)
 
-            HPUtil.run_selection_reports(state, train_val_dataset, train_datasets, val_datasets, selection_state)
+                HPUtil.run_selection_reports(state, assessment_state.train_val_dataset, selection_state.train_datasets, selection_state.val_datasets,
+                                             selection_state)
 
-            print(f"{datetime.datetime.now()}: Hyperparameter optimization: running the inner loop of nested CV: completed selection for "
-                  f"label {label} (label {idx + 1} / {n_labels}).\n", flush=True)
+                print(f"{datetime.datetime.now()}: Hyperparameter optimization: running the inner loop of nested CV: completed selection for "
+                      f"label {label} (label {idx + 1} / {n_labels}) on assessment split {assessment_state.split_index + 1}.\n", flush=True)
 
         return state
 
+    @staticmethod
+    def _create_selection_tasks(state: TrainMLModelState) -> tuple:
+        tasks, task_keys = [], []
+
+        for assessment_state in state.assessment_states:
+            path = HPSelection.create_selection_path(state, assessment_state.path)
+            state = HPSelection.update_split_count(state, assessment_state.train_val_dataset)
+            train_datasets, val_datasets = HPUtil.split_data(assessment_state.train_val_dataset, state.selection, path, state.label_configuration)
+
+            for label in state.label_configuration.get_labels_by_name():
+                selection_state = HPSelectionState(train_datasets, val_datasets, path, state.hp_strategy)
+                assessment_state.label_states[label].selection_state = selection_state
+
+                for hp_setting in selection_state.hp_strategy.get_independent_settings():
+                    for index in range(len(train_datasets)):
+                        process = HPSelection._create_process(state, hp_setting, train_datasets[index], val_datasets[index],
+                                                              path / f"split_{index + 1}" / f"{label}_{hp_setting.get_key()}", label)
+                        tasks.append((process, index + 1))
+                        task_keys.append((assessment_state.split_index, label, hp_setting.get_key()))
+
+        return tasks, task_keys
+
     @staticmethod
     def evaluate_hp_setting(state: TrainMLModelState, hp_setting: HPSetting, train_datasets: list, val_datasets: list,
                             current_path: Path, label: str, assessment_split_index: int):
 
         performances = []
-        for index in range(state.selection.split_count):
+        for index in range(len(train_datasets)):
             performance = HPSelection.run_setting(state, hp_setting, train_datasets[index], val_datasets[index], index + 1,
                                                   current_path / f"split_{index + 1}" / f"{label}_{hp_setting.get_key()}",
                                                   label, assessment_split_index)
@@ -63,19 +101,26 @@ class HPSelection:
 
         return HPUtil.get_average_performance(performances)
 
+    @staticmethod
+    def _create_process(state: TrainMLModelState, hp_setting: HPSetting, train_dataset, val_dataset, current_path: Path, label: str) -> MLProcess:
+        return MLProcess(train_dataset=train_dataset, test_dataset=val_dataset, encoding_reports=list(state.selection.reports.encoding_reports.values()),
+                         label_config=LabelConfiguration([state.label_configuration.get_label_object(label)]), report_context=state.context,
+                         number_of_processes=state.number_of_processes, metrics=state.metrics, optimization_metric=state.optimization_metric,
+                         ml_reports=list(state.selection.reports.model_reports.values()), label=label, path=current_path, hp_setting=hp_setting,
+                         store_encoded_data=state.store_encoded_data)
+
     @staticmethod
     def run_setting(state: TrainMLModelState, hp_setting, train_dataset, val_dataset, split_index: int,
                     current_path: Path, label: str, assessment_index: int):
 
-        hp_item = MLProcess(train_dataset=train_dataset, test_dataset=val_dataset, encoding_reports=state.selection.reports.encoding_reports.values(),
-                            label_config=LabelConfiguration([state.label_configuration.get_label_object(label)]), report_context=state.context,
-                            number_of_processes=state.number_of_processes, metrics=state.metrics, optimization_metric=state.optimization_metric,
-                            ml_reports=state.selection.reports.model_reports.values(), label=label, path=current_path, hp_setting=hp_setting,
-                            store_encoded_data=state.store_encoded_data)\
-            .run(split_index)
+        hp_item = HPSelection._create_process(state, hp_setting, train_dataset, val_dataset, current_path, label).run(split_index)
 
         state.assessment_states[assessment_index].label_states[label].selection_state.hp_items[hp_setting.get_key()].append(hp_item)
 
+        return HPSelection.get_performance(state, hp_item)
+
+    @staticmethod
+    def get_performance(state: TrainMLModelState, hp_item):
         return hp_item.performance[state.optimization_metric.name.lower()] if hp_item.performance is not None else None
 
     @staticmethod
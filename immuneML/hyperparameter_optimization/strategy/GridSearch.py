@@ -21,6 +21,9 @@ class GridSearch(HPOptimizationStrategy):
 
         return copy.deepcopy(next_setting)
 
+    def get_independent_settings(self) -> list:
+        return [copy.deepcopy(hp_setting) for hp_setting in self.hp_settings.values()]
+
     def get_optimal_hps(self) -> HPSetting:
         """
         Finds the optimal hyperparameter setting, where the optimal is the one with max/min value of the search metric.
@@ -28,6 +28,14 @@ class HPOptimizationStrategy(metaclass=abc.ABCMeta):
         """
         pass
 
+    def get_independent_settings(self) -> list:
+        """
+        :return: the settings which will be evaluated regardless of the performance of other settings, so they can be evaluated in parallel
+                 before the strategy is updated with their performance; by default there are no such settings and each setting is evaluated
+                 only once it is returned by generate_next_setting
+        """
+        return []
+
     @abc.abstractmethod
     def get_optimal_hps(self) -> HPSetting:
         pass
@@ -1,4 +1,3 @@
-import hashlib
 import warnings
 from pathlib import Path
 
@@ -11,6 +10,7 @@ from sklearn.exceptions import NotFittedError
 from tqdm import tqdm
 
 from immuneML.caching.CacheHandler import CacheHandler
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.encodings.deeprc.DeepRCEncoder import DeepRCEncoder
 from immuneML.ml_methods.MLMethod import MLMethod
@@ -236,8 +236,8 @@ class DeepRC(MLMethod):
         self.label_classes = label_classes[self.label]
 
     def _prepare_caching_params(self, encoded_data: EncodedData, type: str, label_name: str):
-        return (("metadata_filepath", str(encoded_data.info["metadata_filepath"])),
-                ("y", hashlib.sha256(str(encoded_data.labels[label_name]).encode("utf-8")).hexdigest()),
+        return (("metadata_filepath", Fingerprinter.fingerprint(Path(encoded_data.info["metadata_filepath"]))),
+                ("y", Fingerprinter.fingerprint(encoded_data.labels[label_name])),
                 ("label_name", label_name),
                 ("type", type),
                 ("validation_part", self.validation_part),
@@ -1,5 +1,4 @@
 import abc
-import hashlib
 import os
 import warnings
 from pathlib import Path
@@ -13,6 +12,7 @@ from sklearn.model_selection import RandomizedSearchCV
 from sklearn.utils.validation import check_is_fitted
 
 from immuneML.caching.CacheHandler import CacheHandler
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.encoded_data.EncodedData import EncodedData
 from immuneML.ml_methods.MLMethod import MLMethod
 from immuneML.ml_methods.util.Util import Util
@@ -87,8 +87,8 @@ class SklearnMethod(MLMethod):
         self.label_name = None
 
     def _prepare_caching_params(self, encoded_data: EncodedData, y, type: str, label_name: str = None, number_of_splits: int = -1):
-        return (("encoded_data", hashlib.sha256(str(encoded_data.examples).encode("utf-8")).hexdigest()),
-                ("y", hashlib.sha256(str(y).encode("utf-8")).hexdigest()),
+        return (("encoded_data", Fingerprinter.fingerprint(encoded_data.examples)),
+                ("y", Fingerprinter.fingerprint(y)),
                 ("label_names", label_name),
                 ("type", type),
                 ("number_of_splits", str(number_of_splits)),
@@ -1,9 +1,8 @@
 import logging
-import os
-import pickle
 from pathlib import Path
 
 import numpy as np
+from scipy import sparse
 
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.pairwise_repertoire_comparison.ComparisonDataBatch import ComparisonDataBatch
@@ -22,7 +21,6 @@ class ComparisonData:
         self.comparison_attributes = comparison_attributes
         self.repertoire_ids = repertoire_ids
         self.batches = []
-        self.tmp_batch_paths = []
 
     def build_matching_fn(self):
         return lambda repertoire: list(set(zip(*[value for value in repertoire.get_attributes(self.comparison_attributes).values() if value is not None])))
@@ -52,10 +50,22 @@ class ComparisonData:
             repertoire_vector[start: end] = batch[:, 0]
         return repertoire_vector
 
+    def get_repertoire_matrix(self, identifiers: list) -> sparse.csc_matrix:
+        """returns a sparse items x repertoires matrix for the given repertoires, loading each batch once"""
+        matrices = [self.get_batch_matrix(index, identifiers) for index in range(len(self.batches))]
+        return sparse.vstack(matrices, format="csc") if len(matrices) > 0 else sparse.csc_matrix((0, len(identifiers)))
+
+    def get_batch_matrix(self, index: int, identifiers: list) -> sparse.csc_matrix:
+        """returns a sparse items x repertoires matrix of the batch with the given index for the given repertoires"""
+        batch = self.batches[index].load()
+        column_indices = [batch.repertoire_index_mapping[identifier] for identifier in identifiers]
+        return sparse.csc_matrix(batch.get_matrix()[:, column_indices])
+
     def get_item_vector(self, index: int):
         batch_index = int(index / self.sequence_batch_size)
         index_in_batch = index - (batch_index * self.sequence_batch_size)
-        return self.batches[batch_index].get_matrix()[index_in_batch]
+        item_vector = self.batches[batch_index].get_matrix()[index_in_batch]
+        return item_vector.toarray()[0] if sparse.issparse(item_vector) else item_vector
 
     def get_batches(self, columns: list = None, return_dict: bool = False):
         for index in range(len(self.batches)):
@@ -63,127 +73,55 @@ class ComparisonData:
 
     def get_batch(self, index: int, columns: list = None, return_dict: bool = False):
         batch = self.batches[index].load()
-        if columns is not None and not return_dict:
-            column_indices = [self.batches[index].repertoire_index_mapping[col] for col in columns]
-            return batch.get_matrix()[:, column_indices]
-        elif columns is not None:
-            column_indices = [self.batches[index].repertoire_index_mapping[col] for col in columns]
-            matrix = batch.get_matrix()
-            return {col: matrix[:, column_indices[i]] for i, col in enumerate(columns)}
+        matrix = batch.get_matrix()
+        if columns is not None:
+            column_indices = [batch.repertoire_index_mapping[col] for col in columns]
+            matrix = matrix[:, column_indices]
+
+        matrix = matrix.toarray() if sparse.issparse(matrix) else matrix
+
+        if columns is not None and return_dict:
+            return {col: matrix[:, i] for i, col in enumerate(columns)}
         else:
-            return batch.get_matrix()
+            return matrix
 
     @log
     def process_dataset(self, dataset: RepertoireDataset):
         extract_fn = self.build_matching_fn()
         repertoire_count = dataset.get_example_count()
+        repertoire_columns = {str(repertoire_id): column for column, repertoire_id in enumerate(self.repertoire_ids)}
+        item_index, rows, columns = {}, [], []
         for index, repertoire in enumerate(dataset.get_data()):
-            self.process_repertoire(repertoire, str(repertoire.identifier), extract_fn)
+            repertoire_rows = self.process_repertoire(repertoire, extract_fn, item_index)
+            rows.append(repertoire_rows)
+            columns.append(np.full(len(repertoire_rows), repertoire_columns[str(repertoire.identifier)], dtype=np.int64))
             logging.info("Repertoire {} ({}/{}) processed.".format(repertoire.identifier, index+1, repertoire_count))
-            logging.info(f"Currently, there are {self.item_count} items in the comparison data matrix.")
-        self.merge_tmp_batches_to_matrix()
-
-    def merge_tmp_batches_to_matrix(self):
-
-        for index in range(len(self.tmp_batch_paths)):
-
-            batch = self.load_tmp_batch(index)
-            matrix = np.zeros((self.sequence_batch_size, len(self.repertoire_ids)), order='F')
-            items = []
-
-            for item_index, item in enumerate(batch):
-                items.append(item)
-                for repertoire_index, repertoire_id in enumerate(self.repertoire_ids):
-                    if repertoire_id in batch[item]:
-                        matrix[item_index][repertoire_index] = batch[item][repertoire_id]
-
-            df = np.array(matrix[:len(items)], order='F')
-            repertoire_index_mapping = {rep_id: ind for ind, rep_id in enumerate(self.repertoire_ids)}
-
-            comp_data_batch = ComparisonDataBatch(matrix=df, items=items, repertoire_index_mapping=repertoire_index_mapping, path=self.path,
-                                                  identifier=index)
+            logging.info(f"Currently, there are {len(item_index)} items in the comparison data matrix.")
+        self.build_batches(list(item_index.keys()), rows, columns)
+
+    def process_repertoire(self, repertoire, extract_items_fn, item_index: dict) -> np.ndarray:
+        """
+        Extracts the items from the repertoire and returns their rows in the comparison data matrix: the item_index maps all items seen
+        so far to their rows, and the items which were not seen before are added to the index as new rows.
+        """
+        items = extract_items_fn(repertoire)
+        return np.fromiter((item_index.setdefault(item, len(item_index)) for item in items), dtype=np.int64, count=len(items))
+
+    def build_batches(self, items: list, rows: list, columns: list):
+        """
+        Builds the comparison data batches from the items in the order of their rows and from the (row, repertoire column) pairs of items
+        present in repertoires: each batch stores a sparse items x repertoires matrix with sequence_batch_size rows.
+        """
+        self.item_count = len(items)
+        rows = np.concatenate(rows) if len(rows) > 0 else np.array([], dtype=np.int64)
+        columns = np.concatenate(columns) if len(columns) > 0 else np.array([], dtype=np.int64)
+        matrix = sparse.csr_matrix((np.ones(rows.shape[0]), (rows, columns)), shape=(self.item_count, len(self.repertoire_ids)))
+        repertoire_index_mapping = {rep_id: ind for ind, rep_id in enumerate(self.repertoire_ids)}
+
+        for index, start in enumerate(range(0, self.item_count, self.sequence_batch_size)):
+            end = min(start + self.sequence_batch_size, self.item_count)
+            comp_data_batch = ComparisonDataBatch(matrix=matrix[start:end].tocsc(), items=items[start:end],
+                                                  repertoire_index_mapping=repertoire_index_mapping, path=self.path, identifier=index)
             comp_data_batch.store()
 
             self.batches.append(comp_data_batch)
-
-        for path in self.tmp_batch_paths:
-            os.remove(path)
-
-    @log
-    def process_repertoire(self, repertoire, repertoire_id: str, extract_items_fn):
-        items = extract_items_fn(repertoire)
-        new_items = self.filter_existing_items(items, repertoire_id)
-        self.add_items_for_repertoire(new_items, repertoire_id)
-
-    def filter_existing_items(self, items: list, repertoire_id: str) -> list:
-        new_items = items
-        for batch_index, batch in enumerate(self.get_tmp_batches()):
-            new_items = self._remove_existing_items(new_items, batch, batch_index, repertoire_id)
-        return new_items
-
-    def _match_items_to_batch(self, items, batch):
-
-        keep = set(items).difference(batch)
-
-        item_to_update = set(items).intersection(batch)
-        value = np.ones(len(item_to_update), dtype=np.bool_)
-
-        return keep, value, item_to_update
-
-    def _remove_existing_items(self, new_items: list, batch: dict, batch_index: int, repertoire_id: str) -> list:
-
-        update = {"value": [], "index": []}
-
-        new_items_to_keep, update["value"], update["index"] = self._match_items_to_batch(new_items, batch)
-
-        for index, item in enumerate(update["index"]):
-            batch[item][repertoire_id] = update["value"][index]
-
-        self.store_tmp_batch(batch, batch_index)
-
-        return list(new_items_to_keep)
-
-    def store_tmp_batch(self, batch: dict, batch_index: int):
-
-        if len(self.tmp_batch_paths) > batch_index or len(self.tmp_batch_paths) == batch_index:
-            batch_path = self.path / f'tmp_batch_{batch_index}.pickle'
-            with batch_path.open('wb') as file:
-                pickle.dump(batch, file)
-            if len(self.tmp_batch_paths) == batch_index:
-                self.tmp_batch_paths.append(batch_path)
-        else:
-            raise KeyError("ComparisonData: batch_index: {} does not exist. tmp_batches length: {}"
-                           .format(batch_index, len(self.tmp_batch_paths)))
-
-    def get_tmp_batches(self):
-        for i in range(len(self.tmp_batch_paths)):
-            yield self.load_tmp_batch(i)
-
-    def load_tmp_batch(self, batch_index: int) -> dict:
-        if len(self.tmp_batch_paths) > 0 and self.tmp_batch_paths[batch_index].is_file():
-            with self.tmp_batch_paths[batch_index].open("rb") as file:
-                batch = pickle.load(file)
-        else:
-            batch = {}
-        return batch
-
-    def add_items_for_repertoire(self, items: list, repertoire_id: str):
-        last_batch_index = len(self.tmp_batch_paths)-1 if len(self.tmp_batch_paths) > 0 else 0
-        batch = self.load_tmp_batch(last_batch_index)
-
-        self.item_count += len(items)
-
-        item_index = 0
-        while len(batch) < self.sequence_batch_size and item_index < len(items):
-            batch[items[item_index]] = {repertoire_id: 1}
-            item_index += 1
-
-        self.store_tmp_batch(batch, last_batch_index)
-
-        items = items[item_index:]
-
-        while len(items) > 0:
-            batch = {item: {repertoire_id: 1} for item in items[:self.sequence_batch_size]}
-            last_batch_index += 1
-            self.store_tmp_batch(batch, last_batch_index)
-            items = items[self.sequence_batch_size:]
@@ -2,9 +2,10 @@ import logging
 import pickle
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Union
 
 import numpy as np
+from scipy import sparse
 
 from immuneML.util.PathBuilder import PathBuilder
 
@@ -14,7 +15,7 @@ class ComparisonDataBatch:
     """
     Arguments:
 
-        matrix: array with dimension items x repertoires, where items are defined by comparison attributes specified in ComparisonData
+        matrix: array or sparse matrix with dimension items x repertoires, where items are defined by comparison attributes specified in ComparisonData
                 class and can include, for instance, receptor sequences or combinations of receptor sequences and V and J gene
 
         items: the item names extracted from the repertoires in the dataset on which the repertoires are evaluated (e.g. sequences or
@@ -33,11 +34,14 @@ class ComparisonDataBatch:
     repertoire_index_mapping: Dict[str, int]
     path: Path
     identifier: int
-    matrix: np.ndarray = None
+    matrix: Union[np.ndarray, sparse.spmatrix] = None
 
     def store(self):
         PathBuilder.build(self.path)
-        np.save(self.path / f"{self.identifier}.npy", self.matrix)
+        if sparse.issparse(self.matrix):
+            sparse.save_npz(self.path / f"{self.identifier}.npz", self.matrix)
+        else:
+            np.save(self.path / f"{self.identifier}.npy", self.matrix)
 
         np.save(self.path / f"{self.identifier}_items.npy", self.items)
 
@@ -70,7 +74,9 @@ class ComparisonDataBatch:
             return self.items
 
     def get_matrix(self):
-        if self.matrix is None:
+        if self.matrix is None and (self.path / f"{self.identifier}.npz").is_file():
+            return sparse.load_npz(self.path / f"{self.identifier}.npz")
+        elif self.matrix is None:
             return np.load(self.path / f"{self.identifier}.npy", allow_pickle=True)
         else:
             return self.matrix
@@ -1,3 +1,4 @@
+from multiprocessing.pool import Pool
 from pathlib import Path
 
 import numpy as np
@@ -13,11 +14,14 @@ from immuneML.util.PathBuilder import PathBuilder
 class PairwiseRepertoireComparison:
 
     @log
-    def __init__(self, matching_columns: list, item_columns: list, path: Path, sequence_batch_size: int):
+    def __init__(self, matching_columns: list, item_columns: list, path: Path, sequence_batch_size: int, repertoire_batch_size: int = 1000,
+                 number_of_processes: int = 1):
         self.matching_columns = matching_columns
         self.item_columns = item_columns
         self.path = PathBuilder.build(path)
         self.sequence_batch_size = sequence_batch_size
+        self.repertoire_batch_size = repertoire_batch_size
+        self.number_of_processes = number_of_processes
         self.comparison_data = None
         self.comparison_fn = None
 
@@ -35,11 +39,21 @@ class PairwiseRepertoireComparison:
             ("item_attributes", self.item_columns)
         )
 
-    def compare(self, dataset: RepertoireDataset, comparison_fn, comparison_fn_name):
+    def compare(self, dataset: RepertoireDataset, comparison_fn, comparison_fn_name, comparison_matrix_fn=None):
+        """
+        Compares all pairs of repertoires in the dataset: if comparison_matrix_fn is given (a function computing the comparison between
+        all columns of two sparse items x repertoires matrices), the repertoires are compared in blocks (see compare_repertoires_in_blocks()),
+        otherwise comparison_fn is called for each pair of repertoire vectors.
+        """
+        if comparison_matrix_fn is not None:
+            compare_fn = lambda: self.compare_repertoires_in_blocks(dataset, comparison_matrix_fn)
+        else:
+            compare_fn = lambda: self.compare_repertoires(dataset, comparison_fn)
+
         return CacheHandler.memo_by_params((("dataset_identifier", dataset.identifier),
                                             "pairwise_comparison",
                                             ("comparison_fn", comparison_fn_name)),
-                                           lambda: self.compare_repertoires(dataset, comparison_fn))
+                                           compare_fn)
 
     def memo_by_params(self, dataset: RepertoireDataset):
         comparison_data = CacheHandler.memo_by_params(self.prepare_caching_params(dataset), lambda: self.create_comparison_data(dataset))
@@ -63,6 +77,51 @@ class PairwiseRepertoireComparison:
 
         return comparison_df
 
+    @log
+    def compare_repertoires_in_blocks(self, dataset: RepertoireDataset, comparison_matrix_fn):
+        """
+        Splits the repertoires into blocks of repertoire_batch_size repertoires and compares each pair of blocks at once with
+        comparison_matrix_fn on the sparse matrices of the blocks. Each block of the upper triangle (including the diagonal) is computed once
+        on a pool of number_of_processes processes and written to a memory-mapped distance matrix stored at path / distance_matrix.npy.
+        """
+        self.comparison_data = self.memo_by_params(dataset)
+        repertoire_identifiers = dataset.get_repertoire_ids()
+        repertoire_count = len(repertoire_identifiers)
+        result_path = self.path / "distance_matrix.npy"
+        comparison_result = np.lib.format.open_memmap(result_path, mode="w+", dtype=np.float64, shape=(repertoire_count, repertoire_count))
+        del comparison_result
+
+        blocks = [repertoire_identifiers[start: start + self.repertoire_batch_size]
+                  for start in range(0, repertoire_count, self.repertoire_batch_size)]
+        starts = [block_index * self.repertoire_batch_size for block_index in range(len(blocks))]
+        arguments = [(self.comparison_data, blocks, starts, block_index, comparison_matrix_fn, result_path) for block_index in range(len(blocks))]
+
+        if self.number_of_processes > 1 and len(blocks) > 1:
+            with Pool(min(self.number_of_processes, len(blocks))) as pool:
+                pool.starmap(PairwiseRepertoireComparison._compare_block_row, arguments)
+        else:
+            for argument in arguments:
+                PairwiseRepertoireComparison._compare_block_row(*argument)
+
+        comparison_result = np.load(result_path, mmap_mode="r")
+        return pd.DataFrame(comparison_result, columns=repertoire_identifiers, index=repertoire_identifiers)
+
+    @staticmethod
+    def _compare_block_row(comparison_data: ComparisonData, blocks: list, starts: list, block_index: int, comparison_matrix_fn,
+                           result_path: Path):
+        comparison_result = np.load(result_path, mmap_mode="r+")
+        matrix = comparison_data.get_repertoire_matrix(blocks[block_index])
+        start = starts[block_index]
+
+        for other_index in range(block_index, len(blocks)):
+            other_matrix = matrix if other_index == block_index else comparison_data.get_repertoire_matrix(blocks[other_index])
+            other_start = starts[other_index]
+            result = comparison_matrix_fn(matrix, other_matrix)
+            comparison_result[start: start + result.shape[0], other_start: other_start + result.shape[1]] = result
+            comparison_result[other_start: other_start + result.shape[1], start: start + result.shape[0]] = result.T
+
+        comparison_result.flush()
+
     def prepare_paralellization_arguments(self, repertoire_count: int, repertoire_identifiers: list, comparison_result):
 
         arguments = []
@@ -16,3 +16,5 @@ class SimulationState:
     resulting_dataset: Dataset = None
     result_path: Path = None
     name: str = None
+    number_of_processes: int = 1
+    seed: int = None
@@ -1,19 +1,31 @@
-import pickle
 import random
+from multiprocessing.pool import Pool
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 from immuneML.data_model.dataset.ReceptorDataset import ReceptorDataset
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.dataset.SequenceDataset import SequenceDataset
+from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
 from immuneML.data_model.receptor.TCABReceptor import TCABReceptor
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
+from immuneML.data_model.repertoire.Repertoire import Repertoire
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.util.ColumnStoreHelper import ColumnStoreHelper
 from immuneML.util.PathBuilder import PathBuilder
-from immuneML.util.RepertoireBuilder import RepertoireBuilder
 
 
 class RandomDatasetGenerator:
+    """
+    Generates random datasets for benchmarking. The sequence lengths and residues are drawn as integer arrays with a numpy random generator.
+    Each repertoire (for repertoire datasets) or each batch file of file_size examples (for receptor and sequence datasets) gets its own
+    random stream spawned from the seed, so the examples can be generated in parallel and the dataset is the same for a given seed
+    regardless of the number of processes. If the seed is not set, it is drawn from the random module, so random.seed() still makes the
+    generation reproducible.
+    """
 
     @staticmethod
     def _check_probabilities(probabilities_dict, key_type, dict_name):
@@ -51,7 +63,7 @@ class RandomDatasetGenerator:
 
     @staticmethod
     def generate_repertoire_dataset(repertoire_count: int, sequence_count_probabilities: dict, sequence_length_probabilities: dict,
-                                    labels: dict, path: Path) -> RepertoireDataset:
+                                    labels: dict, path: Path, number_of_processes: int = 1, seed: int = None) -> RepertoireDataset:
         """
         Creates repertoire_count repertoires where the number of sequences per repertoire is sampled from the probability distribution given
         in sequence_count_probabilities. The length of sequences is sampled independently for each sequence from
@@ -59,6 +71,8 @@ class RandomDatasetGenerator:
         labels. In this case, labels are multi-class, so each repertoire will get at one class from each label. This means that negative
         classes for the labels should be included as well in the specification.
 
+        The repertoires are generated in parallel using number_of_processes processes and are stored directly in the columnar format.
+
         An example of input parameters is given below:
         repertoire_count: 100 # generate 100 repertoires
         sequence_count_probabilities:
@@ -78,25 +92,47 @@ class RandomDatasetGenerator:
         RandomDatasetGenerator._check_rep_dataset_generation_params(repertoire_count, sequence_count_probabilities, sequence_length_probabilities,
                                                                     labels, path)
 
-        alphabet = EnvironmentSettings.get_sequence_alphabet()
+        alphabet = "".join(EnvironmentSettings.get_sequence_alphabet())
         PathBuilder.build(path)
+        repertoires_path = PathBuilder.build(path / "repertoires")
 
-        sequences = [["".join(random.choices(alphabet,
-                                             k=random.choices(list(sequence_length_probabilities.keys()), sequence_length_probabilities.values())[0]))
-                      for seq_count in range(random.choices(list(sequence_count_probabilities.keys()), sequence_count_probabilities.values())[0])]
-                     for rep in range(repertoire_count)]
+        seed_sequence = RandomDatasetGenerator._make_seed_sequence(seed)
+        rng = np.random.default_rng(seed_sequence)
 
-        if labels is not None:
-            processed_labels = {label: random.choices(list(labels[label].keys()), labels[label].values(), k=repertoire_count) for label in labels}
-            dataset_params = {label: list(labels[label].keys()) for label in labels}
-        else:
-            processed_labels = None
-            dataset_params = None
+        sequence_counts = RandomDatasetGenerator._choose(rng, sequence_count_probabilities, repertoire_count)
+        processed_labels = {label: RandomDatasetGenerator._choose(rng, labels[label], repertoire_count) for label in labels} \
+            if labels is not None else {}
+        subject_ids = [f"rep_{index}" for index in range(repertoire_count)]
+
+        arguments = [(index, repertoire_seed, sequence_counts[index], sequence_length_probabilities, alphabet,
+                      {**{label: processed_labels[label][index] for label in processed_labels}, "subject_id": subject_ids[index]},
+                      repertoires_path)
+                     for index, repertoire_seed in enumerate(seed_sequence.spawn(repertoire_count))]
+
+        with Pool(number_of_processes) as pool:
+            repertoires = pool.starmap(RandomDatasetGenerator._generate_repertoire, arguments)
 
-        repertoires, metadata = RepertoireBuilder.build(sequences=sequences, path=path, labels=processed_labels)
-        dataset = RepertoireDataset(labels=dataset_params, repertoires=repertoires, metadata_file=metadata)
+        metadata_filename = path / "metadata.csv"
+        pd.DataFrame({"filename": [repertoire.data_filename for repertoire in repertoires], "subject_id": subject_ids,
+                      "repertoire_identifier": [repertoire.identifier for repertoire in repertoires], **processed_labels})\
+            .to_csv(metadata_filename, index=False)
 
-        return dataset
+        dataset_params = {label: list(labels[label].keys()) for label in labels} if labels is not None else None
+
+        return RepertoireDataset(labels=dataset_params, repertoires=repertoires, metadata_file=metadata_filename)
+
+    @staticmethod
+    def _generate_repertoire(index: int, seed_sequence: np.random.SeedSequence, sequence_count: int, sequence_length_probabilities: dict,
+                             alphabet: str, metadata: dict, path: Path) -> Repertoire:
+        rng = np.random.default_rng(seed_sequence)
+        sequence_aas = RandomDatasetGenerator._generate_sequences(rng, sequence_count, sequence_length_probabilities, alphabet)
+
+        return Repertoire.build(sequence_aas=sequence_aas, v_subgroups=["TRBV1"] * sequence_count, v_genes=["TRBV1-1"] * sequence_count,
+                                v_alleles=["TRBV1-1*01"] * sequence_count, j_subgroups=["TRBJ1"] * sequence_count,
+                                j_genes=["TRBJ1-1"] * sequence_count, j_alleles=["TRBJ1-1*01"] * sequence_count, counts=[1] * sequence_count,
+                                chains=["TRB"] * sequence_count, region_types=["IMGT_CDR3"] * sequence_count,
+                                sequence_identifiers=[str(sequence_index) for sequence_index in range(sequence_count)], path=path,
+                                metadata=metadata, filename_base=f"rep_{index}")
 
     @staticmethod
     def _check_receptor_dataset_generation_params(receptor_count: int, chain_1_length_probabilities: dict,
@@ -110,7 +146,7 @@ class RandomDatasetGenerator:
 
     @staticmethod
     def generate_receptor_dataset(receptor_count: int, chain_1_length_probabilities: dict, chain_2_length_probabilities: dict, labels: dict,
-                                  path: Path):
+                                  path: Path, file_size: int = 50000, number_of_processes: int = 1, seed: int = None):
         """
         Creates receptor_count receptors where the length of sequences in each chain is sampled independently for each sequence from
         chain_n_length_probabilities distribution. The labels are also randomly assigned to receptors from the distribution given in
@@ -118,6 +154,8 @@ class RandomDatasetGenerator:
         classes for the labels should be included as well in the specification. chain 1 and 2 in this case refer to alpha and beta
         chain of a T-cell receptor.
 
+        The receptors are stored in batch files of file_size receptors, which are generated in parallel using number_of_processes processes.
+
         An example of input parameters is given below:
 
         receptor_count: 100 # generate 100 TRABReceptors
@@ -137,35 +175,30 @@ class RandomDatasetGenerator:
         """
         RandomDatasetGenerator._check_receptor_dataset_generation_params(receptor_count, chain_1_length_probabilities,
                                                                          chain_2_length_probabilities, labels, path)
+        RandomDatasetGenerator._check_example_count(file_size, "file_size")
 
-        alphabet = EnvironmentSettings.get_sequence_alphabet()
-        PathBuilder.build(path)
-
-        get_random_sequence = lambda proba, chain, id: ReceptorSequence("".join(random.choices(alphabet, k=random.choices(list(proba.keys()),
-                                                                                                                          proba.values())[0])),
-                                                                        metadata=SequenceMetadata(count=1,
-                                                                                                  v_subgroup=chain + "V1",
-                                                                                                  v_gene=chain + "V1-1",
-                                                                                                  v_allele=chain + "V1-1*01",
-                                                                                                  j_subgroup=chain + "J1",
-                                                                                                  j_gene=chain + "J1-1",
-                                                                                                  j_allele=chain + "J1-1*01",
-                                                                                                  chain=chain,
-                                                                                                  cell_id=id))
-
-        receptors = [TCABReceptor(alpha=get_random_sequence(chain_1_length_probabilities, "TRA", i),
-                                  beta=get_random_sequence(chain_2_length_probabilities, "TRB", i),
-                                  metadata={**{label: random.choices(list(label_dict.keys()), label_dict.values(), k=1)[0]
-                                               for label, label_dict in labels.items()}, **{"subject": f"subj_{i + 1}"}})
-                     for i in range(receptor_count)]
-
-        filename = path / "batch01.pickle"
-
-        with filename.open("wb") as file:
-            pickle.dump(receptors, file)
+        filenames = RandomDatasetGenerator._generate_batches(RandomDatasetGenerator._generate_receptor_batch, receptor_count, file_size,
+                                                             (chain_1_length_probabilities, chain_2_length_probabilities, labels), path,
+                                                             number_of_processes, seed)
 
         return ReceptorDataset(labels={label: list(label_dict.keys()) for label, label_dict in labels.items()},
-                               filenames=[filename], file_size=receptor_count)
+                               filenames=filenames, file_size=file_size)
+
+    @staticmethod
+    def _generate_receptor_batch(filename: Path, seed_sequence: np.random.SeedSequence, start: int, receptor_count: int, alphabet: str,
+                                 chain_1_length_probabilities: dict, chain_2_length_probabilities: dict, labels: dict) -> Path:
+        rng = np.random.default_rng(seed_sequence)
+        alpha_sequences = RandomDatasetGenerator._generate_sequences(rng, receptor_count, chain_1_length_probabilities, alphabet)
+        beta_sequences = RandomDatasetGenerator._generate_sequences(rng, receptor_count, chain_2_length_probabilities, alphabet)
+        label_values = {label: RandomDatasetGenerator._choose(rng, label_dict, receptor_count) for label, label_dict in labels.items()}
+
+        receptors = [TCABReceptor(alpha=RandomDatasetGenerator._make_sequence(alpha_sequences[index], "TRA", cell_id=start + index),
+                                  beta=RandomDatasetGenerator._make_sequence(beta_sequences[index], "TRB", cell_id=start + index),
+                                  metadata={**{label: values[index] for label, values in label_values.items()},
+                                            **{"subject": f"subj_{start + index + 1}"}})
+                     for index in range(receptor_count)]
+
+        return RandomDatasetGenerator._store_batch(receptors, filename)
 
     @staticmethod
     def _check_sequence_dataset_generation_params(receptor_count: int, length_probabilities: dict, labels: dict, path: Path):
@@ -175,13 +208,16 @@ class RandomDatasetGenerator:
         RandomDatasetGenerator._check_path(path)
 
     @staticmethod
-    def generate_sequence_dataset(sequence_count: int, length_probabilities: dict, labels: dict, path: Path):
+    def generate_sequence_dataset(sequence_count: int, length_probabilities: dict, labels: dict, path: Path, file_size: int = 50000,
+                                  number_of_processes: int = 1, seed: int = None):
         """
         Creates sequence_count receptor sequences (single chain) where the length of sequences in each chain is sampled independently for each sequence from
         length_probabilities distribution. The labels are also randomly assigned to sequences from the distribution given in
         labels. In this case, labels are multi-class, so each sequences will get one class from each label. This means that negative
         classes for the labels should be included as well in the specification.
 
+        The sequences are stored in batch files of file_size sequences, which are generated in parallel using number_of_processes processes.
+
         An example of input parameters is given below:
 
         sequence_count: 100 # generate 100 TRB ReceptorSequences
@@ -197,30 +233,76 @@ class RandomDatasetGenerator:
                 0: 0.7 # 70% of the generated receptors will have class 0
         """
         RandomDatasetGenerator._check_sequence_dataset_generation_params(sequence_count, length_probabilities, labels, path)
+        RandomDatasetGenerator._check_example_count(file_size, "file_size")
 
-        alphabet = EnvironmentSettings.get_sequence_alphabet()
+        filenames = RandomDatasetGenerator._generate_batches(RandomDatasetGenerator._generate_sequence_batch, sequence_count, file_size,
+                                                             (length_probabilities, labels), path, number_of_processes, seed)
+
+        return SequenceDataset(labels={label: list(label_dict.keys()) for label, label_dict in labels.items()},
+                               filenames=filenames, file_size=file_size)
+
+    @staticmethod
+    def _generate_sequence_batch(filename: Path, seed_sequence: np.random.SeedSequence, start: int, sequence_count: int, alphabet: str,
+                                 length_probabilities: dict, labels: dict) -> Path:
+        rng = np.random.default_rng(seed_sequence)
+        sequence_aas = RandomDatasetGenerator._generate_sequences(rng, sequence_count, length_probabilities, alphabet)
+        label_values = {label: RandomDatasetGenerator._choose(rng, label_dict, sequence_count) for label, label_dict in labels.items()}
+
+        sequences = [RandomDatasetGenerator._make_sequence(sequence_aas[index], "TRB",
+                                                           custom_params={**{label: values[index] for label, values in label_values.items()},
+                                                                          **{"subject": f"subj_{start + index + 1}"}})
+                     for index in range(sequence_count)]
+
+        return RandomDatasetGenerator._store_batch(sequences, filename)
+
+    @staticmethod
+    def _generate_batches(generate_batch, example_count: int, file_size: int, generation_params: tuple, path: Path,
+                          number_of_processes: int, seed: int) -> list:
+        alphabet = "".join(EnvironmentSettings.get_sequence_alphabet())
         PathBuilder.build(path)
 
-        chain = "TRB"
+        starts = list(range(0, example_count, file_size))
+        seed_sequences = RandomDatasetGenerator._make_seed_sequence(seed).spawn(len(starts))
 
-        sequences = [
-            ReceptorSequence("".join(random.choices(alphabet, k=random.choices(list(length_probabilities.keys()), length_probabilities.values())[0])),
-                             metadata=SequenceMetadata(count=1,
-                                                       v_subgroup=chain + "V1",
-                                                       v_gene=chain + "V1-1",
-                                                       v_allele=chain + "V1-1*01",
-                                                       j_subgroup=chain + "J1",
-                                                       j_gene=chain + "J1-1",
-                                                       j_allele=chain + "J1-1*01",
-                                                       chain=chain,
-                                                       custom_params={**{label: random.choices(list(label_dict.keys()), label_dict.values(), k=1)[0]
-                                                                         for label, label_dict in labels.items()}, **{"subject": f"subj_{i + 1}"}}))
-            for i in range(sequence_count)]
+        arguments = [(path / f"batch{index + 1:02d}{ColumnStoreHelper.FILE_EXTENSION}", seed_sequences[index], start, min(file_size, example_count - start), alphabet,
+                      *generation_params)
+                     for index, start in enumerate(starts)]
 
-        filename = path / "batch01.pickle"
+        with Pool(number_of_processes) as pool:
+            return pool.starmap(generate_batch, arguments)
 
-        with filename.open("wb") as file:
-            pickle.dump(sequences, file)
+    @staticmethod
+    def _store_batch(examples: list, filename: Path) -> Path:
+        ElementGenerator.store_elements(filename, examples)
+        return filename
 
-        return SequenceDataset(labels={label: list(label_dict.keys()) for label, label_dict in labels.items()},
-                               filenames=[filename], file_size=sequence_count)
+    @staticmethod
+    def _make_sequence(sequence_aa: str, chain: str, cell_id: int = None, custom_params: dict = None) -> ReceptorSequence:
+        return ReceptorSequence(sequence_aa, metadata=SequenceMetadata(count=1, v_subgroup=chain + "V1", v_gene=chain + "V1-1",
+                                                                       v_allele=chain + "V1-1*01", j_subgroup=chain + "J1",
+                                                                       j_gene=chain + "J1-1", j_allele=chain + "J1-1*01", chain=chain,
+                                                                       cell_id=cell_id, custom_params=custom_params))
+
+    @staticmethod
+    def _make_seed_sequence(seed: int = None) -> np.random.SeedSequence:
+        return np.random.SeedSequence(seed if seed is not None else random.getrandbits(128))
+
+    @staticmethod
+    def _choose_indices(rng: np.random.Generator, probabilities: dict, size: int) -> np.ndarray:
+        p = np.array(list(probabilities.values()), dtype=float)
+        return rng.choice(len(p), size=size, p=p / p.sum())
+
+    @staticmethod
+    def _choose(rng: np.random.Generator, probabilities: dict, size: int) -> list:
+        """Draws size keys of the probabilities dict keeping their original types (e.g., bool, int or str)"""
+        values = list(probabilities.keys())
+        return [values[index] for index in RandomDatasetGenerator._choose_indices(rng, probabilities, size)]
+
+    @staticmethod
+    def _generate_sequences(rng: np.random.Generator, sequence_count: int, length_probabilities: dict, alphabet: str) -> list:
+        """Draws all sequence lengths and residues at once and slices the sequences out of one string of all residues"""
+        lengths = np.array(list(length_probabilities.keys()), dtype=int)[RandomDatasetGenerator._choose_indices(rng, length_probabilities, sequence_count)]
+        residues = np.frombuffer(alphabet.encode(), dtype=np.uint8)[rng.integers(len(alphabet), size=lengths.sum())]
+        text = residues.tobytes().decode()
+        ends = np.cumsum(lengths).tolist()
+        return [text[end - length:end] for end, length in zip(ends, lengths.tolist())]
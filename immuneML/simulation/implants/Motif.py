@@ -100,6 +100,17 @@ class Motif:
 
             return self.instantiation.instantiate_motif(self.seed_chain1 if chain_name == self.name_chain1 else self.seed_chain2)
 
+    def instantiate_motifs(self, count: int, chain_name: Chain = None) -> list:
+        """
+        Creates count motif instances in the same way as instantiate_motif(); if the seed parameter is defined, the instantiation strategy
+        creates all instances at once
+        """
+        assert self.instantiation is not None, "Motif: set instantiation strategy before instantiating a motif."
+        if self.seed is not None:
+            return self.instantiation.instantiate_motifs(self.seed, count)
+        else:
+            return [self.instantiate_motif(chain_name) for _ in range(count)]
+
     def get_max_length(self):
         if self.seed is not None:
             return len(self.seed.replace("/", "")) + self.instantiation.get_max_gap()
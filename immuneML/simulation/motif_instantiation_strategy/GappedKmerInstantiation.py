@@ -1,4 +1,5 @@
 import random
+from typing import List
 
 import numpy as np
 
@@ -102,6 +103,33 @@ class GappedKmerInstantiation(MotifInstantiationStrategy):
 
         return MotifInstance(instance, gap_size)
 
+    def instantiate_motifs(self, base, count: int) -> List[MotifInstance]:
+        """
+        Creates count motif instances in the same way as instantiate_motif(), but draws the gap sizes, the numbers of substitutions and all
+        substituted positions and letters at once instead of once per instance.
+        """
+        allowed_positions = [position for position in range(len(base)) if base[position] != "/"]
+        self.position_weights = self.set_default_weights(self.position_weights, allowed_positions)
+
+        gap_sizes = np.random.choice(range(self._min_gap, self._max_gap + 1), size=count)
+        instances = [list(base) for _ in range(count)]
+
+        if self._hamming_distance_probabilities:
+            substitution_counts = np.random.choice(self._prepare_keys(self._hamming_distance_probabilities), size=count,
+                                                   p=self._prepare_probabilities(self._hamming_distance_probabilities))
+            allowed_position_weights = {key: value for key, value in self.position_weights.items() if key in allowed_positions}
+            positions = np.random.choice(allowed_positions, size=substitution_counts.sum(),
+                                         p=self._prepare_probabilities(allowed_position_weights))
+            letters = np.random.choice(self._prepare_keys(self.alphabet_weights), size=substitution_counts.sum(),
+                                       p=self._prepare_probabilities(self.alphabet_weights))
+
+            instance_indices = np.repeat(np.arange(count), substitution_counts)
+            for instance_index, position, letter in zip(instance_indices, positions, letters):
+                if self.position_weights[position] > 0:  # if the position is allowed to be changed
+                    instances[instance_index][position] = letter
+
+        return [MotifInstance("".join(instance), int(gap_size)) for instance, gap_size in zip(instances, gap_sizes)]
+
     def _substitute_letters(self, position_weights, alphabet_weights, allowed_positions: list, instance: list):
 
         if self._hamming_distance_probabilities:
@@ -1,4 +1,5 @@
 import abc
+from typing import List
 
 from immuneML.simulation.implants.MotifInstance import MotifInstance
 
@@ -9,6 +10,10 @@ class MotifInstantiationStrategy(metaclass=abc.ABCMeta):
     def instantiate_motif(self, base) -> MotifInstance:
         pass
 
+    def instantiate_motifs(self, base, count: int) -> List[MotifInstance]:
+        """Creates count motif instances from the base; strategies can override it to instantiate the motifs in batch"""
+        return [self.instantiate_motif(base) for _ in range(count)]
+
     @abc.abstractmethod
     def get_max_gap(self) -> int:
         pass
@@ -1,4 +1,5 @@
 import copy
+from typing import List, Tuple
 
 import numpy as np
 
@@ -22,6 +23,32 @@ class GappedMotifImplanting(SequenceImplantingStrategy):
         new_sequence = self._build_new_sequence(sequence, implant_position, signal)
         return new_sequence
 
+    def implant_in_sequences(self, sequences: list, motif_instances: List[MotifInstance], sequence_position_weights=None) -> Tuple[list, list]:
+        """
+        Implants each motif instance in the sequence string at the same index in the same way as implant(); the position weights are computed
+        once per combination of sequence length and motif instance length, and the positions for all such sequences are drawn at once.
+        """
+        new_sequences, positions = list(sequences), [None] * len(sequences)
+        groups = {}
+        for index, (sequence, motif_instance) in enumerate(zip(sequences, motif_instances)):
+            limit = len(motif_instance.instance) - motif_instance.instance.count("/") + motif_instance.gap - 1
+            assert len(sequence) >= motif_instance.gap + len(motif_instance.instance) - 1, \
+                "The motif instance is longer than receptor_sequence length. Remove the receptor_sequence from the repertoire or reduce max gap " \
+                "length to be able to proceed. "
+            groups.setdefault((len(sequence), limit), []).append(index)
+
+        for (length, limit), indices in groups.items():
+            imgt_positions = PositionHelper.gen_imgt_positions_from_length(length)
+            position_weights = PositionHelper.build_position_weights(sequence_position_weights, imgt_positions, limit)
+            imgt_implant_positions = np.random.choice(list(position_weights.keys()), size=len(indices), p=list(position_weights.values()))
+            first_indices = {imgt_position: position for position, imgt_position in reversed(list(enumerate(imgt_positions)))}
+
+            for index, imgt_implant_position in zip(indices, imgt_implant_positions):
+                positions[index] = first_indices[imgt_implant_position]
+                new_sequences[index] = self._splice(sequences[index], positions[index], motif_instances[index])
+
+        return new_sequences, positions
+
     def _build_imgt_positions(self, sequence: ReceptorSequence, motif_instance: MotifInstance):
         assert len(sequence.get_sequence()) >= motif_instance.gap + len(motif_instance.instance) - 1, \
             "The motif instance is longer than receptor_sequence length. Remove the receptor_sequence from the repertoire or reduce max gap length " \
@@ -37,20 +64,7 @@ class GappedMotifImplanting(SequenceImplantingStrategy):
 
     def _build_new_sequence(self, sequence: ReceptorSequence, position, signal: dict) -> ReceptorSequence:
 
-        gap_length = signal["motif_instance"].gap
-        if "/" in signal["motif_instance"].instance:
-            motif_left, motif_right = signal["motif_instance"].instance.split("/")
-        else:
-            motif_left = signal["motif_instance"].instance
-            motif_right = ""
-
-        gap_start = position+len(motif_left)
-        gap_end = gap_start+gap_length
-        part1 = sequence.get_sequence()[:position]
-        part2 = sequence.get_sequence()[gap_start:gap_end]
-        part3 = sequence.get_sequence()[gap_end+len(motif_right):]
-
-        new_sequence_string = part1 + motif_left + part2 + motif_right + part3
+        new_sequence_string = self._splice(sequence.get_sequence(), position, signal["motif_instance"])
 
         annotation = SequenceAnnotation()
         implant = ImplantAnnotation(signal_id=signal["signal_id"],
@@ -65,3 +79,19 @@ class GappedMotifImplanting(SequenceImplantingStrategy):
         new_sequence.set_sequence(new_sequence_string, EnvironmentSettings.get_sequence_type())
 
         return new_sequence
+
+    def _splice(self, sequence: str, position: int, motif_instance: MotifInstance) -> str:
+        gap_length = motif_instance.gap
+        if "/" in motif_instance.instance:
+            motif_left, motif_right = motif_instance.instance.split("/")
+        else:
+            motif_left = motif_instance.instance
+            motif_right = ""
+
+        gap_start = position+len(motif_left)
+        gap_end = gap_start+gap_length
+        part1 = sequence[:position]
+        part2 = sequence[gap_start:gap_end]
+        part3 = sequence[gap_end+len(motif_right):]
+
+        return part1 + motif_left + part2 + motif_right + part3
@@ -1,6 +1,9 @@
 import abc
+from typing import List, Tuple
 
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.simulation.implants.MotifInstance import MotifInstance
 
 
 class SequenceImplantingStrategy(metaclass=abc.ABCMeta):
@@ -8,3 +11,21 @@ class SequenceImplantingStrategy(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def implant(self, sequence: ReceptorSequence, signal: dict, sequence_position_weights) -> ReceptorSequence:
         pass
+
+    def implant_in_sequences(self, sequences: list, motif_instances: List[MotifInstance], sequence_position_weights=None) -> Tuple[list, list]:
+        """
+        Implants each motif instance in the sequence string at the same index; strategies can override it to implant in all sequences at once
+
+        Returns:
+            the new sequence strings and the positions where the motif instances were implanted
+        """
+        new_sequences, positions = [], []
+        for sequence_string, motif_instance in zip(sequences, motif_instances):
+            sequence = ReceptorSequence()
+            sequence.set_sequence(sequence_string, EnvironmentSettings.get_sequence_type())
+            new_sequence = self.implant(sequence, {"signal_id": None, "motif_id": None, "motif_instance": motif_instance},
+                                        sequence_position_weights)
+            new_sequences.append(new_sequence.get_sequence())
+            positions.append(new_sequence.annotation.implants[0].position)
+
+        return new_sequences, positions
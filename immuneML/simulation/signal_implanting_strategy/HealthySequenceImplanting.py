@@ -1,9 +1,13 @@
 import copy
 import logging
-import random
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 from immuneML.data_model.repertoire.Repertoire import Repertoire
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.simulation.implants.ImplantAnnotation import ImplantAnnotation
 from immuneML.simulation.sequence_implanting.SequenceImplantingStrategy import SequenceImplantingStrategy
 from immuneML.simulation.signal_implanting_strategy.ImplantingComputation import ImplantingComputation, get_implanting_function
 from immuneML.simulation.signal_implanting_strategy.SignalImplantingStrategy import SignalImplantingStrategy
@@ -66,16 +70,31 @@ class HealthySequenceImplanting(SignalImplantingStrategy):
         self.compute_implanting = get_implanting_function(implanting_computation)
 
     def implant_in_repertoire(self, repertoire: Repertoire, repertoire_implanting_rate: float, signal, path: Path) -> Repertoire:
+        assert self.sequence_implanting_strategy is not None, \
+            "HealthySequenceImplanting: add receptor_sequence implanting strategy when creating a HealthySequenceImplanting object."
+
+        columns = repertoire.get_attributes(repertoire.get_field_names())
+        sequence_field = EnvironmentSettings.get_sequence_type().value
         max_motif_length = self._calculate_max_motif_length(signal)
-        sequences_to_be_processed, other_sequences = self._choose_sequences_for_implanting(repertoire,
-                                                                                           repertoire_implanting_rate,
-                                                                                           max_motif_length)
-        processed_sequences = self._implant_in_sequences(sequences_to_be_processed, signal)
-        sequences = other_sequences + processed_sequences
+        indices = self._choose_sequences_for_implanting(repertoire, columns, sequence_field, repertoire_implanting_rate, max_motif_length)
+
+        motifs, motif_instances = self._instantiate_motifs(signal, len(indices))
+        new_sequences, positions = self.sequence_implanting_strategy.implant_in_sequences(columns[sequence_field][indices].tolist(),
+                                                                                          motif_instances, self.sequence_position_weights)
+
+        sequences = columns[sequence_field].astype(object)
+        sequences[indices] = new_sequences
+        implants = np.full(len(sequences), None, dtype=object)
+        implants[indices] = [str(ImplantAnnotation(signal_id=signal.id, motif_id=motif.identifier, motif_instance=motif_instance,
+                                                   position=position))
+                             for motif, motif_instance, position in zip(motifs, motif_instances, positions)]
+
+        # when adding implant to a repertoire, only signal id is stored in repertoire metadata:
+        # more detailed information is available in the signal column (specific motif, motif instance and position per sequence)
+        columns = {**columns, sequence_field: sequences, signal.id: implants}
         metadata = self._build_new_metadata(repertoire.metadata, signal)
-        new_repertoire = self._build_new_repertoire(sequences, metadata, signal, path)
 
-        return new_repertoire
+        return Repertoire.build_from_columns(columns, path, metadata)
 
     def _build_new_metadata(self, metadata: dict, signal) -> dict:
         new_metadata = copy.deepcopy(metadata) if metadata is not None else {}
@@ -86,58 +105,45 @@ class HealthySequenceImplanting(SignalImplantingStrategy):
         max_motif_length = max([motif.get_max_length() for motif in signal.motifs])
         return max_motif_length
 
-    def _build_new_repertoire(self, sequences, repertoire_metadata, signal, path: Path) -> Repertoire:
-        if repertoire_metadata is not None:
-            metadata = copy.deepcopy(repertoire_metadata)
-        else:
-            metadata = {}
-
-        # when adding implant to a repertoire, only signal id is stored:
-        # more detailed information is available in each receptor_sequence
-        # (specific motif and motif instance)
-        metadata[signal.id] = True
-        repertoire = Repertoire.build_from_sequence_objects(sequences, path, metadata)
-
-        return repertoire
-
-    def _implant_in_sequences(self, sequences_to_be_processed: list, signal):
-        assert self.sequence_implanting_strategy is not None, \
-            "HealthySequenceImplanting: add receptor_sequence implanting strategy when creating a HealthySequenceImplanting object."
-
-        sequences = []
-        for sequence in sequences_to_be_processed:
-            processed_sequence = self.implant_in_sequence(sequence, signal)
-            sequences.append(processed_sequence)
-
-        return sequences
-
-    def _choose_sequences_for_implanting(self, repertoire: Repertoire, repertoire_implanting_rate: float, max_motif_length: int):
-        number_of_sequences_to_implant = self.compute_implanting(repertoire_implanting_rate * len(repertoire.sequences))
+    def _instantiate_motifs(self, signal, count: int):
+        """chooses a motif of the signal for each of the count sequences and instantiates all instances of the same motif at once"""
+        motif_indices = np.random.choice(len(signal.motifs), size=count)
+        motifs, motif_instances = [None] * count, [None] * count
+        for motif_index in np.unique(motif_indices):
+            sequence_indices = np.flatnonzero(motif_indices == motif_index)
+            for sequence_index, motif_instance in zip(sequence_indices, signal.motifs[motif_index].instantiate_motifs(len(sequence_indices))):
+                motifs[sequence_index] = signal.motifs[motif_index]
+                motif_instances[sequence_index] = motif_instance
+
+        return motifs, motif_instances
+
+    def _choose_sequences_for_implanting(self, repertoire: Repertoire, columns: dict, sequence_field: str, repertoire_implanting_rate: float,
+                                         max_motif_length: int) -> np.ndarray:
+        sequence_count = repertoire.get_element_count()
+        number_of_sequences_to_implant = self.compute_implanting(repertoire_implanting_rate * sequence_count)
         if number_of_sequences_to_implant == 0:
-            logging.warning(f"HealthySequenceImplanting: there are {len(repertoire.sequences)} sequences in repertoire {repertoire.identifier} "
+            logging.warning(f"HealthySequenceImplanting: there are {sequence_count} sequences in repertoire {repertoire.identifier} "
                             f"for the given repertoire implanting rate of {repertoire_implanting_rate}; no motif will be implanted. To implant "
                             f"motifs, increase 'repertoire_implanting_rate' in the specification.")
-        unusable_sequences = []
-        unprocessed_sequences = []
-
-        for sequence in repertoire.sequences:
-            if sequence.annotation is not None and sequence.annotation.implants is not None and len(sequence.annotation.implants) > 0:
-                unusable_sequences.append(sequence)
-            elif len(sequence.get_sequence()) < max_motif_length:
-                unusable_sequences.append(sequence)
-            else:
-                unprocessed_sequences.append(sequence)
-
-        assert number_of_sequences_to_implant <= len(unprocessed_sequences), \
+
+        # sequences which already have an implant (stored in a column per signal implanted in the repertoire, with the signal id as the
+        # column name and key in repertoire metadata) or are too short for the motif cannot be used
+        usable = pd.Series(columns[sequence_field], dtype=object).str.len().fillna(0).to_numpy() >= max_motif_length
+        for field in self._get_implanted_signal_fields(repertoire, columns):
+            usable &= pd.isna(pd.Series(columns[field], dtype=object)).to_numpy()
+
+        unprocessed_indices = np.flatnonzero(usable)
+
+        assert number_of_sequences_to_implant <= len(unprocessed_indices), \
             "HealthySequenceImplanting: there are not enough sequences in the repertoire to provide given repertoire infection rate. " \
-            f"Reduce repertoire infection rate to proceed. Total unprocessed sequences: {len(unprocessed_sequences)}, " \
+            f"Reduce repertoire infection rate to proceed. Total unprocessed sequences: {len(unprocessed_indices)}, " \
             f"number of sequences to implant: {number_of_sequences_to_implant}."
 
-        random.shuffle(unprocessed_sequences)
-        sequences_to_be_infected = unprocessed_sequences[:number_of_sequences_to_implant]
-        other_sequences = unusable_sequences + unprocessed_sequences[number_of_sequences_to_implant:]
+        return np.sort(np.random.choice(unprocessed_indices, size=number_of_sequences_to_implant, replace=False))
 
-        return sequences_to_be_infected, other_sequences
+    def _get_implanted_signal_fields(self, repertoire: Repertoire, columns: dict) -> list:
+        metadata = repertoire.metadata if repertoire.metadata is not None else {}
+        return [field for field, value in metadata.items() if value is True and field in columns and field not in Repertoire.FIELDS]
 
     def implant_in_receptor(self, receptor, signal, is_noise: bool):
         raise RuntimeError("HealthySequenceImplanting was called on a receptor object. Check the simulation parameters.")
@@ -10,10 +10,15 @@ class ImplantingComputation(Enum):
 
 
 def get_implanting_function(implanting_computation: ImplantingComputation):
+    # module-level functions instead of lambdas, so that implanting strategies can be sent to worker processes
     if implanting_computation == ImplantingComputation.ROUND:
-        return lambda product: round(product)
+        return round
     elif implanting_computation == ImplantingComputation.POISSON:
-        return lambda l: np.random.poisson(l)
+        return sample_poisson
     else:
         raise RuntimeError(f"{ImplantingComputation.__name__}: invalid implanting computation specified: {implanting_computation}. "
-                           f"Valid values are: {[el.name.lower() for el in ImplantingComputation]}")
\ No newline at end of file
+                           f"Valid values are: {[el.name.lower() for el in ImplantingComputation]}")
+
+
+def sample_poisson(lam: float) -> int:
+    return np.random.poisson(lam)
@@ -0,0 +1,240 @@
+import importlib
+import os
+import struct
+import zipfile
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+
+
+class ColumnStoreHelper:
+    """
+    Stores a set of equally long columns in a single uncompressed numpy archive (.npz) with one member per column so that each column can
+    be read (and memory-mapped) independently of the others:
+
+        - columns with fixed-width values (strings, integers, floats, booleans) are stored as typed arrays, strings as fixed-width unicode,
+        - columns listed as categorical (e.g. genes or chains) are stored as `<column>.categories` with unique values and `<column>.codes`
+          with the smallest unsigned integer type that can index them,
+        - missing values (None) are stored as a boolean mask `<column>.null` next to the column and restored on read,
+        - columns with mixed or non-primitive values fall back to object arrays which have to be unpickled on read.
+
+    Enum values are stored by their value (e.g. Chain.ALPHA is stored as "TRA"); if all values of a column are members of the same enum,
+    the enum class is stored as `<column>.enum` and the values are converted back to enum members on read.
+    """
+
+    CODES_SUFFIX = ".codes"
+    CATEGORIES_SUFFIX = ".categories"
+    NULL_SUFFIX = ".null"
+    ENUM_SUFFIX = ".enum"
+    FILE_EXTENSION = ".npz"
+
+    @staticmethod
+    def write(path: Path, columns: dict, categorical_columns: tuple = ()):
+        members = {}
+        for name, values in columns.items():
+            members.update(ColumnStoreHelper._make_members(name, values, name in categorical_columns))
+
+        with ColumnStoreHelper._replace_on_close(path) as tmp_path, tmp_path.open("wb") as file:
+            np.savez(file, **members)
+
+        return path
+
+    @staticmethod
+    def write_incrementally(path: Path, columns, categorical_columns: tuple = ()):
+        """
+        Stores the columns in the same format as write(), but takes an iterable of (name, values) pairs and writes each column to the archive
+        before the next one is requested, so only one column has to be in memory at a time.
+        """
+        with ColumnStoreHelper._replace_on_close(path) as tmp_path, \
+                zipfile.ZipFile(tmp_path, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, values in columns:
+                for member_name, member in ColumnStoreHelper._make_members(name, values, name in categorical_columns).items():
+                    with archive.open(f"{member_name}.npy", mode="w", force_zip64=True) as file:
+                        np.lib.format.write_array(file, np.asanyarray(member), allow_pickle=True)
+
+        return path
+
+    @staticmethod
+    @contextmanager
+    def _replace_on_close(path: Path):
+        """
+        Yields a temporary path next to the given path and moves the written file to the given path at the end. An existing store is thus
+        replaced instead of being overwritten in place, so hard links to it (e.g., from exported datasets) keep the old content.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @staticmethod
+    def _make_members(name: str, values, categorical: bool) -> dict:
+        values = ColumnStoreHelper._to_array(values)
+        members = {}
+
+        if values.dtype.hasobject:
+            null_mask = np.array([value is None for value in values], dtype=bool)
+            enum_classes = {type(value) for value in values[~null_mask]}
+            if len(enum_classes) == 1 and issubclass(next(iter(enum_classes)), Enum):
+                enum_class = enum_classes.pop()
+                members[f"{name}{ColumnStoreHelper.ENUM_SUFFIX}"] = np.array([f"{enum_class.__module__}:{enum_class.__qualname__}"])
+            values = ColumnStoreHelper._to_typed_array(values, null_mask)
+            if np.any(null_mask):
+                members[f"{name}{ColumnStoreHelper.NULL_SUFFIX}"] = null_mask
+
+        if categorical and values.dtype.kind == "U":
+            categories, codes = np.unique(values, return_inverse=True)
+            members[f"{name}{ColumnStoreHelper.CATEGORIES_SUFFIX}"] = categories
+            members[f"{name}{ColumnStoreHelper.CODES_SUFFIX}"] = codes.astype(np.min_scalar_type(max(len(categories) - 1, 0)))
+        else:
+            members[name] = values
+
+        return members
+
+    @staticmethod
+    def _to_array(values) -> np.ndarray:
+        if isinstance(values, np.ndarray) and values.ndim == 1:
+            return values
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+        return array
+
+    @staticmethod
+    def _to_typed_array(values: np.ndarray, null_mask: np.ndarray) -> np.ndarray:
+        present = [value.value if isinstance(value, Enum) else value for value in values[~null_mask]]
+
+        if len(present) == 0:
+            return np.zeros(len(values), dtype="U1")
+
+        types = {type(value) for value in present}
+
+        if all(issubclass(value_type, str) for value_type in types):
+            fill_value = ""
+        elif all(issubclass(value_type, (bool, np.bool_)) for value_type in types):
+            fill_value = False
+        elif all(issubclass(value_type, (int, np.integer)) and not issubclass(value_type, (bool, np.bool_)) for value_type in types):
+            fill_value = 0
+        elif all(issubclass(value_type, (float, np.floating)) for value_type in types):
+            fill_value = np.nan
+        else:
+            typed = np.empty(len(values), dtype=object)
+            typed[~null_mask] = present
+            return typed
+
+        typed = np.array(present)
+        if len(present) < len(values):
+            typed_with_missing = np.full(len(values), fill_value, dtype=typed.dtype)
+            typed_with_missing[~null_mask] = typed
+            typed = typed_with_missing
+        return typed
+
+    @staticmethod
+    def get_column_names(path: Path) -> list:
+        names = []
+        for member in ColumnStoreHelper._get_member_names(path):
+            if member.endswith(ColumnStoreHelper.CODES_SUFFIX):
+                names.append(member[:-len(ColumnStoreHelper.CODES_SUFFIX)])
+            elif not member.endswith((ColumnStoreHelper.CATEGORIES_SUFFIX, ColumnStoreHelper.NULL_SUFFIX, ColumnStoreHelper.ENUM_SUFFIX)):
+                names.append(member)
+        return names
+
+    @staticmethod
+    def get_row_count(path: Path) -> int:
+        names = ColumnStoreHelper.get_column_names(path)
+        if len(names) == 0:
+            return 0
+        column = ColumnStoreHelper.read_column(path, names[0], decode=False)
+        return column.shape[0]
+
+    @staticmethod
+    def read_column(path: Path, name: str, decode: bool = True):
+        """
+        Reads one column from the store, memory-mapping the underlying member where possible. The mapping is copy-on-write: the returned
+        array can be modified, but the changes are not written back to the store.
+
+        Arguments:
+            path: path to the .npz store
+            name: name of the column
+            decode: whether to resolve categorical codes and missing values; if False, codes are returned as is
+
+        Returns:
+            numpy array with the column values or None if the column is not present in the store
+        """
+        with zipfile.ZipFile(path) as archive:
+            members = ColumnStoreHelper._get_members(archive)
+
+            if name in members:
+                values = ColumnStoreHelper._load_member(path, archive, members[name])
+            elif f"{name}{ColumnStoreHelper.CODES_SUFFIX}" in members:
+                values = ColumnStoreHelper._load_member(path, archive, members[f"{name}{ColumnStoreHelper.CODES_SUFFIX}"])
+                if decode:
+                    categories = ColumnStoreHelper._load_member(path, archive, members[f"{name}{ColumnStoreHelper.CATEGORIES_SUFFIX}"], mmap=False)
+                    values = categories[values]
+            else:
+                return None
+
+            if decode and f"{name}{ColumnStoreHelper.NULL_SUFFIX}" in members:
+                null_mask = ColumnStoreHelper._load_member(path, archive, members[f"{name}{ColumnStoreHelper.NULL_SUFFIX}"], mmap=False)
+                values = values.astype(object)
+                values[null_mask] = None
+
+            if decode and f"{name}{ColumnStoreHelper.ENUM_SUFFIX}" in members:
+                enum_name = ColumnStoreHelper._load_member(path, archive, members[f"{name}{ColumnStoreHelper.ENUM_SUFFIX}"], mmap=False)[0]
+                values = ColumnStoreHelper._to_enum_array(values, enum_name)
+
+        return values
+
+    @staticmethod
+    def _to_enum_array(values: np.ndarray, enum_name: str) -> np.ndarray:
+        module_name, class_name = enum_name.split(":")
+        enum_class = getattr(importlib.import_module(module_name), class_name)
+        enum_values = np.empty(len(values), dtype=object)
+        enum_values[:] = [enum_class(value) if value is not None else None for value in values.tolist()]
+        return enum_values
+
+    @staticmethod
+    def read_columns(path: Path, names: list) -> dict:
+        return {name: ColumnStoreHelper.read_column(path, name) for name in names}
+
+    @staticmethod
+    def _get_member_names(path: Path) -> list:
+        with zipfile.ZipFile(path) as archive:
+            return list(ColumnStoreHelper._get_members(archive).keys())
+
+    @staticmethod
+    def _get_members(archive: zipfile.ZipFile) -> dict:
+        return {info.filename[:-len(".npy")]: info for info in archive.infolist()}
+
+    @staticmethod
+    def _load_member(path: Path, archive: zipfile.ZipFile, info: zipfile.ZipInfo, mmap: bool = True) -> np.ndarray:
+        if mmap and info.compress_type == zipfile.ZIP_STORED:
+            array = ColumnStoreHelper._memmap_member(path, info)
+            if array is not None:
+                return array
+
+        with archive.open(info) as file:
+            return np.lib.format.read_array(file, allow_pickle=True)
+
+    @staticmethod
+    def _memmap_member(path: Path, info: zipfile.ZipInfo):
+        with Path(path).open("rb") as file:
+            file.seek(info.header_offset)
+            local_header = file.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            offset = file.tell()
+
+        if dtype.hasobject or np.prod(shape) == 0:
+            return None
+
+        return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape, order="F" if fortran_order else "C").view(np.ndarray)
@@ -3,3 +3,13 @@ import numpy as np
 
 def jaccard(vector1, vector2, tmp_vector=None):
     return np.sum(np.logical_and(vector1, vector2, out=tmp_vector)) / np.sum(np.logical_or(vector1, vector2, out=tmp_vector))
+
+
+def jaccard_matrix(matrix1, matrix2):
+    """computes jaccard similarity between each column of matrix1 and each column of matrix2 (sparse items x repertoires matrices of item
+    presence), where the size of the intersections is computed as a sparse matrix product"""
+    matrix1, matrix2 = (matrix1 != 0).astype(np.float64), (matrix2 != 0).astype(np.float64)
+    intersection = (matrix1.T @ matrix2).toarray()
+    union = matrix1.getnnz(axis=0)[:, None] + matrix2.getnnz(axis=0)[None, :] - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return intersection / union
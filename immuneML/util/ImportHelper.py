@@ -1,5 +1,6 @@
-import pickle
+import re
 import warnings
+from functools import partial
 from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import List
@@ -17,6 +18,7 @@ from immuneML.data_model.dataset.SequenceDataset import SequenceDataset
 from immuneML.data_model.receptor.BCKReceptor import BCKReceptor
 from immuneML.data_model.receptor.BCReceptor import BCReceptor
 from immuneML.data_model.receptor.ChainPair import ChainPair
+from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
 from immuneML.data_model.receptor.Receptor import Receptor
 from immuneML.data_model.receptor.RegionType import RegionType
 from immuneML.data_model.receptor.TCABReceptor import TCABReceptor
@@ -29,6 +31,7 @@ from immuneML.data_model.repertoire.Repertoire import Repertoire
 from immuneML.environment.Constants import Constants
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.environment.SequenceType import SequenceType
+from immuneML.util.ColumnStoreHelper import ColumnStoreHelper
 from immuneML.util.ParameterValidator import ParameterValidator
 from immuneML.util.PathBuilder import PathBuilder
 
@@ -148,17 +151,21 @@ class ImportHelper:
 
     @staticmethod
     def load_repertoire_as_object(import_class, metadata_row, params: DatasetImportParams):
-        alternative_load_func = getattr(import_class, "alternative_load_func", None)
         try:
             alternative_load_func = getattr(import_class, "alternative_load_func", None)
+            alternative_chunk_load_func = getattr(import_class, "alternative_chunk_load_func", None)
 
             filename = params.path / f"{metadata_row['filename']}"
 
+            if params.chunk_size is not None and (alternative_load_func is None or alternative_chunk_load_func is not None):
+                return ImportHelper.load_repertoire_in_chunks(import_class, metadata_row, filename, params, alternative_chunk_load_func,
+                                                              getattr(import_class, "DROP_EMPTY_COLUMNS", False))
+
             dataframe = ImportHelper.load_sequence_dataframe(filename, params, alternative_load_func)
             dataframe = import_class.preprocess_dataframe(dataframe, params)
             sequence_lists = {field: dataframe[field].values.tolist() for field in Repertoire.FIELDS if field in dataframe.columns}
             sequence_lists["custom_lists"] = {field: dataframe[field].values.tolist()
-                                              for field in list(set(dataframe.columns) - set(Repertoire.FIELDS))}
+                                              for field in dataframe.columns if field not in Repertoire.FIELDS}
 
             repertoire_inputs = {**{"metadata": metadata_row.to_dict(),
                                     "path": params.result_path / "repertoires/",
@@ -169,6 +176,45 @@ class ImportHelper:
         except Exception as exception:
             raise RuntimeError(f"{ImportHelper.__name__}: error when importing file {metadata_row['filename']}.") from exception
 
+    @staticmethod
+    def load_repertoire_in_chunks(import_class, metadata_row, filename: Path, params: DatasetImportParams, alternative_chunk_load_func=None,
+                                  drop_empty_columns: bool = False):
+        """
+        Imports the repertoire file in chunks of params.chunk_size rows: each chunk is preprocessed by the import class and appended to the
+        repertoire on disk before the next chunk is read, so that the memory used does not depend on the size of the file. If
+        drop_empty_columns is True, columns without values in any of the chunks are not stored, as when they are dropped from the whole file.
+        """
+        def make_chunks():
+            for dataframe in ImportHelper.load_sequence_dataframe_chunks(filename, params, alternative_chunk_load_func):
+                dataframe = import_class.preprocess_dataframe(dataframe, params)
+                yield {field: dataframe[field].values.tolist() for field in dataframe.columns}
+
+        return Repertoire.build_from_chunks(make_chunks(), path=params.result_path / "repertoires/", metadata=metadata_row.to_dict(),
+                                            filename_base=filename.stem, drop_empty_fields=drop_empty_columns)
+
+    @staticmethod
+    def load_sequence_dataframe_chunks(filepath, params, alternative_chunk_load_func=None):
+        try:
+            if alternative_chunk_load_func:
+                chunks = iter(alternative_chunk_load_func(filepath, params))
+            else:
+                chunks = iter(ImportHelper.safe_load_dataframe(filepath, params, chunk_size=params.chunk_size))
+        except Exception as ex:
+            raise ImportHelper._make_parsing_exception(ex, filepath, params)
+
+        while True:
+            # the chunks are parsed while iterating, so parsing errors are reported here in the same way as when loading the whole file
+            try:
+                df = next(chunks)
+            except StopIteration:
+                return
+            except Exception as ex:
+                raise ImportHelper._make_parsing_exception(ex, filepath, params)
+
+            ImportHelper.rename_dataframe_columns(df, params)
+            ImportHelper.standardize_none_values(df)
+            yield df
+
     @staticmethod
     def load_sequence_dataframe(filepath, params, alternative_load_func=None):
         try:
@@ -177,10 +223,7 @@ class ImportHelper:
             else:
                 df = ImportHelper.safe_load_dataframe(filepath, params)
         except Exception as ex:
-            raise Exception(f"{ex}\n\nImportHelper: an error occurred during dataset import while parsing the input file: {filepath}.\n"
-                            f"Please make sure this is a correct immune receptor data file (not metadata).\n"
-                            f"The parameters used for import are {params}.\nFor technical description of the error, see the log above. "
-                            f"For details on how to specify the dataset import, see the documentation.")
+            raise ImportHelper._make_parsing_exception(ex, filepath, params)
 
         ImportHelper.rename_dataframe_columns(df, params)
         ImportHelper.standardize_none_values(df)
@@ -188,7 +231,15 @@ class ImportHelper:
         return df
 
     @staticmethod
-    def safe_load_dataframe(filepath, params):
+    def _make_parsing_exception(ex: Exception, filepath, params) -> Exception:
+        return Exception(f"{ex}\n\nImportHelper: an error occurred during dataset import while parsing the input file: {filepath}.\n"
+                         f"Please make sure this is a correct immune receptor data file (not metadata).\n"
+                         f"The parameters used for import are {params}.\nFor technical description of the error, see the log above. "
+                         f"For details on how to specify the dataset import, see the documentation.")
+
+    @staticmethod
+    def safe_load_dataframe(filepath, params, chunk_size: int = None):
+        """loads the file as a data frame with all values as strings or, if chunk_size is set, as an iterator over data frames with chunk_size rows"""
         if hasattr(params, "columns_to_load") and params.columns_to_load is not None:
             usecols = set(params.columns_to_load) if hasattr(params, "columns_to_load") and params.columns_to_load is not None else set()
             usecols = usecols.union(set(params.column_mapping.keys()) if hasattr(params, "column_mapping") and params.column_mapping is not None else set())
@@ -198,14 +249,14 @@ class ImportHelper:
             usecols = None
 
         try:
-            df = pd.read_csv(filepath, sep=params.separator, iterator=False, usecols=usecols, dtype=str)
+            df = pd.read_csv(filepath, sep=params.separator, iterator=False, usecols=usecols, dtype=str, chunksize=chunk_size)
         except ValueError:
             try:
-                df = pd.read_csv(filepath, sep=params.separator, iterator=False, usecols=params.columns_to_load, dtype=str)
+                df = pd.read_csv(filepath, sep=params.separator, iterator=False, usecols=params.columns_to_load, dtype=str, chunksize=chunk_size)
             except ValueError:
-                df = pd.read_csv(filepath, sep=params.separator, iterator=False, dtype=str)
+                df = pd.read_csv(filepath, sep=params.separator, iterator=False, dtype=str, chunksize=chunk_size)
                 warnings.warn(f"ImportHelper: failed to import columns {params.columns_to_load} for "
-                              f"the input file {filepath}, imported the following instead: {list(df.columns)}")
+                              f"the input file {filepath}, imported the following instead: {list(df.columns) if chunk_size is None else 'all columns'}")
 
         return df
 
@@ -262,9 +313,8 @@ class ImportHelper:
             if sequence_type == SequenceType.AMINO_ACID:
                 legal_alphabet.append(Constants.STOP_CODON)
 
-            is_illegal_seq = [ImportHelper.is_illegal_sequence(sequence, legal_alphabet) for
-                              sequence in dataframe[sequence_type.value]]
-            n_illegal = sum(is_illegal_seq)
+            is_illegal_seq = ImportHelper.get_illegal_sequence_mask(dataframe[sequence_type.value], legal_alphabet)
+            n_illegal = is_illegal_seq.sum()
 
             if n_illegal > 0:
                 dataframe.drop(dataframe.loc[is_illegal_seq].index, inplace=True)
@@ -273,11 +323,13 @@ class ImportHelper:
         return dataframe
 
     @staticmethod
-    def is_illegal_sequence(sequence, legal_alphabet) -> bool:
-        if sequence is None:
-            return False
-        else:
-            return not all(character in legal_alphabet for character in sequence)
+    def get_illegal_sequence_mask(sequences: pd.Series, legal_alphabet) -> np.ndarray:
+        """
+        Returns a boolean mask of the sequences which contain at least one character outside of the legal alphabet; missing sequences are not
+        considered illegal. All sequences are checked at once with a single regular expression.
+        """
+        illegal_character_pattern = f"[^{''.join(re.escape(character) for character in legal_alphabet)}]"
+        return sequences.astype(object).str.contains(illegal_character_pattern, regex=True, na=False).values.astype(bool)
 
     @staticmethod
     def prepare_frame_type_list(params: DatasetImportParams) -> list:
@@ -303,14 +355,20 @@ class ImportHelper:
 
     @staticmethod
     def load_chains_from_genes(df: pd.DataFrame) -> list:
-        return df.apply(ImportHelper.get_chain_for_row, axis=1)
+        """
+        Infers the chain of each row from the first three characters of the first gene column (subgroups, genes, alleles) with a value;
+        the chain is looked up once per distinct prefix instead of once per row.
+        """
+        gene_columns = [col for col in ["v_subgroups", "j_subgroups", "v_genes", "j_genes", "v_alleles", "j_alleles"] if col in df.columns]
+        chains = np.full(df.shape[0], None, dtype=object)
 
-    @staticmethod
-    def get_chain_for_row(row):
-        for col in ["v_subgroup", "j_subgroup", "v_genes", "j_genes", "v_alleles", "j_alleles"]:
-            if col in row and row[col] is not None:
-                return Chain.get_chain(str(row[col])[0:3]).value
-        return None
+        if len(gene_columns) > 0:
+            genes = df[gene_columns].bfill(axis=1).iloc[:, 0]
+            present = genes.notnull().values
+            prefixes = genes[present].astype(str).str[0:3]
+            chains[present] = prefixes.map({prefix: Chain.get_chain(prefix).value for prefix in prefixes.unique()}).values
+
+        return chains.tolist()
 
     @staticmethod
     def junction_to_cdr3(df: pd.DataFrame, region_type: RegionType):
@@ -324,7 +382,7 @@ class ImportHelper:
                 df.loc[:, "sequence_aas"] = df["sequence_aas"].str[1:-1]
             if "sequences" in df:
                 df.loc[:, "sequences"] = df["sequences"].str[3:-3]
-            df.loc[:, "region_types"] = region_type.name
+            df["region_types"] = region_type.name
 
     @staticmethod
     def strip_alleles(df: pd.DataFrame, column_name):
@@ -340,7 +398,7 @@ class ImportHelper:
         Safely removes everything after a delimiter from a column in the DataFrame
         """
         if column_name in df.columns:
-            return df[column_name].apply(lambda gene_col: None if gene_col is None else gene_col.rsplit(delimiter)[0])
+            return df[column_name].astype(object).str.split(delimiter, n=1).str[0]
 
     @staticmethod
     def get_sequence_filenames(path: Path, dataset_name: str):
@@ -363,25 +421,25 @@ class ImportHelper:
 
     @staticmethod
     def import_sequence_dataset(import_class, params, dataset_name: str):
+        """
+        Imports the sequence files in parallel (params.number_of_processes files at the time) and streams the imported items through a buffer
+        into batch files of params.sequence_file_size items; the buffer never holds more than one batch and one imported file.
+        """
         PathBuilder.build(params.result_path)
 
         filenames = ImportHelper.get_sequence_filenames(params.path, dataset_name)
 
-        file_index = 0
         dataset_filenames = []
-        dataset_params = {}
-        items = None
+        dataset_params = ImportHelper.extract_sequence_dataset_params(params=params)
+        items = []
 
-        for index, filename in enumerate(filenames):
-            new_items = ImportHelper.import_items(import_class, filename, params)
-            items = np.append(items, new_items) if items is not None else new_items
-            dataset_params = ImportHelper.extract_sequence_dataset_params(items, params)
+        with Pool(params.number_of_processes) as pool:
+            for new_items in pool.imap(partial(ImportHelper.import_items, import_class, params=params), filenames):
+                ImportHelper.add_sequence_dataset_params(dataset_params, new_items, params)
+                items = ImportHelper.store_sequence_batches(items + list(new_items), dataset_filenames, params.result_path,
+                                                            params.sequence_file_size)
 
-            while len(items) > params.sequence_file_size or (index == len(filenames) - 1 and len(items) > 0):
-                dataset_filenames.append(params.result_path / "batch_{}.pickle".format(file_index))
-                ImportHelper.store_sequence_items(dataset_filenames, items, params.sequence_file_size)
-                items = items[params.sequence_file_size:]
-                file_index += 1
+        ImportHelper.store_sequence_batches(items, dataset_filenames, params.result_path, params.sequence_file_size, store_all=True)
 
         init_kwargs = {"filenames": dataset_filenames, "file_size": params.sequence_file_size, "name": dataset_name, "labels": dataset_params}
 
@@ -397,13 +455,19 @@ class ImportHelper:
         if params is not None:
             result = {'region_type': params.region_type, 'receptor_chains': params.receptor_chains, 'organism': params.organism}
         if items is not None:
-            for index, item in enumerate(items):
-                metadata = item.metadata if params.paired else item.metadata.custom_params if item.metadata is not None else {}
-                for key in metadata:
-                    if key in result and isinstance(result[key], set):
-                        result[key].add(metadata[key])
-                    elif key not in result:
-                        result[key] = {metadata[key]}
+            ImportHelper.add_sequence_dataset_params(result, items, params)
+        return result
+
+    @staticmethod
+    def add_sequence_dataset_params(result: dict, items, params) -> dict:
+        """adds the metadata values of the items to the sets of label values in result"""
+        for item in items:
+            metadata = item.metadata if params.paired else item.metadata.custom_params if item.metadata is not None else {}
+            for key in metadata:
+                if key in result and isinstance(result[key], set):
+                    result[key].add(metadata[key])
+                elif key not in result:
+                    result[key] = {metadata[key]}
         return result
 
     @staticmethod
@@ -420,14 +484,27 @@ class ImportHelper:
                 raise NotImplementedError(f"{import_class.__name__}: import of paired receptor data has not been implemented.")
         else:
             metadata_columns = params.metadata_column_mapping.values() if params.metadata_column_mapping else None
-            sequences = df.apply(ImportHelper.import_sequence, metadata_columns=metadata_columns, axis=1).values
+            sequences = [ImportHelper.import_sequence(row, metadata_columns=metadata_columns) for row in df.to_dict("records")]
 
         return sequences
 
+    @staticmethod
+    def store_sequence_batches(items: list, dataset_filenames: list, result_path: Path, sequence_file_size: int, store_all: bool = False) -> list:
+        """
+        Stores consecutive batches of sequence_file_size items to new batch files (also the last, smaller batch if store_all is True), adds
+        the new files to dataset_filenames and returns the items which were not stored.
+        """
+        start = 0
+        while len(items) - start >= sequence_file_size or (store_all and start < len(items)):
+            dataset_filenames.append(result_path / f"batch_{len(dataset_filenames)}{ColumnStoreHelper.FILE_EXTENSION}")
+            ImportHelper.store_sequence_items(dataset_filenames, items[start:start + sequence_file_size], sequence_file_size)
+            start += sequence_file_size
+
+        return items[start:]
+
     @staticmethod
     def store_sequence_items(dataset_filenames: list, items: list, sequence_file_size: int):
-        with dataset_filenames[-1].open("wb") as file:
-            pickle.dump(items[:sequence_file_size], file)
+        ElementGenerator.store_elements(dataset_filenames[-1], items[:sequence_file_size])
 
     @staticmethod
     def import_sequence(row, metadata_columns=None) -> ReceptorSequence:
@@ -453,33 +530,43 @@ class ImportHelper:
 
     @staticmethod
     def import_receptors(df, params) -> List[Receptor]:
-        identifiers = df["receptor_identifiers"].unique()
-        all_receptors = []
-
-        for identifier in identifiers:
-            receptors = ImportHelper.import_receptors_by_id(df, identifier, params)
-            all_receptors.extend(receptors)
-
-        return all_receptors
-
-    @staticmethod
-    def import_receptors_by_id(df, identifier, params) -> List[Receptor]:
-        first_row = df.loc[(df["receptor_identifiers"] == identifier) & (df["chains"] == params.receptor_chains.value[0])]
-        second_row = df.loc[(df["receptor_identifiers"] == identifier) & (df["chains"] == params.receptor_chains.value[1])]
-
-        for i, row in enumerate([first_row, second_row]):
-            if row.shape[0] > 1:
-                warnings.warn(
-                    f"Multiple {params.receptor_chains.value[i]} chains found for receptor with identifier {identifier}, only the first entry will be loaded")
-            elif row.shape[0] == 0:
-                warnings.warn(
-                    f"Missing {params.receptor_chains.value[i]} chain for receptor with identifier {identifier}, this receptor will be omitted.")
-                return []
+        """
+        Assembles paired receptors from a data frame with one chain per row: the rows of each of the two chains are indexed once by receptor
+        identifier, so the receptors are built from aligned rows in a single pass instead of filtering the data frame for each receptor.
+        Receptors with a missing chain are omitted and for receptors with multiple entries of the same chain only the first entry is loaded;
+        both cases are reported with one warning per chain.
+        """
+        identifiers = pd.Index(df["receptor_identifiers"].unique())
+        complete = np.ones(len(identifiers), dtype=bool)
+        chain_rows = []
+
+        for chain in params.receptor_chains.value:
+            rows = df[df["chains"] == chain]
+            duplicated = rows["receptor_identifiers"].duplicated(keep="first").values
+            ImportHelper.warn_for_receptors(rows["receptor_identifiers"].values[duplicated],
+                                            f"Multiple {chain} chains found for", "only the first entry will be loaded")
+            rows = rows[~duplicated].set_index("receptor_identifiers", drop=False)
+
+            present = identifiers.isin(rows.index)
+            ImportHelper.warn_for_receptors(identifiers[complete & ~present], f"Missing {chain} chain for", "these receptors will be omitted")
+            complete &= present
+            chain_rows.append(rows)
 
         # todo add options like IRIS import: option to import all dual chains or just the first pair / all V genes when uncertain annotation, etc
         # todo add possibility to import multiple chain combo's? (BCR heavy-light & heavy-kappa, as seen in 10xGenomics?)
 
-        return [ImportHelper.build_receptor_from_rows(first_row.iloc[0], second_row.iloc[0], identifier, params)]
+        identifiers = identifiers[complete]
+        first_rows, second_rows = [rows.loc[identifiers].to_dict("records") for rows in chain_rows]
+
+        return [ImportHelper.build_receptor_from_rows(first_row, second_row, identifier, params)
+                for first_row, second_row, identifier in zip(first_rows, second_rows, identifiers)]
+
+    @staticmethod
+    def warn_for_receptors(identifiers, message_start: str, message_end: str, max_identifiers_shown: int = 10):
+        if len(identifiers) > 0:
+            shown = ", ".join(str(identifier) for identifier in identifiers[:max_identifiers_shown])
+            shown += ", ..." if len(identifiers) > max_identifiers_shown else ""
+            warnings.warn(f"{message_start} {len(identifiers)} receptor(s) (identifiers: {shown}), {message_end}.")
 
     @staticmethod
     def build_receptor_from_rows(first_row, second_row, identifier, params):
@@ -1,6 +1,9 @@
 # quality: peripheral
 import itertools
 import warnings
+from typing import Tuple
+
+import numpy as np
 
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.data_model.repertoire.Repertoire import Repertoire
@@ -8,6 +11,9 @@ from immuneML.util.PositionHelper import PositionHelper
 
 
 class KmerHelper:
+
+    GAP_CHARACTER = "."
+
     @staticmethod
     def create_kmers_from_sequence(sequence: ReceptorSequence, k: int, overlap: bool = True):
         return KmerHelper.create_kmers_from_string(sequence.get_sequence(), k, overlap)
@@ -68,6 +74,127 @@ class KmerHelper:
     def create_gapped_kmers_from_sequence(sequence: ReceptorSequence, k_left: int, max_gap: int, k_right: int = None, min_gap: int = 0):
         return KmerHelper.create_gapped_kmers_from_string(sequence.get_sequence(), k_left, max_gap, k_right, min_gap)
 
+    @staticmethod
+    def count_kmers_in_sequences(sequences, k: int, weights: np.ndarray = None, batch_size: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Counts overlapping k-mers in a batch of sequences without creating k-mer strings per sequence: sequences are converted to integer
+        codes, k-mers are packed into integers using a sliding window view and counted using np.unique and np.bincount. Sequences shorter
+        than k are ignored.
+
+        Args:
+            sequences: array or list of sequences (strings)
+            k: k-mer length
+            weights: how much each sequence contributes to the count of its k-mers (e.g. sequence counts); if None, each sequence counts once
+            batch_size: how many sequences to process at once, limits the memory used for the window views
+
+        Returns:
+            a tuple of sorted unique k-mers (as numpy unicode array) and their counts
+        """
+        codes, lengths, alphabet = KmerHelper.encode_sequences_as_codes(sequences)
+        return KmerHelper._count_windows(codes, lengths, alphabet, weights, window_size=k, kept_positions=np.arange(k), min_length=k,
+                                         batch_size=batch_size)
+
+    @staticmethod
+    def count_gapped_kmers_in_sequences(sequences, k_left: int, max_gap: int, k_right: int = None, min_gap: int = 0,
+                                        weights: np.ndarray = None, batch_size: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch version of create_gapped_kmers_from_string which counts the gapped k-mers from all sequences at once (see
+        count_kmers_in_sequences). Sequences shorter than k_left + k_right + max_gap are ignored.
+
+        Returns:
+            a tuple of unique gapped k-mers (with gaps denoted by '.') and their counts
+        """
+        k_right = k_left if k_right is None else k_right
+        codes, lengths, alphabet = KmerHelper.encode_sequences_as_codes(sequences)
+        kmers, counts = [], []
+
+        for gap in range(min_gap, max_gap + 1):
+            kept_positions = np.concatenate([np.arange(k_left), np.arange(k_left + gap, k_left + gap + k_right)])
+            gap_kmers, gap_counts = KmerHelper._count_windows(codes, lengths, alphabet, weights, window_size=k_left + gap + k_right,
+                                                              kept_positions=kept_positions, min_length=k_left + k_right + max_gap,
+                                                              batch_size=batch_size)
+            kmers.append(gap_kmers)
+            counts.append(gap_counts)
+
+        return np.concatenate(kmers), np.concatenate(counts)
+
+    @staticmethod
+    def encode_sequences_as_codes(sequences) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converts sequences to a matrix of integer codes (one row per sequence, padded to the length of the longest sequence)
+
+        Returns:
+            code matrix, sequence lengths and the alphabet (sorted unicode code points) that the codes index into
+        """
+        sequences = np.array(["" if sequence is None else sequence for sequence in sequences] if isinstance(sequences, list) or
+                             np.asarray(sequences).dtype.hasobject else sequences, dtype=str)
+        max_length = sequences.dtype.itemsize // np.dtype("U1").itemsize
+
+        if sequences.shape[0] == 0 or max_length == 0:
+            return np.zeros((sequences.shape[0], 0), dtype=np.int64), np.zeros(sequences.shape[0], dtype=np.int64), np.array([], dtype=np.uint32)
+
+        code_points = np.ascontiguousarray(sequences).view(np.uint32).reshape(sequences.shape[0], max_length)
+        lengths = np.char.str_len(sequences)
+        alphabet = np.unique(code_points[code_points > 0])
+        lookup = np.zeros(alphabet[-1] + 1, dtype=np.int64)
+        lookup[alphabet] = np.arange(alphabet.shape[0])
+
+        return lookup[code_points], lengths, alphabet
+
+    @staticmethod
+    def _count_windows(codes: np.ndarray, lengths: np.ndarray, alphabet: np.ndarray, weights: np.ndarray, window_size: int,
+                       kept_positions: np.ndarray, min_length: int, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        packed_windows, window_weights = [], []
+        window_count = codes.shape[1] - window_size + 1
+
+        if window_count > 0 and window_size > 0:
+            packed_dtype = np.int64 if alphabet.shape[0] ** kept_positions.shape[0] < 2 ** 62 else None
+
+            for start in range(0, codes.shape[0], batch_size):
+                batch_lengths = lengths[start: start + batch_size]
+                windows = KmerHelper._sliding_windows(codes[start: start + batch_size], window_size)[:, :, kept_positions]
+                is_valid = (np.arange(window_count)[np.newaxis, :] <= (batch_lengths - window_size)[:, np.newaxis]) \
+                           & (batch_lengths >= min_length)[:, np.newaxis]
+
+                packed_windows.append(KmerHelper._pack_windows(windows[is_valid], alphabet.shape[0], packed_dtype))
+                if weights is not None:
+                    window_weights.append(np.broadcast_to(np.asarray(weights[start: start + batch_size])[:, np.newaxis], is_valid.shape)[is_valid])
+
+        if len(packed_windows) == 0 or sum(packed.shape[0] for packed in packed_windows) == 0:
+            return np.array([], dtype=str), np.array([], dtype=np.int64)
+
+        unique_windows, inverse = np.unique(np.concatenate(packed_windows), return_inverse=True, axis=0)
+        if weights is None:
+            counts = np.bincount(inverse, minlength=unique_windows.shape[0])
+        else:
+            counts = np.rint(np.bincount(inverse, weights=np.concatenate(window_weights), minlength=unique_windows.shape[0])).astype(np.int64)
+
+        return KmerHelper._unpack_windows(unique_windows, alphabet, window_size, kept_positions, packed_dtype), counts
+
+    @staticmethod
+    def _sliding_windows(codes: np.ndarray, window_size: int) -> np.ndarray:
+        """returns a read-only view [sequences, windows, window_size] of all windows of window_size consecutive positions in codes"""
+        return np.lib.stride_tricks.as_strided(codes, shape=(codes.shape[0], codes.shape[1] - window_size + 1, window_size),
+                                               strides=(codes.strides[0], codes.strides[1], codes.strides[1]), writeable=False)
+
+    @staticmethod
+    def _pack_windows(windows: np.ndarray, alphabet_size: int, packed_dtype) -> np.ndarray:
+        if packed_dtype is not None:
+            return windows @ (alphabet_size ** np.arange(windows.shape[1] - 1, -1, -1, dtype=np.int64))
+        else:
+            return windows.astype(np.uint8)
+
+    @staticmethod
+    def _unpack_windows(unique_windows: np.ndarray, alphabet: np.ndarray, window_size: int, kept_positions: np.ndarray, packed_dtype) -> np.ndarray:
+        if packed_dtype is not None:
+            powers = alphabet.shape[0] ** np.arange(kept_positions.shape[0] - 1, -1, -1, dtype=np.int64)
+            unique_windows = (unique_windows[:, np.newaxis] // powers[np.newaxis, :]) % alphabet.shape[0]
+
+        code_points = np.full((unique_windows.shape[0], window_size), ord(KmerHelper.GAP_CHARACTER), dtype=np.uint32)
+        code_points[:, kept_positions] = alphabet[unique_windows]
+
+        return code_points.view(f"U{window_size}").ravel()
+
     @staticmethod
     def create_all_kmers(k: int, alphabet: list):
         """
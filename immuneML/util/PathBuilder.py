@@ -2,6 +2,7 @@
 
 import errno
 import os
+import shutil
 import warnings
 from pathlib import Path
 
@@ -21,3 +22,13 @@ class PathBuilder:
                     raise
 
         return path
+
+    @staticmethod
+    def link_or_copy(source: Path, target: Path) -> Path:
+        """Creates a hard link to the source file at target; if linking is not possible (e.g., on another file system), copies the file"""
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+        return target
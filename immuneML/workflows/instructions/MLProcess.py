@@ -3,6 +3,7 @@ import datetime
 from pathlib import Path
 from typing import List
 
+from immuneML.caching.Fingerprinter import Fingerprinter
 from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.environment.LabelConfiguration import LabelConfiguration
 from immuneML.environment.Metric import Metric
@@ -22,6 +23,8 @@ class MLProcess:
         3. trains the ML method on encoded training dataset
         4. assesses the method's performance on encoded test dataset
 
+    Processes which differ only in the ML method can be run together with run_group(), so that steps 1 and 2 are done only once.
+
     It performs the task for a given label configuration, and given list of metrics (used only in the assessment step).
     """
 
@@ -62,29 +65,73 @@ class MLProcess:
         self.report_path = PathBuilder.build(self.path / "reports")
 
     def run(self, split_index: int) -> HPItem:
-
-        print(f"{datetime.datetime.now()}: Evaluating hyperparameter setting: {self.hp_setting}...", flush=True)
-
-        PathBuilder.build(self.path)
-        self._set_paths()
-
+        return MLProcess.run_group([self], split_index)[0]
+
+    @staticmethod
+    def run_group(processes: list, split_index: int) -> List[HPItem]:
+        """
+        Runs ML processes which share the datasets, labels, preprocessing and encoding (see get_encoding_key()) and differ only in the
+        ML method: the datasets are preprocessed, encoded and the encoding reports are run only once (in the path of the first process),
+        and the encoded datasets are then used to train and assess each of the ML methods.
+
+        Arguments:
+            processes: ML processes with the same encoding key
+            split_index: index of the data split
+
+        Returns:
+            list of HPItem objects, one per process in the same order as the processes
+        """
+        first_process = processes[0]
+        assert all(process.get_encoding_key() == first_process.get_encoding_key() for process in processes), \
+            "MLProcess: only processes with the same datasets, labels, preprocessing and encoding can share the encoded data."
+
+        for process in processes:
+            PathBuilder.build(process.path)
+            process._set_paths()
+
+        print(f"{datetime.datetime.now()}: Evaluating hyperparameter setting(s): {', '.join(str(process.hp_setting) for process in processes)}...",
+              flush=True)
+
+        encoded_train_dataset, encoding_train_results = first_process._encode_train_dataset()
+        encoded_test_dataset, encoding_test_results = first_process._encode_test_dataset()
+
+        hp_items = []
+        for process in processes:
+            if process is not first_process:
+                process.hp_setting.encoder = copy.deepcopy(first_process.hp_setting.encoder)
+
+            method = HPUtil.train_method(process.label, encoded_train_dataset, process.hp_setting, process.path, process.train_predictions_path,
+                                         process.ml_details_path, process.number_of_processes, process.optimization_metric)
+
+            hp_items.append(process._assess_on_test_dataset(encoded_train_dataset, encoding_train_results, encoded_test_dataset,
+                                                            encoding_test_results, method, split_index))
+
+            print(f"{datetime.datetime.now()}: Completed hyperparameter setting {process.hp_setting}.\n", flush=True)
+
+        return hp_items
+
+    def get_encoding_key(self) -> str:
+        """
+        Returns:
+            fingerprint of everything the encoded datasets depend on: the train and test datasets, the labels, the preprocessing and the
+            encoding of the hyperparameter setting, the encoding reports and whether the encoded data are stored
+        """
+        return Fingerprinter.fingerprint((self.train_dataset, self.test_dataset, tuple(self.label_config.get_labels_by_name()),
+                                          self.hp_setting.get_encoding_key(), [report.name for report in self.encoding_reports],
+                                          self.store_encoded_data))
+
+    def _encode_train_dataset(self) -> tuple:
         processed_dataset = HPUtil.preprocess_dataset(self.train_dataset, self.hp_setting.preproc_sequence, self.path / "preprocessed_train_dataset")
 
         encoded_train_dataset = HPUtil.encode_dataset(processed_dataset, self.hp_setting, self.path / "encoded_datasets", learn_model=True,
                                                       context=self.report_context, number_of_processes=self.number_of_processes,
                                                       label_configuration=self.label_config, store_encoded_data=self.store_encoded_data)
 
-        method = HPUtil.train_method(self.label, encoded_train_dataset, self.hp_setting, self.path, self.train_predictions_path, self.ml_details_path, self.number_of_processes, self.optimization_metric)
-
         encoding_train_results = ReportUtil.run_encoding_reports(encoded_train_dataset, self.encoding_reports, self.report_path / "encoding_train")
 
-        hp_item = self._assess_on_test_dataset(encoded_train_dataset, encoding_train_results, method, split_index)
-
-        print(f"{datetime.datetime.now()}: Completed hyperparameter setting {self.hp_setting}.\n", flush=True)
-
-        return hp_item
+        return encoded_train_dataset, encoding_train_results
 
-    def _assess_on_test_dataset(self, encoded_train_dataset, encoding_train_results, method, split_index) -> HPItem:
+    def _encode_test_dataset(self) -> tuple:
         if self.test_dataset is not None and self.test_dataset.get_example_count() > 0:
             processed_test_dataset = HPUtil.preprocess_dataset(self.test_dataset, self.hp_setting.preproc_sequence,
                                                                self.path / "preprocessed_test_dataset")
@@ -93,11 +140,18 @@ class MLProcess:
                                                          learn_model=False, context=self.report_context, number_of_processes=self.number_of_processes,
                                                          label_configuration=self.label_config, store_encoded_data=self.store_encoded_data)
 
+            encoding_test_results = ReportUtil.run_encoding_reports(encoded_test_dataset, self.encoding_reports, self.report_path / "encoding_test")
+
+            return encoded_test_dataset, encoding_test_results
+        else:
+            return None, []
+
+    def _assess_on_test_dataset(self, encoded_train_dataset, encoding_train_results, encoded_test_dataset, encoding_test_results, method,
+                                split_index) -> HPItem:
+        if encoded_test_dataset is not None:
             performance = HPUtil.assess_performance(method, self.metrics, self.optimization_metric, encoded_test_dataset, split_index, self.path,
                                                     self.test_predictions_path, self.label, self.ml_score_path)
 
-            encoding_test_results = ReportUtil.run_encoding_reports(encoded_test_dataset, self.encoding_reports, self.report_path / "encoding_test")
-
             model_report_results = ReportUtil.run_ML_reports(encoded_train_dataset, encoded_test_dataset, method, self.ml_reports,
                                                              self.report_path / "ml_method", self.hp_setting, self.label, self.report_context)
 
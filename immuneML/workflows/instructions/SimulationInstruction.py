@@ -25,6 +25,12 @@ class SimulationInstruction(Instruction):
 
         export_formats: in which formats to export the dataset after simulation. Valid formats are class names of any non-abstract class inheriting :py:obj:`~immuneML.IO.dataset_export.DataExporter.DataExporter`. Important note: Pickle files might not be compatible between different immuneML (sub)versions.
 
+        number_of_processes (int): how many repertoires or receptors to process in parallel when implanting the signals
+
+        seed (int): the seed for the random number generators; each repertoire or receptor gets its own random number generator state derived
+        from the seed, so the simulated dataset is the same for the same seed regardless of the number of processes. If it is not set, a
+        different dataset is simulated each time.
+
     YAML specification:
 
     .. indent with spaces
@@ -35,13 +41,15 @@ class SimulationInstruction(Instruction):
             dataset: my_dataset # which dataset to use for implanting the signals
             simulation: my_simulation # how to implanting the signals - definition of the simulation
             export_formats: [AIRR] # in which formats to export the dataset
+            number_of_processes: 4 # in how many processes to implant the signals
+            seed: 1 # the same seed always results in the same simulated dataset
 
     """
 
     def __init__(self, signals: list, simulation: Simulation, dataset: RepertoireDataset,
-                 name: str = None, exporters: List[DataExporter] = None):
+                 name: str = None, exporters: List[DataExporter] = None, number_of_processes: int = 1, seed: int = None):
         self.exporters = exporters
-        self.state = SimulationState(signals, simulation, dataset, name=name)
+        self.state = SimulationState(signals, simulation, dataset, name=name, number_of_processes=number_of_processes, seed=seed)
 
     def run(self, result_path: Path):
         self.state.result_path = result_path / self.state.name
@@ -1,6 +1,10 @@
 import copy
+import dataclasses
+import random
+from multiprocessing.pool import Pool
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 from immuneML.IO.dataset_import.PickleImport import PickleImport
@@ -65,25 +69,53 @@ class SignalImplanter(Step):
 
     @staticmethod
     def _implant_signals(simulation_state: SimulationState, process_element_func):
-        processed_elements = []
         simulation_limits = SignalImplanter._prepare_simulation_limits(simulation_state.simulation.implantings,
                                                                        simulation_state.dataset.get_example_count())
-        current_implanting_index = 0
-        current_implanting = simulation_state.simulation.implantings[current_implanting_index]
+        implantings = SignalImplanter._get_implanting_per_element(simulation_state.simulation.implantings, simulation_limits,
+                                                                  simulation_state.dataset.get_example_count())
+
+        # each element is processed with its own random number generator state derived from the seed, so the result does not depend on
+        # the number of processes or on which process handles which element; the dataset itself is not sent to the worker processes
+        seeds = SignalImplanter._make_element_seeds(simulation_state.seed, len(implantings))
+        worker_state = dataclasses.replace(simulation_state, dataset=None)
+
+        with Pool(simulation_state.number_of_processes) as pool:
+            processed_elements = pool.starmap(SignalImplanter._process_with_seed,
+                                              [(process_element_func, seed, index, element, implanting, worker_state) for
+                                               index, (element, implanting, seed) in
+                                               enumerate(zip(simulation_state.dataset.get_data(), implantings, seeds))])
+
+        return processed_elements
+
+    @staticmethod
+    def _make_element_seeds(seed: int, element_count: int) -> list:
+        """spawns an independent seed per element from the simulation seed; if the seed is not set, it is drawn from the random module"""
+        seed_sequence = np.random.SeedSequence(seed if seed is not None else random.getrandbits(128))
+        return [int(element_seed.generate_state(1)[0]) for element_seed in seed_sequence.spawn(element_count)]
 
-        for index, element in enumerate(simulation_state.dataset.get_data()):
+    @staticmethod
+    def _get_implanting_per_element(implantings: list, simulation_limits: dict, element_count: int) -> list:
+        """for each element in the dataset returns the implanting to apply to it or None if no signal should be implanted"""
+        implanting_per_element = []
+        current_implanting_index = 0
+        current_implanting = implantings[current_implanting_index]
 
+        for index in range(element_count):
             if current_implanting is not None and index >= simulation_limits[current_implanting.name]:
                 current_implanting_index += 1
                 if current_implanting_index < len(simulation_limits.keys()):
-                    current_implanting = simulation_state.simulation.implantings[current_implanting_index]
+                    current_implanting = implantings[current_implanting_index]
                 else:
                     current_implanting = None
+            implanting_per_element.append(current_implanting)
 
-            processed_element = process_element_func(index, element, current_implanting, simulation_state)
-            processed_elements.append(processed_element)
+        return implanting_per_element
 
-        return processed_elements
+    @staticmethod
+    def _process_with_seed(process_element_func, seed: int, index, element, implanting, simulation_state):
+        random.seed(seed)
+        np.random.seed(seed)
+        return process_element_func(index, element, implanting, simulation_state)
 
     @staticmethod
     def _process_receptor(index, receptor, implanting, simulation_state) -> Receptor:
@@ -105,13 +137,9 @@ class SignalImplanter(Step):
             return SignalImplanter._implant_in_repertoire(index, repertoire, current_implanting, simulation_state)
 
         else:
-            new_repertoire = Repertoire.build_from_sequence_objects(repertoire.sequences, simulation_state.result_path / "repertoires",
-                                                                    repertoire.metadata)
-
-            for signal in simulation_state.signals:
-                new_repertoire.metadata[f"{signal.id}"] = False
-
-            return new_repertoire
+            # the sequences are not changed, so the repertoire data file is linked instead of rewritten and only the metadata are new
+            metadata = {**repertoire.metadata, **{f"{signal.id}": False for signal in simulation_state.signals}}
+            return Repertoire.build_with_metadata(repertoire, simulation_state.result_path / "repertoires", metadata)
 
     @staticmethod
     def _create_metadata_file(processed_repertoires: List[Repertoire], simulation_state) -> str:
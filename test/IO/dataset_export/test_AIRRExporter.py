@@ -75,6 +75,24 @@ class TestAIRRExporter(TestCase):
 
         shutil.rmtree(path)
 
+    def test_repertoire_export_in_chunks(self):
+        path = EnvironmentSettings.tmp_test_path / "airr_exporter_repertoire_chunks/"
+        PathBuilder.build(path)
+
+        repertoire, metadata_path = self.create_dummy_repertoire(path)
+        dataset = RepertoireDataset(repertoires=[repertoire], metadata_file=metadata_path)
+
+        AIRRExporter.export(dataset, path / "exported")
+        AIRRExporter.export(dataset, path / "exported_chunks", number_of_processes=2, chunk_size=1, compress=True)
+
+        resulting_data = pd.read_csv(path / f"exported/repertoires/{repertoire.identifier}.tsv", sep="\t")
+        chunked_data = pd.read_csv(path / f"exported_chunks/repertoires/{repertoire.identifier}.tsv.gz", sep="\t")
+
+        pd.testing.assert_frame_equal(resulting_data, chunked_data)
+        self.assertEqual(f"repertoires/{repertoire.identifier}.tsv.gz", pd.read_csv(path / "exported_chunks/metadata.csv")["filename"][0])
+
+        shutil.rmtree(path)
+
     def create_dummy_receptordataset(self, path):
         receptors = [TCABReceptor(identifier="1",
                                   alpha=ReceptorSequence(amino_acid_sequence="AAATTT", identifier="1a",
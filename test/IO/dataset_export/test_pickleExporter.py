@@ -1,12 +1,17 @@
 import os
 import pickle
 import shutil
+from pathlib import Path
 from unittest import TestCase
 
+import numpy as np
+import pandas as pd
+
 from immuneML.IO.dataset_export.PickleExporter import PickleExporter
 from immuneML.caching.CacheType import CacheType
 from immuneML.data_model.dataset.ReceptorDataset import ReceptorDataset
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
+from immuneML.data_model.repertoire.Repertoire import Repertoire
 from immuneML.environment.Constants import Constants
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.simulation.dataset_generation.RandomDatasetGenerator import RandomDatasetGenerator
@@ -36,6 +41,37 @@ class TestPickleExporter(TestCase):
         self.assertEqual(2, len(dataset2.get_data()))
         self.assertEqual("rep_0", dataset2.get_data()[0].metadata["subject_id"])
 
+    def test_export_legacy_repertoires(self):
+        path = EnvironmentSettings.tmp_test_path / "pickleexporter_legacy/"
+        PathBuilder.build(path)
+
+        repertoires, metadata = RepertoireBuilder.build([["AA", "CC"], ["CC"]], path)
+        PathBuilder.build(path / "legacy/")
+        legacy_repertoires = []
+        for repertoire in repertoires:
+            data = repertoire.load_data()
+            legacy_data = np.array(list(map(tuple, data)), dtype=[(name, object) for name in data.dtype.names])
+            legacy_filename = path / f"legacy/{repertoire.data_filename.stem}.npy"
+            np.save(str(legacy_filename), legacy_data)
+            legacy_repertoires.append(Repertoire(legacy_filename, repertoire.metadata_filename, repertoire.identifier))
+
+        metadata_df = pd.read_csv(metadata)
+        metadata_df["filename"] = [repertoire.data_filename for repertoire in legacy_repertoires]
+        metadata_df.to_csv(metadata, index=False)
+
+        dataset = RepertoireDataset(repertoires=legacy_repertoires, metadata_file=metadata)
+        exported_dataset = PickleExporter.export(dataset, path / "exported/")
+
+        self.assertTrue(all(repertoire.is_columnar() for repertoire in exported_dataset.repertoires))
+        self.assertTrue(all(repertoire.data_filename.is_file() for repertoire in exported_dataset.repertoires))
+        self.assertListEqual(["AA", "CC"], exported_dataset.repertoires[0].get_sequence_aas().tolist())
+
+        exported_metadata = pd.read_csv(exported_dataset.metadata_file, comment=Constants.COMMENT_SIGN)
+        self.assertListEqual([repertoire.data_filename.name for repertoire in exported_dataset.repertoires],
+                             [Path(filename).name for filename in exported_metadata["filename"]])
+
+        shutil.rmtree(path)
+
     def test_export_receptor_dataset(self):
         path = EnvironmentSettings.tmp_test_path / "pickleexporter_receptor/"
         PathBuilder.build(path)
@@ -51,3 +87,28 @@ class TestPickleExporter(TestCase):
         self.assertEqual(10, dataset2.get_example_count())
 
         shutil.rmtree(path)
+
+    def test_export_with_links(self):
+        path = EnvironmentSettings.tmp_test_path / "pickleexporter_links/"
+        PathBuilder.build(path)
+
+        repertoires, metadata = RepertoireBuilder.build([["AA"], ["CC"]], path / "data")
+        dataset = RepertoireDataset(repertoires=repertoires, metadata_file=metadata)
+
+        linked_dataset = PickleExporter.export(dataset, path / "linked/")
+        copied_dataset = PickleExporter.export(dataset, path / "copied/", link_files=False)
+
+        for repertoire, linked_repertoire, copied_repertoire in zip(dataset.repertoires, linked_dataset.repertoires, copied_dataset.repertoires):
+            self.assertTrue(os.path.samefile(repertoire.data_filename, linked_repertoire.data_filename))
+            self.assertTrue(os.path.samefile(repertoire.metadata_filename, linked_repertoire.metadata_filename))
+            self.assertFalse(os.path.samefile(repertoire.data_filename, copied_repertoire.data_filename))
+            self.assertListEqual(repertoire.get_sequence_aas().tolist(), linked_repertoire.get_sequence_aas().tolist())
+
+        self.assertFalse(os.path.samefile(metadata, linked_dataset.metadata_file))
+
+        # rebuilding a repertoire in the original location replaces the file, so the exported dataset keeps the old content
+        Repertoire.build(sequence_aas=["DD"], path=path / "data/repertoires/", metadata={},
+                         filename_base=dataset.repertoires[0].data_filename.stem)
+        self.assertListEqual(["AA"], linked_dataset.repertoires[0].get_sequence_aas().tolist())
+
+        shutil.rmtree(path)
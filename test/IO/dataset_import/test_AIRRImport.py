@@ -79,6 +79,33 @@ rep2.tsv,2""")
 
         shutil.rmtree(path)
 
+    def test_import_repertoire_dataset_in_chunks(self):
+        path = EnvironmentSettings.root_path / "test/tmp/ioairr_chunks/"
+        PathBuilder.build(path)
+        self.create_dummy_dataset(path, True)
+
+        def make_params(result_path, chunk_size):
+            return {"is_repertoire": True, "result_path": result_path, "path": path, "metadata_file": path / "metadata.csv",
+                    "import_out_of_frame": False, "import_with_stop_codon": False, "import_illegal_characters": False,
+                    "import_productive": True, "region_type": "IMGT_CDR3", "import_empty_nt_sequences": True, "import_empty_aa_sequences": False,
+                    "column_mapping": self.get_column_mapping(), "separator": "\t", "chunk_size": chunk_size}
+
+        dataset = AIRRImport.import_dataset(make_params(path / "whole", None), "airr_repertoire_dataset")
+        chunked_dataset = AIRRImport.import_dataset(make_params(path / "chunked", 2), "airr_chunked_dataset")
+
+        self.assertEqual(2, chunked_dataset.get_example_count())
+        for repertoire, chunked_repertoire in zip(dataset.get_data(), chunked_dataset.get_data()):
+            self.assertEqual(len(repertoire.sequences), len(chunked_repertoire.sequences))
+            self.assertListEqual(repertoire.get_field_names(), chunked_repertoire.get_field_names())
+            self.assertListEqual(list(repertoire.get_sequence_identifiers()), list(chunked_repertoire.get_sequence_identifiers()))
+            self.assertListEqual(list(repertoire.get_sequence_aas()), list(chunked_repertoire.get_sequence_aas()))
+            self.assertListEqual(list(repertoire.get_v_genes()), list(chunked_repertoire.get_v_genes()))
+            self.assertListEqual(list(repertoire.get_counts()), list(chunked_repertoire.get_counts()))
+            self.assertListEqual(list(repertoire.get_chains()), list(chunked_repertoire.get_chains()))
+            self.assertListEqual(list(repertoire.get_attribute("junction_length")), list(chunked_repertoire.get_attribute("junction_length")))
+
+        shutil.rmtree(path)
+
     def test_sequence_dataset(self):
         path = EnvironmentSettings.root_path / "test/tmp/ioairr/"
         PathBuilder.build(path)
@@ -0,0 +1,61 @@
+import os
+import random
+import shutil
+from unittest import TestCase
+
+from immuneML.analysis.ReferenceSequenceIndex import ReferenceSequenceIndex
+from immuneML.analysis.SequenceMatcher import SequenceMatcher
+from immuneML.caching.CacheType import CacheType
+from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
+from immuneML.data_model.repertoire.Repertoire import Repertoire
+from immuneML.environment.Constants import Constants
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.util.PathBuilder import PathBuilder
+
+
+class TestReferenceSequenceIndex(TestCase):
+
+    def setUp(self) -> None:
+        os.environ[Constants.CACHE_TYPE] = CacheType.TEST.name
+
+    def test_find_matches(self):
+        reference = [ReceptorSequence("AAAACA", metadata=SequenceMetadata(chain="A", v_gene="V1", j_gene="J2")),
+                     ReceptorSequence("TADQV", metadata=SequenceMetadata(chain="A", v_gene="V1-1", j_gene="J3")),
+                     ReceptorSequence("TADQV", metadata=SequenceMetadata(chain="B", v_gene="V1", j_gene="J3"))]
+
+        index = ReferenceSequenceIndex(reference, 0)
+        self.assertEqual([1], index.find_matches("TADQV", reference[1].metadata.chain, "V1", "J3"))
+        self.assertEqual([2], index.find_matches("TADQV", reference[2].metadata.chain, "V1-2", "J3"))
+        self.assertEqual([], index.find_matches("TADQV", reference[1].metadata.chain, "V1-2", "J3"))
+        self.assertEqual([], index.find_matches("TADQVF", reference[1].metadata.chain, "V1", "J3"))
+
+        index = ReferenceSequenceIndex(reference, 2)
+        self.assertEqual([1], index.find_matches("TADQVF", reference[1].metadata.chain, "V1", "J3"))
+        self.assertEqual([0], index.find_matches("AAAAAA", reference[0].metadata.chain, "V1", "J2"))
+        self.assertEqual([], index.find_matches("CCCCCC", reference[0].metadata.chain, "V1", "J2"))
+
+    def test_match_repertoire(self):
+        path = EnvironmentSettings.tmp_test_path / "reference_sequence_index/"
+        PathBuilder.build(path)
+
+        random.seed(1)
+        alphabet, genes = "ACDE", ["V1", "V1-1", "V1-2", "V2"]
+
+        def make_sequence(identifier):
+            return ReceptorSequence(amino_acid_sequence="".join(random.choices(alphabet, k=random.randint(3, 6))), identifier=str(identifier),
+                                    metadata=SequenceMetadata(chain=random.choice(["A", "B"]), v_gene=random.choice(genes),
+                                                              j_gene=random.choice(["J1", "J1-1"]), count=random.randint(1, 5)))
+
+        reference = [make_sequence(i) for i in range(30)]
+        repertoire = Repertoire.build_from_sequence_objects([make_sequence(i) for i in range(200)], path=path, metadata={})
+
+        matcher = SequenceMatcher()
+        for max_distance in range(3):
+            expected = [sum(sequence.metadata.count for sequence in repertoire.sequences
+                            if matcher.matches_sequence(reference_sequence, sequence, max_distance))
+                        for reference_sequence in reference]
+
+            self.assertListEqual(expected, list(ReferenceSequenceIndex(reference, max_distance).match_repertoire(repertoire)))
+
+        shutil.rmtree(path)
@@ -1,4 +1,3 @@
-import hashlib
 import os
 import pickle
 from unittest import TestCase
@@ -20,7 +19,7 @@ class TestCacheHandler(TestCase):
         obj = "object_example"
         object_type = CacheObjectType.OTHER
 
-        h = hashlib.sha256(str(params).encode('utf-8')).hexdigest()
+        h = CacheHandler.generate_cache_key(params)
         filename = EnvironmentSettings.get_cache_path() / "{}/{}.pickle".format(CacheObjectType.OTHER.name.lower(), h)
         with open(filename, "wb") as file:
             pickle.dump(obj, file)
@@ -85,3 +84,26 @@ class TestCacheHandler(TestCase):
         self.assertTrue(os.path.isfile(EnvironmentSettings.get_cache_path() / f"encoding/{cache_key}.pickle"))
 
         os.remove(CacheHandler._build_filename(cache_key, CacheObjectType.ENCODING))
+
+    def test_memo_with_memory_cache(self):
+        CacheHandler.set_memory_limit(10 ** 6)
+        CacheHandler.get_memory_cache().clear()
+
+        calls = []
+        fn = lambda: calls.append(1) or {"a": [1, 2, 3]}
+        cache_key = "m123"
+
+        obj = CacheHandler.memo(cache_key, fn, CacheObjectType.ENCODING)
+        obj2 = CacheHandler.memo(cache_key, fn, CacheObjectType.ENCODING)
+        self.assertEqual(1, len(calls))
+        self.assertTrue(obj is obj2)
+        self.assertEqual(1, CacheHandler.get_memory_cache_stats()["hits"])
+
+        self.assertIsNone(CacheHandler.get_by_key(cache_key, CacheObjectType.OTHER))
+
+        os.remove(CacheHandler._build_filename(cache_key, CacheObjectType.ENCODING))
+        self.assertIsNone(CacheHandler.get_by_key(cache_key, CacheObjectType.ENCODING))
+        self.assertEqual(0, len(CacheHandler.get_memory_cache()))
+
+        CacheHandler.set_memory_limit(0)
+        CacheHandler.get_memory_cache().clear()
@@ -0,0 +1,82 @@
+import os
+import shutil
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from immuneML.caching.CacheType import CacheType
+from immuneML.caching.Fingerprinter import Fingerprinter
+from immuneML.environment.Constants import Constants
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.util.PathBuilder import PathBuilder
+
+
+class Parameters:
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TestFingerprinter(TestCase):
+
+    def setUp(self) -> None:
+        os.environ[Constants.CACHE_TYPE] = CacheType.TEST.name
+
+    def test_fingerprint(self):
+        examples = np.zeros((1000, 1000))
+        changed_examples = examples.copy()
+        changed_examples[500, 500] = 1
+
+        self.assertEqual(str(examples), str(changed_examples))
+        self.assertNotEqual(Fingerprinter.fingerprint(examples), Fingerprinter.fingerprint(changed_examples))
+        self.assertEqual(Fingerprinter.fingerprint(examples), Fingerprinter.fingerprint(examples.copy()))
+        self.assertNotEqual(Fingerprinter.fingerprint(examples), Fingerprinter.fingerprint(examples.astype(np.float32)))
+        self.assertNotEqual(Fingerprinter.fingerprint(examples), Fingerprinter.fingerprint(examples.reshape(100, 10000)))
+
+        sparse_examples = sparse.csr_matrix(changed_examples)
+        self.assertEqual(Fingerprinter.fingerprint(sparse_examples), Fingerprinter.fingerprint(sparse_examples.copy()))
+        self.assertNotEqual(Fingerprinter.fingerprint(sparse_examples), Fingerprinter.fingerprint(sparse.csr_matrix(examples)))
+
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        self.assertEqual(Fingerprinter.fingerprint(df), Fingerprinter.fingerprint(df.copy()))
+        self.assertNotEqual(Fingerprinter.fingerprint(df), Fingerprinter.fingerprint(df.rename(columns={"b": "c"})))
+
+        self.assertNotEqual(Fingerprinter.fingerprint((("k", 1),)), Fingerprinter.fingerprint((("k", "1"),)))
+        self.assertEqual(Fingerprinter.fingerprint({"a", "b"}), Fingerprinter.fingerprint({"b", "a"}))
+
+    def test_fingerprint_object(self):
+        first, second = Parameters(1), Parameters(1)
+        self.assertEqual(Fingerprinter.fingerprint(first), Fingerprinter.fingerprint(second))
+        self.assertNotEqual(Fingerprinter.fingerprint(first), Fingerprinter.fingerprint(Parameters(2)))
+
+        with self.assertRaises(TypeError):
+            Fingerprinter.fingerprint(object())
+
+    def test_fingerprint_function(self):
+        self.assertNotEqual(Fingerprinter.fingerprint(lambda x: x + 1), Fingerprinter.fingerprint(lambda x: x + 2))
+        self.assertEqual(Fingerprinter.fingerprint(lambda x: x + 1), Fingerprinter.fingerprint(lambda x: x + 1))
+
+        def make_function(value):
+            return lambda x: x + value
+
+        self.assertNotEqual(Fingerprinter.fingerprint(make_function(1)), Fingerprinter.fingerprint(make_function(2)))
+
+    def test_fingerprint_cycle(self):
+        first, second = Parameters(1), Parameters(1)
+        first.value, second.value = [first], [second]
+
+        self.assertEqual(Fingerprinter.fingerprint(first), Fingerprinter.fingerprint(second))
+        self.assertNotEqual(Fingerprinter.fingerprint(first), Fingerprinter.fingerprint(Parameters([Parameters(1)])))
+
+    def test_fingerprint_file(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "fingerprinter/")
+        file_path = path / "file.txt"
+        file_path.write_text("abc")
+        fingerprint = Fingerprinter.fingerprint(file_path)
+
+        file_path.write_text("abcd")
+        self.assertNotEqual(fingerprint, Fingerprinter.fingerprint(file_path))
+
+        shutil.rmtree(path)
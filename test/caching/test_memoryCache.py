@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from immuneML.caching.MemoryCache import MemoryCache
+
+
+class TestMemoryCache(TestCase):
+
+    def test_add_and_get(self):
+        cache = MemoryCache(capacity=10)
+
+        cache.add("a", "obj_a", 4)
+        cache.add("b", "obj_b", 4)
+        self.assertEqual("obj_a", cache.get("a"))
+
+        cache.add("c", "obj_c", 4)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual("obj_a", cache.get("a"))
+        self.assertEqual("obj_c", cache.get("c"))
+
+        cache.add("d", "obj_d", 11)
+        self.assertIsNone(cache.get("d"))
+
+        self.assertEqual({"capacity": 10, "size": 8, "items": 2, "hits": 3, "misses": 2, "evictions": 1}, cache.get_stats())
+
+        cache.set_capacity(5)
+        self.assertEqual(1, len(cache))
+        self.assertTrue("c" in cache)
+        self.assertEqual(4, cache.size)
+
+        cache.set_capacity(0)
+        self.assertFalse(cache.is_enabled())
+        self.assertEqual(0, len(cache))
@@ -3,6 +3,8 @@ from unittest import TestCase
 
 import numpy as np
 
+from immuneML.IO.dataset_export.PickleExporter import PickleExporter
+from immuneML.data_model.dataset.Dataset import Dataset
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.simulation.dataset_generation.RandomDatasetGenerator import RandomDatasetGenerator
 from immuneML.util.PathBuilder import PathBuilder
@@ -23,3 +25,32 @@ class TestReceptorDataset(TestCase):
         self.assertTrue(np.array_equal(['2', '2'], dataset.get_metadata(['l1', 'l2'])['l2']))
 
         shutil.rmtree(path)
+
+    def test_make_subset(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "receptor_dataset_subset/")
+
+        dataset = RandomDatasetGenerator.generate_receptor_dataset(25, {3: 1.}, {4: 1.}, {"l1": {"a": 0.5, "b": 0.5}}, path / "dataset",
+                                                                   file_size=10)
+        ids = dataset.get_example_ids()
+
+        subset = dataset.make_subset([22, 3, 11, 12, 15], path / "subset", Dataset.TRAIN)
+
+        self.assertListEqual(dataset.get_filenames(), subset.get_filenames())
+        self.assertFalse((path / "subset").exists())
+        self.assertListEqual([ids[i] for i in [3, 11, 12, 15, 22]], subset.get_example_ids())
+        self.assertListEqual([ids[i] for i in [3, 11, 12, 15, 22]], [receptor.identifier for receptor in subset.get_data()])
+        self.assertListEqual([1, 3, 1], [len(batch) for batch in subset.get_batch()])
+        self.assertListEqual(dataset.get_attribute("l1")[[3, 11, 12, 15, 22]].tolist(), subset.get_attribute("l1").tolist())
+
+        nested_subset = subset.make_subset([4, 1], path / "nested_subset", Dataset.TEST)
+
+        self.assertEqual(2, nested_subset.get_example_count())
+        self.assertListEqual([ids[11], ids[22]], [receptor.identifier for receptor in nested_subset.get_examples([0, 1])])
+
+        exported = PickleExporter.export(nested_subset, path / "exported")
+
+        self.assertIsNone(exported.element_indices)
+        self.assertTrue(all(filename.parent == path / "exported" for filename in exported.get_filenames()))
+        self.assertListEqual([ids[11], ids[22]], [receptor.identifier for receptor in exported.get_data()])
+
+        shutil.rmtree(path)
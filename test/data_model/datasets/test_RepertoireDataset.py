@@ -1,5 +1,10 @@
+import os
 import shutil
 from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
 
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
@@ -21,3 +26,28 @@ class TestRepertoireDataset(TestCase):
         self.assertTrue("subject_id" in dataset.get_metadata_fields())
 
         shutil.rmtree(path)
+
+    def test_get_metadata(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "repertoire_dataset_metadata/")
+
+        repertoires, metadata = RepertoireBuilder.build([["AA"], ["BB"], ["CC"]], path, {"l1": [1, 2, 1], "hla": ["A", "B", None]},
+                                                        subject_ids=["d1", "d2", "d3"])
+        dataset = RepertoireDataset(repertoires=repertoires, metadata_file=metadata)
+
+        with patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+            self.assertDictEqual({"l1": [1, 2, 1], "hla": ["A", "B", np.nan]}, dataset.get_metadata(["hla", "l1"]))
+            df = dataset.get_metadata(["l1", "subject_id"], return_df=True)
+            self.assertEqual(1, read_csv.call_count)
+
+        self.assertEqual(np.int64, df["l1"].dtype)
+        self.assertListEqual(["d1", "d2", "d3"], df["subject_id"].tolist())
+        self.assertRaises(ValueError, dataset.get_metadata, ["l2"])
+
+        df = pd.read_csv(metadata)
+        df["l1"] = [3, 3, 3]
+        df.to_csv(str(metadata) + ".tmp", index=False)
+        os.replace(str(metadata) + ".tmp", metadata)
+
+        self.assertListEqual([3, 3, 3], dataset.get_metadata(["l1"])["l1"])
+
+        shutil.rmtree(path)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from immuneML.data_model.receptor.BCReceptor import BCReceptor
+from immuneML.data_model.receptor.ElementColumnHelper import ElementColumnHelper
+from immuneML.data_model.receptor.RegionType import RegionType
+from immuneML.data_model.receptor.TCABReceptor import TCABReceptor
+from immuneML.data_model.receptor.receptor_sequence.Chain import Chain
+from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.data_model.receptor.receptor_sequence.SequenceAnnotation import SequenceAnnotation
+from immuneML.data_model.receptor.receptor_sequence.SequenceFrameType import SequenceFrameType
+from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
+from immuneML.simulation.implants.ImplantAnnotation import ImplantAnnotation
+
+
+class TestElementColumnHelper(TestCase):
+
+    def test_sequences(self):
+        sequences = [ReceptorSequence("CASS", identifier="1", metadata=SequenceMetadata(v_gene="TRBV1", chain="TRB", count=3,
+                                                                                         region_type="IMGT_CDR3", custom_params={"epitope": "e1"})),
+                     ReceptorSequence("CAT", "TGT", identifier="2", annotation=SequenceAnnotation([ImplantAnnotation(signal_id="s1")]),
+                                      metadata=SequenceMetadata(j_gene="TRBJ1", custom_params={"l2": True}))]
+
+        columns = ElementColumnHelper.to_columns(sequences)
+
+        self.assertNotIn("v_alleles", columns)
+        self.assertListEqual(["CASS", "CAT"], columns["sequence_aas"])
+        self.assertListEqual(["e1", None], columns["epitope"])
+        self.assertIn("chains", ElementColumnHelper.get_categorical_columns(columns))
+
+        new_sequences = ElementColumnHelper.from_columns(columns)
+
+        self.assertListEqual(["1", "2"], [sequence.identifier for sequence in new_sequences])
+        self.assertListEqual([None, "TGT"], [sequence.nucleotide_sequence for sequence in new_sequences])
+        self.assertEqual(Chain.BETA, new_sequences[0].metadata.chain)
+        self.assertEqual(RegionType.IMGT_CDR3, new_sequences[0].metadata.region_type)
+        self.assertEqual(SequenceFrameType.IN, new_sequences[1].metadata.frame_type)
+        self.assertEqual(3, new_sequences[0].metadata.count)
+        self.assertEqual("e1", new_sequences[0].metadata.get_attribute("epitope"))
+        self.assertTrue(new_sequences[1].metadata.get_attribute("l2"))
+        self.assertIsNone(new_sequences[0].annotation)
+        self.assertEqual("s1", new_sequences[1].annotation.implants[0].signal_id)
+
+    def test_receptors(self):
+        receptors = [TCABReceptor(alpha=ReceptorSequence("AAA", identifier="a1", metadata=SequenceMetadata(chain="TRA")),
+                                  beta=ReceptorSequence("CCC", identifier="b1", metadata=SequenceMetadata(chain="TRB")),
+                                  metadata={"epitope": "e1", "signal.1": True}, identifier="r1"),
+                     BCReceptor(heavy=ReceptorSequence("DDD", metadata=SequenceMetadata(chain="IGH")),
+                                light=ReceptorSequence("EEE", metadata=SequenceMetadata(chain="IGL")), identifier="r2")]
+
+        columns = ElementColumnHelper.to_columns(receptors)
+
+        self.assertListEqual(["AAA", None], columns["alpha.sequence_aas"])
+        self.assertListEqual([None, "DDD"], columns["heavy.sequence_aas"])
+        self.assertListEqual(["TCABReceptor", "BCReceptor"], columns["receptor_types"])
+
+        new_receptors = ElementColumnHelper.from_columns(columns)
+
+        self.assertIsInstance(new_receptors[0], TCABReceptor)
+        self.assertIsInstance(new_receptors[1], BCReceptor)
+        self.assertListEqual(["r1", "r2"], [receptor.identifier for receptor in new_receptors])
+        self.assertEqual("CCC", new_receptors[0].beta.amino_acid_sequence)
+        self.assertEqual("a1", new_receptors[0].alpha.identifier)
+        self.assertEqual(Chain.LIGHT, new_receptors[1].light.metadata.chain)
+        self.assertDictEqual({"epitope": "e1", "signal.1": True}, new_receptors[0].metadata)
+        self.assertDictEqual({"epitope": None, "signal.1": None}, new_receptors[1].metadata)
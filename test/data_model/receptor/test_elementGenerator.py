@@ -1,3 +1,4 @@
+import os
 import pickle
 import shutil
 from unittest import TestCase
@@ -6,6 +7,7 @@ from immuneML.data_model.dataset.SequenceDataset import SequenceDataset
 from immuneML.data_model.receptor.BCReceptor import BCReceptor
 from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.data_model.receptor.receptor_sequence.SequenceMetadata import SequenceMetadata
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.util.PathBuilder import PathBuilder
 
@@ -76,4 +78,58 @@ class TestElementGenerator(TestCase):
 
         shutil.rmtree(path)
 
+    def test_get_elements(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "element_generator_index/")
 
+        sequences = [ReceptorSequence(amino_acid_sequence="AAA", identifier=str(i)) for i in range(25)]
+        file_list = [path / f"batch{i}.pkl" for i in range(3)]
+        ElementGenerator.store_elements(file_list[0], sequences[:10])
+        ElementGenerator.store_elements(file_list[1], sequences[10:13])
+        with file_list[2].open("wb") as file:
+            pickle.dump(sequences[13:], file)
+
+        self.assertTrue(ElementGenerator.get_index_filename(file_list[1]).is_file())
+        self.assertFalse(ElementGenerator.get_index_filename(file_list[2]).is_file())
+
+        generator = ElementGenerator(file_list, file_size=10)
+
+        self.assertEqual(25, generator.get_element_count())
+        self.assertListEqual([str(i) for i in range(25)], generator.get_element_ids())
+        self.assertListEqual([0, 10, 13, 25], generator.get_file_offsets().tolist())
+        self.assertListEqual(["24", "3", "12", "13"], [sequence.identifier for sequence in generator.get_elements([24, 3, 12, 13])])
+
+        subset_filenames = generator.make_subset([24, 12, 3, 12], path, SequenceDataset.TRAIN, "subset")
+        subset = SequenceDataset(filenames=subset_filenames, file_size=10)
+
+        self.assertListEqual(["3", "12", "12", "24"], subset.get_example_ids())
+        self.assertTrue(all(ElementGenerator.get_index_filename(filename).is_file() for filename in subset_filenames))
+
+        # storing a batch again replaces its index file, so a hard link to the old index file keeps the old content
+        linked_index = path / "linked.iml_index"
+        os.link(ElementGenerator.get_index_filename(file_list[1]), linked_index)
+        ElementGenerator.store_elements(file_list[1], sequences[10:12])
+
+        self.assertEqual(2, ElementGenerator(file_list[1:2]).get_element_count())
+        with linked_index.open("rb") as file:
+            self.assertEqual(3, pickle.load(file)["element_count"])
+
+        shutil.rmtree(path)
+
+    def test_get_attributes(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "element_generator_attributes/")
+
+        sequences = [ReceptorSequence(amino_acid_sequence="A" * (i + 1), identifier=str(i),
+                                      metadata=SequenceMetadata(chain="TRB", custom_params={"l1": i} if i > 3 else {})) for i in range(7)]
+        file_list = [path / "batch0.npz", path / "batch1.pkl", path / "batch2.npz"]
+        for filename, batch in zip(file_list, [sequences[:3], sequences[3:5], sequences[5:]]):
+            ElementGenerator.store_elements(filename, batch)
+
+        generator = ElementGenerator(file_list)
+        attributes = generator.get_attributes(["sequence_aas", "l1", "cell_ids"])
+
+        self.assertListEqual(["sequence_aas", "l1"], list(attributes.keys()))
+        self.assertListEqual([sequence.amino_acid_sequence for sequence in sequences], attributes["sequence_aas"].tolist())
+        self.assertListEqual([None, None, None, None, 4, 5, 6], attributes["l1"].tolist())
+        self.assertListEqual(["TRB" for _ in range(7)], [sequence.metadata.chain.value for sequence in generator.build_element_generator()])
+
+        shutil.rmtree(path)
@@ -1,4 +1,5 @@
 import os
+import pickle
 import shutil
 from unittest import TestCase
 
@@ -92,3 +93,66 @@ class TestRepertoire(TestCase):
         self.assertEqual(2, len(cells))
 
         shutil.rmtree(path)
+
+    def test_columnar_storage(self):
+        path = EnvironmentSettings.tmp_test_path / "columnarrepertoire/"
+        PathBuilder.build(path)
+
+        repertoire = Repertoire.build(sequence_aas=["AAA", "CCCC", "DD"], v_genes=["TRBV1", "TRBV2", "TRBV1"], j_genes=["TRBJ1", None, "TRBJ1"],
+                                      counts=["3", "10", None], chains=[Chain.BETA, Chain.BETA, Chain.BETA], path=path,
+                                      custom_lists={"custom": [1, 2, 3]}, metadata={"subject_id": "1"})
+
+        self.assertTrue(repertoire.is_columnar())
+        self.assertEqual(3, repertoire.get_element_count())
+        self.assertEqual("<U4", repertoire.get_sequence_aas().dtype.str)
+        self.assertListEqual(["TRBV1", "TRBV2", "TRBV1"], repertoire.get_v_genes().tolist())
+        self.assertListEqual(["TRBJ1", None, "TRBJ1"], repertoire.get_j_genes().tolist())
+        self.assertListEqual([3, 10, None], repertoire.get_counts().tolist())
+        self.assertListEqual([Chain.BETA, Chain.BETA, Chain.BETA], repertoire.get_chains().tolist())
+        self.assertListEqual([Chain.BETA, Chain.BETA, Chain.BETA], repertoire.get_attribute("chains").tolist())
+        self.assertListEqual(["TRBV1", "TRBV2", "TRBV1"], repertoire.get_attribute("v_genes").tolist())
+        self.assertListEqual([1, 2, 3], repertoire.get_attribute("custom").tolist())
+        self.assertIsNone(repertoire.get_attribute("cell_ids"))
+        self.assertEqual({"sequence_aas", "v_genes"}, set(repertoire.get_attributes(["sequence_aas", "v_genes", "cell_ids"]).keys()))
+
+        subset = Repertoire.build_like(repertoire, [0, 2], path / "subset/")
+        self.assertListEqual(["AAA", "DD"], subset.get_sequence_aas().tolist())
+        self.assertListEqual([3, None], subset.get_counts().tolist())
+        self.assertEqual("1", subset.metadata["subject_id"])
+
+        data = repertoire.load_data()
+        legacy_data = np.array(list(map(tuple, data)), dtype=[(name, object) for name in data.dtype.names])
+        np.save(str(path / "legacy.npy"), legacy_data)
+        legacy_repertoire = Repertoire(path / "legacy.npy", repertoire.metadata_filename, repertoire.identifier)
+
+        self.assertFalse(legacy_repertoire.is_columnar())
+
+        converted = Repertoire.convert_to_columnar(legacy_repertoire, path / "converted/")
+
+        self.assertTrue(converted.is_columnar())
+        self.assertEqual(repertoire.identifier, converted.identifier)
+        self.assertListEqual(["AAA", "CCCC", "DD"], converted.get_sequence_aas().tolist())
+        self.assertListEqual(["TRBJ1", None, "TRBJ1"], converted.get_j_genes().tolist())
+
+        shutil.rmtree(path)
+
+    def test_lazy_metadata(self):
+        path = EnvironmentSettings.tmp_test_path / "lazymetadatarepertoire/"
+        PathBuilder.build(path)
+
+        built = Repertoire.build(sequence_aas=["AAA", "CCCC"], path=path, metadata={"subject_id": "1"})
+        repertoire = Repertoire(built.data_filename, built.metadata_filename, built.identifier)
+
+        self.assertIsNone(repertoire._metadata)
+        self.assertEqual("1", repertoire.metadata["subject_id"])
+        self.assertEqual(built.metadata["field_list"], repertoire.fields)
+
+        legacy_state = {**pickle.loads(pickle.dumps(built)).__dict__, "fields": built.fields}
+        legacy_state["metadata"] = legacy_state.pop("_metadata")
+        legacy_repertoire = Repertoire.__new__(Repertoire)
+        legacy_repertoire.__setstate__(legacy_state)
+
+        self.assertEqual("1", legacy_repertoire.metadata["subject_id"])
+        self.assertNotIn("fields", legacy_repertoire.__dict__)
+
+        shutil.rmtree(path)
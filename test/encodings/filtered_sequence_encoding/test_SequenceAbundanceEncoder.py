@@ -138,4 +138,9 @@ class TestEmersonSequenceAbundanceEncoder(TestCase):
             np.allclose([SequenceFilterHelper.INVALID_P_VALUE, 0.1666666666666667, 0.5000000000000001, 1., SequenceFilterHelper.INVALID_P_VALUE,
                          0.8333333333333331, 1., 1., 2], p_values, equal_nan=True))
 
+        parallel_p_values = SequenceFilterHelper.find_label_associated_sequence_p_values(comparison_data, repertoires,
+                                                                                         Label('l1', [True, False], positive_class=True),
+                                                                                         number_of_processes=2)
+        self.assertTrue(np.allclose(p_values, parallel_p_values))
+
         shutil.rmtree(path)
@@ -1,9 +1,12 @@
 from unittest import TestCase
 
+import numpy as np
+
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.encodings.EncoderParams import EncoderParams
 from immuneML.encodings.kmer_frequency.sequence_encoding.KmerSequenceEncoder import KmerSequenceEncoder
 from immuneML.environment.LabelConfiguration import LabelConfiguration
+from immuneML.environment.SequenceType import SequenceType
 
 
 class TestKmerSequenceEncoder(TestCase):
@@ -29,3 +32,11 @@ class TestKmerSequenceEncoder(TestCase):
             ),
             None
         )
+
+    def test_encode_sequences(self):
+        params = EncoderParams(model={"k": 3, "sequence_type": SequenceType.AMINO_ACID}, label_config=LabelConfiguration(), result_path="",
+                               pool_size=4)
+        kmers, counts = KmerSequenceEncoder.encode_sequences({"sequence_aas": np.array(["CASSVF", "AC", "CASS"])}, np.array([1, 2, 3]), params)
+
+        self.assertListEqual(["ASS", "CAS", "SSV", "SVF"], kmers.tolist())
+        self.assertListEqual([4, 4, 1, 1], counts.tolist())
@@ -2,6 +2,9 @@ import os
 import shutil
 import unittest
 
+import numpy as np
+from scipy.sparse import csr_matrix
+
 from immuneML.caching.CacheType import CacheType
 from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
@@ -213,4 +216,38 @@ class TestOneHotEncoder(unittest.TestCase):
 
         self.assertListEqual(list(encoded_data.encoded_data.feature_names), [f"{seq}_{pos}_{char}" for seq in range(3) for pos in range(4) for char in EnvironmentSettings.get_sequence_alphabet()])
 
-        shutil.rmtree(path)
\ No newline at end of file
+        shutil.rmtree(path)
+
+    def test_repertoire_sparse(self):
+        path = EnvironmentSettings.root_path / "test/tmp/onehot_rep_sparse/"
+
+        PathBuilder.build(path)
+
+        dataset, lc = self._construct_test_repertoiredataset(path, positional=True)
+
+        encoded_datasets = []
+        for sparse in [True, False]:
+            encoder = OneHotEncoder.build_object(dataset, **{"use_positional_info": True, "distance_to_seq_middle": 6,
+                                                             "flatten": True, "sparse": sparse})
+
+            encoded_datasets.append(encoder.encode(dataset, EncoderParams(
+                result_path=path / f"sparse_{sparse}",
+                label_config=lc,
+                pool_size=1,
+                learn_model=True,
+                model={},
+                filename="dataset.pkl"
+            )))
+
+        sparse_encoded, dense_encoded = encoded_datasets
+
+        self.assertTrue(isinstance(sparse_encoded.encoded_data.examples, csr_matrix))
+        self.assertEqual((2, 2 * 17 * 23), sparse_encoded.encoded_data.examples.shape)
+        self.assertTrue(np.array_equal(dense_encoded.encoded_data.examples, sparse_encoded.encoded_data.examples.toarray()))
+        self.assertListEqual(dense_encoded.encoded_data.feature_names, sparse_encoded.encoded_data.feature_names)
+
+        with self.assertRaises(AssertionError):
+            OneHotEncoder.build_object(dataset, **{"use_positional_info": False, "distance_to_seq_middle": None, "flatten": False,
+                                                   "sparse": True})
+
+        shutil.rmtree(path)
@@ -0,0 +1,76 @@
+import os
+import random
+import shutil
+from unittest import TestCase
+
+from immuneML.caching.CacheType import CacheType
+from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
+from immuneML.encodings.kmer_frequency.KmerFrequencyEncoder import KmerFrequencyEncoder
+from immuneML.environment.Constants import Constants
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.environment.Label import Label
+from immuneML.environment.LabelConfiguration import LabelConfiguration
+from immuneML.environment.Metric import Metric
+from immuneML.hyperparameter_optimization.HPSetting import HPSetting
+from immuneML.hyperparameter_optimization.config.SplitConfig import SplitConfig
+from immuneML.hyperparameter_optimization.config.SplitType import SplitType
+from immuneML.hyperparameter_optimization.strategy.GridSearch import GridSearch
+from immuneML.ml_methods.LogisticRegression import LogisticRegression
+from immuneML.ml_methods.SVM import SVM
+from immuneML.util.PathBuilder import PathBuilder
+from immuneML.util.RepertoireBuilder import RepertoireBuilder
+from immuneML.workflows.instructions.TrainMLModelInstruction import TrainMLModelInstruction
+
+
+class TestHPScheduler(TestCase):
+
+    def setUp(self) -> None:
+        os.environ[Constants.CACHE_TYPE] = CacheType.TEST.name
+
+    def _run_instruction(self, dataset, path, number_of_processes: int):
+        encoder_params = {"normalization_type": "relative_frequency", "reads": "unique", "sequence_encoding": "continuous_kmer",
+                          "sequence_type": "amino_acid", "k": 2, "scale_to_zero_mean": True, "scale_to_unit_variance": True}
+        ml_params = {"model_selection_cv": False, "model_selection_n_folds": -1}
+        hp_settings = [HPSetting(KmerFrequencyEncoder.build_object(dataset, **encoder_params), encoder_params, ml_method, ml_params, [],
+                                 encoder_name="kmer", ml_method_name=ml_method_name)
+                       for ml_method, ml_method_name in [(LogisticRegression(), "log_reg"), (SVM(), "svm")]]
+
+        instruction = TrainMLModelInstruction(dataset, GridSearch(hp_settings), hp_settings, SplitConfig(SplitType.K_FOLD, 2),
+                                              SplitConfig(SplitType.K_FOLD, 2), {Metric.BALANCED_ACCURACY}, Metric.BALANCED_ACCURACY,
+                                              LabelConfiguration([Label("l1", [0, 1])]), path, number_of_processes=number_of_processes)
+        return instruction.run(result_path=path)
+
+    def _get_performances(self, state):
+        selection = {(index, key): [item.performance for item in items]
+                     for index, assessment_state in enumerate(state.assessment_states)
+                     for key, items in assessment_state.label_states["l1"].selection_state.hp_items.items()}
+        assessment = {(index, key): item.performance
+                      for index, assessment_state in enumerate(state.assessment_states)
+                      for key, item in assessment_state.label_states["l1"].assessment_items.items()}
+        return selection, assessment
+
+    def test_run(self):
+        path = EnvironmentSettings.tmp_test_path / "hp_scheduler/"
+        PathBuilder.build(path)
+
+        random.seed(1)
+        alphabet = EnvironmentSettings.get_sequence_alphabet()
+        sequences = [["".join(random.choices(alphabet, k=8)) for _ in range(10)] for _ in range(40)]
+        repertoires, metadata = RepertoireBuilder.build(sequences, path, labels={"l1": [i % 2 for i in range(40)]})
+        dataset = RepertoireDataset(repertoires=repertoires, metadata_file=metadata, labels={"l1": [0, 1]})
+
+        sequential_state = self._run_instruction(dataset, path / "sequential", number_of_processes=1)
+        parallel_state = self._run_instruction(dataset, path / "parallel", number_of_processes=3)
+
+        self.assertEqual(2, len(parallel_state.assessment_states))
+        self.assertEqual(2, len(parallel_state.assessment_states[0].label_states["l1"].assessment_items))
+
+        # settings which differ only in the ML method are encoded once
+        selection_path = parallel_state.assessment_states[0].label_states["l1"].selection_state.path / "split_1"
+        self.assertTrue((selection_path / "l1_kmer_log_reg/encoded_datasets").is_dir())
+        self.assertFalse((selection_path / "l1_kmer_svm/encoded_datasets").is_dir())
+        self.assertEqual(self._get_performances(sequential_state), self._get_performances(parallel_state))
+        self.assertEqual([state.label_states["l1"].optimal_hp_setting.get_key() for state in sequential_state.assessment_states],
+                         [state.label_states["l1"].optimal_hp_setting.get_key() for state in parallel_state.assessment_states])
+
+        shutil.rmtree(path)
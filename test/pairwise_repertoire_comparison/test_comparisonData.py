@@ -6,11 +6,13 @@ import numpy as np
 import pandas as pd
 
 from immuneML.caching.CacheType import CacheType
+from immuneML.data_model.dataset.RepertoireDataset import RepertoireDataset
 from immuneML.environment.Constants import Constants
 from immuneML.environment.EnvironmentSettings import EnvironmentSettings
 from immuneML.pairwise_repertoire_comparison.ComparisonData import ComparisonData
 from immuneML.pairwise_repertoire_comparison.ComparisonDataBatch import ComparisonDataBatch
 from immuneML.util.PathBuilder import PathBuilder
+from immuneML.util.RepertoireBuilder import RepertoireBuilder
 
 
 class TestComparisonData(TestCase):
@@ -21,13 +23,6 @@ class TestComparisonData(TestCase):
     def create_comparison_data(self, path: str):
         comparison_data = ComparisonData(repertoire_ids=["1", "2", "3", "4", "5", "6"], comparison_attributes=["col1", "col2"],
                                          sequence_batch_size=3, path=path)
-
-        comparison_data.tmp_batch_paths = []
-        batch0 = {("a", 1): {"1": 1}, ("b", 2): {"2": 1}, ("c", 3): {"3": 1}}
-        comparison_data.store_tmp_batch(batch0, 0)
-
-        batch1 = {("d", 4): {"1": 1}, ("e", 5): {"5": 1}}
-        comparison_data.store_tmp_batch(batch1, 1)
         comparison_data.matching_columns = ["col1", "col2"]
         comparison_data.item_count = 5
         df1 = pd.DataFrame({"1": [1, 0, 0], "2": [0, 1, 0], "3": [0, 0, 1], "4": [0, 0, 0],
@@ -89,24 +84,33 @@ class TestComparisonData(TestCase):
 
         shutil.rmtree(path)
 
-    def test_filter_existing_items(self):
+    def test_process_dataset(self):
 
-        path = EnvironmentSettings.tmp_test_path / "comparison_rep_filter_existing/"
+        path = EnvironmentSettings.tmp_test_path / "comparison_data_process_dataset/"
         PathBuilder.build(path)
 
-        comparison_data = self.create_comparison_data(path=path)
-        unique_items = comparison_data.filter_existing_items([("f", 6), ("g", 7), ("a", 1)], "6")
+        repertoires, metadata = RepertoireBuilder.build([["A", "B"], ["D"], ["E", "F"], ["B", "C"], ["A", "D"]], path)
+        dataset = RepertoireDataset(repertoires=repertoires, metadata_file=metadata)
 
-        self.assertEqual(2, len(unique_items))
-        self.assertTrue("f" in [unique_items[0][0], unique_items[1][0]])
-        self.assertTrue("g" in [unique_items[0][0], unique_items[1][0]])
+        comparison_data = ComparisonData(repertoire_ids=dataset.get_repertoire_ids(), comparison_attributes=["sequence_aas"],
+                                         sequence_batch_size=4, path=path)
+        comparison_data.process_dataset(dataset)
 
-        comparison_data = self.create_comparison_data(path=path)
-        comparison_data.batch_paths = comparison_data.tmp_batch_paths
-        unique_items = comparison_data.filter_existing_items([("f", 6), ("g", 7), ("a", 1), ("b", 2), ("c", 3), ("d", 4)], "6")
+        self.assertEqual(6, comparison_data.item_count)
+        self.assertEqual(2, len(comparison_data.batches))
+        self.assertTrue(all((path / f"comparison_data/{index}.npz").is_file() for index in range(2)))
+
+        item_names = [item[0] for item in comparison_data.get_item_names()]
+        self.assertListEqual(sorted(item_names), ["A", "B", "C", "D", "E", "F"])
+
+        for repertoire in repertoires:
+            repertoire_vector = comparison_data.get_repertoire_vector(repertoire.identifier)
+            self.assertListEqual(sorted(repertoire.get_sequence_aas().tolist()),
+                                 sorted(item for item, present in zip(item_names, repertoire_vector) if present == 1))
 
-        self.assertEqual(2, len(unique_items))
-        self.assertTrue("f" in [unique_items[0][0], unique_items[1][0]])
-        self.assertTrue("g" in [unique_items[0][0], unique_items[1][0]])
+        item_vectors = list(comparison_data.get_item_vectors())
+        self.assertEqual(6, len(item_vectors))
+        self.assertTrue(np.array_equal(item_vectors[item_names.index("D")], [0, 1, 0, 0, 1]))
+        self.assertTrue(np.array_equal(comparison_data.get_item_vector(item_names.index("D")), [0, 1, 0, 0, 1]))
 
         shutil.rmtree(path)
@@ -47,6 +47,27 @@ class TestPairwiseRepertoireComparison(TestCase):
 
         shutil.rmtree(path)
 
+    def test_compare_repertoires_in_blocks(self):
+
+        path = EnvironmentSettings.tmp_test_path / "pairwise_comparison_reps_in_blocks/"
+        PathBuilder.build(path)
+
+        dataset = self.create_dataset(path)
+
+        comparison = PairwiseRepertoireComparison(["sequence_aas"], ["sequence_aas"], path, 4, repertoire_batch_size=2, number_of_processes=2)
+
+        result = comparison.compare_repertoires_in_blocks(dataset, DistanceMetrics.jaccard_matrix)
+
+        self.assertTrue((path / "distance_matrix.npy").is_file())
+        self.assertListEqual(dataset.get_repertoire_ids(), list(result.index))
+        self.assertTrue(np.allclose(result.values, np.array([[1., 0., 0., 0.3333333333333333, 0.3333333333333333],
+                                                             [0., 1., 0., 0., 0.5],
+                                                             [0., 0., 1., 0., 0.],
+                                                             [0.3333333333333333, 0., 0., 1., 0.],
+                                                             [0.3333333333333333, 0.5, 0., 0., 1.]])))
+
+        shutil.rmtree(path)
+
     def test_comparison_data_io(self):
         path = EnvironmentSettings.tmp_test_path / "comparison_data_io/"
         PathBuilder.build(path)
@@ -65,3 +65,31 @@ class TestRandomDatasetGenerator(TestCase):
             self.assertTrue(sequence.get_attribute("HLA") in ["A", "B"])
 
         shutil.rmtree(path)
+
+    def test_generate_with_seed(self):
+
+        path = EnvironmentSettings.tmp_test_path / "random_dataset_generation_seed/"
+
+        datasets = [RandomDatasetGenerator.generate_repertoire_dataset(repertoire_count=5, sequence_count_probabilities={5: 0.5, 6: 0.5},
+                                                                       sequence_length_probabilities={4: 0.5, 5: 0.5},
+                                                                       labels={"HLA": {"A": 0.5, "B": 0.5}}, path=path / f"repertoires_{processes}",
+                                                                       number_of_processes=processes, seed=3)
+                    for processes in [1, 2]]
+
+        for repertoire1, repertoire2 in zip(*[dataset.repertoires for dataset in datasets]):
+            self.assertListEqual(repertoire1.get_sequence_aas().tolist(), repertoire2.get_sequence_aas().tolist())
+            self.assertEqual(repertoire1.metadata["HLA"], repertoire2.metadata["HLA"])
+
+        datasets = [RandomDatasetGenerator.generate_sequence_dataset(sequence_count=100, length_probabilities={4: 0.5, 5: 0.5},
+                                                                     labels={"HLA": {"A": 0.5, "B": 0.5}}, path=path / f"sequences_{processes}",
+                                                                     file_size=30, number_of_processes=processes, seed=3)
+                    for processes in [1, 2]]
+
+        self.assertEqual(4, len(datasets[0].get_filenames()))
+        self.assertEqual(100, datasets[0].get_example_count())
+        self.assertListEqual([sequence.amino_acid_sequence for sequence in datasets[0].get_data()],
+                             [sequence.amino_acid_sequence for sequence in datasets[1].get_data()])
+        self.assertListEqual([f"subj_{index + 1}" for index in range(100)],
+                             [sequence.get_attribute("subject") for sequence in datasets[0].get_data()])
+
+        shutil.rmtree(path)
@@ -38,4 +38,33 @@ class TestGappedKmerInstantiation(TestCase):
         self.assertTrue(instance.gap == 0)
         self.assertTrue(instance.instance[0] in ["C", "T", "F"])
 
+    def test_instantiate_motifs(self):
 
+        alphabet_weights = {"T": 0.5, "F": 0.5, "A": 0, "C": 0,  "D": 0, "E": 0, "G": 0, "H": 0, "K": 0, "I": 0, "L": 0, "M": 0,
+                            "N": 0, "P": 0, "Q": 0, "R": 0, "S": 0, "V": 0, "W": 0, "Y": 0}
+
+        strategy = GappedKmerInstantiation(hamming_distance_probabilities={0: 0.5, 1: 0.5}, max_gap=2, min_gap=1,
+                                           position_weights={0: 1, 1: 0, 2: 0, 3: 0},
+                                           alphabet_weights=alphabet_weights)
+
+        instances = strategy.instantiate_motifs("C/AS", 50)
+
+        self.assertEqual(50, len(instances))
+        self.assertTrue(all(instance.instance[1:] == "/AS" and instance.instance[0] in ["C", "T", "F"] for instance in instances))
+        self.assertTrue(all(1 <= instance.gap <= 2 for instance in instances))
+        self.assertTrue(any(instance.instance[0] != "C" for instance in instances))
+
+    def test_instantiate_motifs_key_order(self):
+
+        alphabet_weights = {"T": 0.5, "F": 0.5, "A": 0, "C": 0,  "D": 0, "E": 0, "G": 0, "H": 0, "K": 0, "I": 0, "L": 0, "M": 0,
+                            "N": 0, "P": 0, "Q": 0, "R": 0, "S": 0, "V": 0, "W": 0, "Y": 0}
+
+        for hamming_distance_probabilities, expected_mutated in [({1: 0.0, 0: 1.0}, False), ({1: 1.0, 0: 0.0}, True)]:
+            strategy = GappedKmerInstantiation(hamming_distance_probabilities=hamming_distance_probabilities,
+                                               position_weights={0: 1, 1: 0, 2: 0}, alphabet_weights=alphabet_weights)
+
+            batch_instances = strategy.instantiate_motifs("CAS", 100)
+            single_instances = [strategy.instantiate_motif("CAS") for _ in range(100)]
+
+            for instances in [batch_instances, single_instances]:
+                self.assertTrue(all((instance.instance[0] != "C") == expected_mutated for instance in instances))
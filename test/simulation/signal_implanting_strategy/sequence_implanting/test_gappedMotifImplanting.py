@@ -42,3 +42,16 @@ class TestGappedMotifImplanting(TestCase):
 
         self.assertTrue(-1 < sequence.get_sequence().find("CT") < 2)
         self.assertTrue("/" not in sequence.get_sequence())
+
+    def test_implant_in_sequences(self):
+
+        strategy = GappedMotifImplanting()
+        sequences = ["AAAAAAAAAA", "AAAAAAAAAAAAAAAA", "AAAAAAAAAA", "AAAAAAAAAAAAAAAA"]
+        motif_instances = [MotifInstance("CC/T", 2), MotifInstance("CCT", 0), MotifInstance("C/T", 1), MotifInstance("CC/T", 2)]
+
+        new_sequences, positions = strategy.implant_in_sequences(sequences, motif_instances, sequence_position_weights={105: 0.8, 106: 0.2})
+
+        self.assertListEqual([len(sequence) for sequence in sequences], [len(sequence) for sequence in new_sequences])
+        self.assertTrue(all(position in [0, 1] for position in positions))
+        for new_sequence, position, motif in zip(new_sequences, positions, ["CCAAT", "CCT", "CAT", "CCAAT"]):
+            self.assertEqual(position, new_sequence.find(motif))
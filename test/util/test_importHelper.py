@@ -0,0 +1,88 @@
+import os
+import shutil
+import warnings
+from unittest import TestCase
+
+import pandas as pd
+
+from immuneML.IO.dataset_import.DatasetImportParams import DatasetImportParams
+from immuneML.caching.CacheType import CacheType
+from immuneML.data_model.receptor.ElementGenerator import ElementGenerator
+from immuneML.data_model.receptor.TCABReceptor import TCABReceptor
+from immuneML.data_model.receptor.receptor_sequence.Chain import Chain
+from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
+from immuneML.environment.Constants import Constants
+from immuneML.environment.EnvironmentSettings import EnvironmentSettings
+from immuneML.util.ImportHelper import ImportHelper
+from immuneML.util.PathBuilder import PathBuilder
+
+
+class TestImportHelper(TestCase):
+
+    def setUp(self) -> None:
+        os.environ[Constants.CACHE_TYPE] = CacheType.TEST.name
+
+    def test_import_receptors(self):
+        df = pd.DataFrame({"receptor_identifiers": ["1", "1", "2", "3", "3", "3", "4"],
+                           "chains": ["TRB", "TRA", "TRA", "TRA", "TRB", "TRB", "TRB"],
+                           "sequence_aas": ["BBB", "AAA", "CCC", "DDD", "EEE", "FFF", "GGG"],
+                           "v_genes": ["TRBV1", "TRAV1", "TRAV2", "TRAV3", "TRBV2", "TRBV3", "TRBV4"],
+                           "sequence_identifiers": ["s1", "s2", "s3", "s4", "s5", "s6", "s7"],
+                           "epitope": ["e1", "e1", "e2", "e3", "e3", "e3", "e4"]})
+        params = DatasetImportParams.build_object(receptor_chains="TRA_TRB", metadata_column_mapping={"epitope": "epitope"})
+
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter("always")
+            receptors = ImportHelper.import_receptors(df, params)
+
+        messages = [str(warning.message) for warning in caught_warnings]
+        self.assertEqual(3, len(messages))
+        self.assertTrue(any(message.startswith("Multiple TRB chains found for 1 receptor(s) (identifiers: 3)") for message in messages))
+        self.assertTrue(any(message.startswith("Missing TRA chain for 1 receptor(s) (identifiers: 4)") for message in messages))
+        self.assertTrue(any(message.startswith("Missing TRB chain for 1 receptor(s) (identifiers: 2)") for message in messages))
+
+        self.assertEqual(2, len(receptors))
+        self.assertTrue(all(isinstance(receptor, TCABReceptor) for receptor in receptors))
+        self.assertListEqual(["1", "3"], [receptor.identifier for receptor in receptors])
+        self.assertListEqual(["AAA", "DDD"], [receptor.alpha.amino_acid_sequence for receptor in receptors])
+        self.assertListEqual(["BBB", "EEE"], [receptor.beta.amino_acid_sequence for receptor in receptors])
+        self.assertListEqual(["TRBV1", "TRBV2"], [receptor.beta.metadata.v_gene for receptor in receptors])
+        self.assertListEqual(["s4", "s5"], [receptors[1].alpha.identifier, receptors[1].beta.identifier])
+        self.assertEqual("e3", receptors[1].metadata["epitope"])
+
+    def test_store_sequence_batches(self):
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "import_helper_sequence_batches/")
+
+        sequences = [ReceptorSequence(amino_acid_sequence="AAA", identifier=str(i)) for i in range(8)]
+        dataset_filenames, items = [], []
+        for new_items in [sequences[:4], [], sequences[4:7], sequences[7:8]]:
+            items = ImportHelper.store_sequence_batches(items + new_items, dataset_filenames, path, 3)
+            self.assertLess(len(items), 3)
+
+        self.assertListEqual([], ImportHelper.store_sequence_batches(items, dataset_filenames, path, 3, store_all=True))
+        self.assertListEqual([path / f"batch_{index}.npz" for index in range(3)], dataset_filenames)
+
+        batches = [[int(sequence.identifier) for sequence in batch] for batch in ElementGenerator(dataset_filenames).build_batch_generator()]
+
+        self.assertListEqual([[0, 1, 2], [3, 4, 5], [6, 7]], batches)
+        self.assertTrue(all(ElementGenerator.get_index_filename(filename).is_file() for filename in dataset_filenames))
+
+        shutil.rmtree(path)
+
+    def test_load_chains_from_genes(self):
+        df = pd.DataFrame({"v_genes": ["TRBV1", None, None, "IGHV1-1"], "j_alleles": ["TRBJ1*01", "TRAJ2*01", None, None]})
+
+        self.assertListEqual([Chain.BETA.value, Chain.ALPHA.value, None, Chain.HEAVY.value], ImportHelper.load_chains_from_genes(df))
+        self.assertListEqual([], ImportHelper.load_chains_from_genes(df.iloc[:0]))
+
+    def test_get_illegal_sequence_mask(self):
+        sequences = pd.Series(["CASS", "CAS*", "CAXS", None, ""])
+
+        self.assertListEqual([False, False, True, False, False], list(ImportHelper.get_illegal_sequence_mask(sequences, ["A", "C", "S", "*"])))
+
+    def test_strip_suffix(self):
+        df = pd.DataFrame({"v_alleles": ["TRBV1-1*01", None, "TRBV2*01*02", "TRBV3"]})
+
+        self.assertListEqual(["TRBV1-1", None, "TRBV2", "TRBV3"], ImportHelper.strip_alleles(df, "v_alleles").tolist())
+        self.assertListEqual(["TRBV1", None, "TRBV2*01*02", "TRBV3"], ImportHelper.strip_genes(df, "v_alleles").tolist())
+        self.assertIsNone(ImportHelper.strip_alleles(df, "j_alleles"))
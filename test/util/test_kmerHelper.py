@@ -2,6 +2,8 @@ import os
 import shutil
 from unittest import TestCase
 
+import numpy as np
+
 from immuneML.caching.CacheType import CacheType
 from immuneML.data_model.receptor.receptor_sequence.ReceptorSequence import ReceptorSequence
 from immuneML.data_model.repertoire.Repertoire import Repertoire
@@ -80,3 +82,21 @@ class TestKmerHelper(TestCase):
     def test_create_gapped_kmers_from_string(self):
         kmers = KmerHelper.create_gapped_kmers_from_string("CASSRYUF", 2, 1, 1, 1)
         self.assertTrue(all([k in kmers for k in ['CA.S', 'AS.R', 'SS.Y', 'SR.U', 'RY.F']]))
+
+    def test_count_kmers_in_sequences(self):
+        kmers, counts = KmerHelper.count_kmers_in_sequences(["CASSA", "ASS", "AS"], 3, weights=np.array([1, 5, 10]))
+        self.assertListEqual(["ASS", "CAS", "SSA"], kmers.tolist())
+        self.assertListEqual([6, 1, 1], counts.tolist())
+
+        kmers, counts = KmerHelper.count_kmers_in_sequences(["AB"], 3)
+        self.assertEqual(0, kmers.shape[0])
+        self.assertEqual(0, counts.shape[0])
+
+    def test_count_gapped_kmers_in_sequences(self):
+        kmers, counts = KmerHelper.count_gapped_kmers_in_sequences(["CASSRYUF", "CASS", "CAS"], k_left=2, max_gap=1, k_right=1, min_gap=0)
+        expected = {}
+        for sequence in ["CASSRYUF", "CASS"]:
+            for kmer in KmerHelper.create_gapped_kmers_from_string(sequence, k_left=2, max_gap=1, k_right=1, min_gap=0):
+                expected[kmer] = expected.get(kmer, 0) + 1
+
+        self.assertDictEqual(expected, dict(zip(kmers.tolist(), counts.tolist())))
@@ -56,7 +56,8 @@ class TestSignalImplanter(TestCase):
         simulation = Simulation([Implanting(dataset_implanting_rate=0.2, repertoire_implanting_rate=0.5, signals=[s1, s2], name="i1"),
                                  Implanting(dataset_implanting_rate=0.2, repertoire_implanting_rate=0.5, signals=[s2], name="i2")])
 
-        input_params = SimulationState(dataset=dataset, result_path=path, simulation=simulation, signals=[s1, s2], formats=["Pickle"])
+        input_params = SimulationState(dataset=dataset, result_path=path, simulation=simulation, signals=[s1, s2], formats=["Pickle"],
+                                       number_of_processes=2)
 
         new_dataset = SignalImplanter.run(input_params)
         reps_with_s2 = sum([rep.metadata[s2.id] is True for rep in new_dataset.get_data(batch_size=10)])
@@ -72,6 +73,13 @@ class TestSignalImplanter(TestCase):
         metadata_filenames = new_dataset.get_filenames()
         self.assertTrue(all([repertoire.data_filename in metadata_filenames for repertoire in new_dataset.repertoires]))
 
+        for repertoire, new_repertoire in zip(r, new_dataset.repertoires):
+            implanted_signals = [signal.id for signal in [s1, s2] if new_repertoire.metadata[signal.id] is True]
+            # unchanged repertoires share the data file with the original repertoires
+            self.assertEqual(len(implanted_signals) == 0, os.path.samefile(repertoire.data_filename, new_repertoire.data_filename))
+            for signal_id in implanted_signals:
+                self.assertEqual(2, sum(implant is not None for implant in new_repertoire.get_attribute(signal_id)))
+
         shutil.rmtree(path)
 
     def test_run_with_receptors(self):
@@ -93,3 +101,39 @@ class TestSignalImplanter(TestCase):
         self.assertEqual(50, len([receptor for receptor in new_dataset.get_data(40) if receptor.metadata["signal1"] is True]))
 
         shutil.rmtree(path)
+
+    def test_run_with_seed(self):
+
+        path = PathBuilder.build(EnvironmentSettings.tmp_test_path / "signalImplanter_seed/")
+
+        repertoire_dataset = RandomDatasetGenerator.generate_repertoire_dataset(6, {20: 1}, {12: 1}, {}, path / "repertoire_dataset/")
+        receptor_dataset = RandomDatasetGenerator.generate_receptor_dataset(20, {10: 1}, {12: 1}, {}, path / "receptor_dataset/")
+
+        motif = Motif(identifier="m1", instantiation=GappedKmerInstantiation(hamming_distance_probabilities={0: 0.5, 1: 0.5}), seed="CAS")
+        repertoire_signal = Signal(identifier="s1", motifs=[motif], implanting_strategy=HealthySequenceImplanting(
+            GappedMotifImplanting(), implanting_computation=ImplantingComputation.POISSON))
+        motif = Motif(identifier="m2", instantiation=GappedKmerInstantiation(hamming_distance_probabilities={0: 0.5, 1: 0.5}),
+                      seed_chain1="AAA", name_chain1=Chain.ALPHA, seed_chain2="CCC", name_chain2=Chain.BETA)
+        receptor_signal = Signal(identifier="s2", motifs=[motif], implanting_strategy=ReceptorImplanting(GappedMotifImplanting()))
+
+        results = []
+        for number_of_processes in [1, 3]:
+            repertoire_state = SimulationState(dataset=repertoire_dataset, result_path=path / f"repertoires_{number_of_processes}",
+                                               simulation=Simulation([Implanting(dataset_implanting_rate=0.5, repertoire_implanting_rate=0.3,
+                                                                                 signals=[repertoire_signal], name="i1")]),
+                                               signals=[repertoire_signal], number_of_processes=number_of_processes, seed=3)
+            receptor_state = SimulationState(dataset=receptor_dataset, result_path=path / f"receptors_{number_of_processes}",
+                                             simulation=Simulation([Implanting(dataset_implanting_rate=0.5, signals=[receptor_signal])]),
+                                             signals=[receptor_signal], number_of_processes=number_of_processes, seed=3)
+
+            repertoires = SignalImplanter.run(repertoire_state).get_data()
+            receptors = SignalImplanter.run(receptor_state).get_data()
+
+            results.append(([(repertoire.get_sequence_aas().tolist(), repertoire.get_attribute("s1").tolist()
+                              if repertoire.metadata["s1"] else None) for repertoire in repertoires],
+                            [(receptor.alpha.amino_acid_sequence, receptor.beta.amino_acid_sequence) for receptor in receptors]))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(3, sum(implants is not None for _, implants in results[0][0]))
+
+        shutil.rmtree(path)